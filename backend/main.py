@@ -1,10 +1,15 @@
-from fastapi import FastAPI, HTTPException, Query
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Response, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from typing import Optional
+from contextlib import asynccontextmanager
 import sqlite3
 import os
+import sys
+import asyncio
 import logging
 import smtplib
 from email.mime.text import MIMEText
@@ -12,11 +17,6 @@ from email.mime.multipart import MIMEMultipart
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-try:
-    from twilio.rest import Client as TwilioClient
-except ImportError:
-    TwilioClient = None
-
 # Load environment variables
 load_dotenv()
 
@@ -30,6 +30,20 @@ logger = logging.getLogger("backend.main")
 # --- Services ---
 from backend.services.data_service import get_environmental_data
 from backend.services.risk_engine import environmental_risk_engine
+from backend.services.district_risk import KERALA_DISTRICTS, district_risk_fanout
+from backend.services.http_client import http_pool
+from backend.services.geo_cache import weather_cache, aqi_cache
+from backend.services.risk_scheduler import district_risk_scheduler, SCHEDULER_ENABLED
+from backend.services.event_stream import event_broadcaster, TOPICS as EVENT_TOPICS
+from backend.services.conditional_response import ConditionalResponseMiddleware, weak_etag
+from backend.services.fast_json import FastJSONResponse
+from backend.services.static_assets import StaticAssetServer
+from backend.utils.risk_ml import risk_engine as flood_model, model_registry, ModelUnavailableError
+from backend.services.prediction_writer import PredictionWriter, COALESCE_MIGRATION
+from backend.services import rollups
+from backend.services.retention import RetentionManager, RETENTION_ENABLED, read_archived_page, rebuild_archived_rollups
+from backend.utils.history_store import history_store, build_history_store, AUTO_BUILD as HISTORY_AUTO_BUILD
+from backend.services.feature_store import feature_store
 from backend.services.ai_engine import (
     analyze_social_signal,
     analyze_satellite_image,
@@ -39,12 +53,60 @@ from backend.services.ai_engine import (
 )
 
 # --- Database Integration ---
-DB_PATH = "backend/data/predictions.db"
+DB_PATH = os.getenv("PREDICTIONS_DB_PATH", "backend/data/predictions.db")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
+# Ordered schema migrations; PRAGMA user_version records how many have run.
+SCHEMA_MIGRATIONS = [
+    # 1: indexes behind the admin history/emergencies filters
+    [
+        "CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_predictions_location ON predictions(location)",
+        "CREATE INDEX IF NOT EXISTS idx_predictions_level ON predictions(risk_level)",
+        "CREATE INDEX IF NOT EXISTS idx_emergencies_timestamp ON emergencies(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_emergencies_district ON emergencies(district)",
+        "CREATE INDEX IF NOT EXISTS idx_emergencies_level ON emergencies(risk_level)",
+    ],
+    # 2: hourly rollups (backfilled by 5)
+    [
+        rollups.CREATE_ROLLUP_TABLE,
+        rollups.CREATE_ROLLUP_HOUR_INDEX,
+    ],
+    # 3: incremental auto-vacuum so retention can hand freed pages back (one-time rebuild)
+    [
+        "PRAGMA auto_vacuum = INCREMENTAL",
+        "VACUUM",
+    ],
+    # 4: columns and unique index for coalesced (upserted) prediction rows
+    COALESCE_MIGRATION,
+    # 5: rollups keyed by Kerala district instead of the weather station name,
+    #    rebuilt from live and archived rows (callables run with the connection)
+    [
+        "DROP TABLE IF EXISTS prediction_rollups_hourly",
+        rollups.CREATE_ROLLUP_TABLE,
+        rollups.CREATE_ROLLUP_HOUR_INDEX,
+        rollups.rebuild_rollups,
+        rebuild_archived_rollups,
+    ],
+]
+
+def migrate_db(conn):
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, statements in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+        with conn:
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+        logger.info(f"Applied schema migration {number}.")
+
 def init_db():
     try:
         conn = sqlite3.connect(DB_PATH)
+        # WAL lets the background writer commit while readers query
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS predictions (
@@ -71,6 +133,7 @@ def init_db():
             )
         ''')
         conn.commit()
+        migrate_db(conn)
         conn.close()
         logger.info("Database initialized successfully.")
     except Exception as e:
@@ -78,21 +141,74 @@ def init_db():
 
 init_db()
 
+prediction_writer = PredictionWriter(DB_PATH)
+retention_manager = RetentionManager(DB_PATH)
+
 def save_prediction(location, lat, lon, score, level, temp, pm25):
+    """Queues the row for the background writer; never touches disk on the request path."""
+    prediction_writer.submit((location, lat, lon, score, level, temp, pm25))
+
+history_build_lock = asyncio.Lock()
+
+async def refresh_history_store(force: bool = False) -> Optional[dict]:
+    """
+    Rebuilds the columnar history store in a worker thread (only when the
+    cleaned data changed, unless `force`) and reseeds the rolling features
+    from it. Returns the build report, or None if the store was current.
+    """
+    async with history_build_lock:
+        if force:
+            report = await asyncio.to_thread(build_history_store, None, history_store.path)
+        else:
+            report = await asyncio.to_thread(history_store.ensure_current)
+    if report is not None:
+        await asyncio.to_thread(feature_store.seed_from_history, history_store)
+    return report
+
+async def auto_build_history():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO predictions (location, lat, lon, risk_score, risk_level, temp, pm25)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (location, lat, lon, score, level, temp, pm25))
-        conn.commit()
-        conn.close()
+        await refresh_history_store()
     except Exception as e:
-        logger.error(f"Failed to save prediction: {e}")
+        logger.error(f"History store build failed: {e}")
+
+async def start_scheduler_when_warm(warm_up: asyncio.Task):
+    """
+    The first refresh assesses every district and publishes the results as
+    fresh for up to the Safe interval; run it only once the model and the
+    sentiment stack are loaded, so it isn't made of stage fallbacks.
+    """
+    await warm_up
+    await district_risk_scheduler.start()
 
 # --- API Setup ---
-app = FastAPI(title="EcoGuard AI Risk Engine", version="1.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if static_assets is not None:
+        await asyncio.to_thread(static_assets.build)
+    try:
+        await asyncio.to_thread(feature_store.seed_from_history, history_store)
+    except Exception as e:
+        logger.error(f"Feature store seeding failed: {e}")
+    await http_pool.start()
+    prediction_writer.start()
+    # Load the model and the sentiment stack in the background so early requests don't pay for them
+    app.state.warm_up = asyncio.create_task(environmental_risk_engine.warm_up())
+    if SCHEDULER_ENABLED:
+        app.state.scheduler_start = asyncio.create_task(start_scheduler_when_warm(app.state.warm_up))
+    if RETENTION_ENABLED:
+        await retention_manager.start()
+    if HISTORY_AUTO_BUILD:
+        # Opt-in, and off the startup path: the build imports pandas and rewrites the store
+        app.state.history_build = asyncio.create_task(auto_build_history())
+    yield
+    await retention_manager.stop()
+    if SCHEDULER_ENABLED:
+        app.state.scheduler_start.cancel()
+    await district_risk_scheduler.stop()
+    await http_pool.close()
+    await asyncio.to_thread(prediction_writer.stop)
+
+app = FastAPI(title="EcoGuard AI Risk Engine", version="1.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -100,18 +216,69 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Before-Id", "ETag"],
 )
+# ETag/304, Cache-Control and br/gzip for JSON responses
+app.add_middleware(ConditionalResponseMiddleware)
+
+def summarize_risk(payload: dict) -> dict:
+    """view=summary: score, level and headline metrics only (a few hundred bytes)."""
+    assessment = payload["risk_assessment"]
+    metrics = payload["aggregated_metrics"]
+    return {
+        "location": payload["location"],
+        "risk_assessment": {"score": assessment["score"], "level": assessment["level"]},
+        "aggregated_metrics": {k: metrics.get(k) for k in ("temperature", "humidity", "rainfall", "pm25")}
+    }
+
+def project_fields(payload: dict, paths: list) -> dict:
+    """
+    Keeps only the requested dotted paths, e.g. "risk_assessment.score".
+    Raises KeyError naming the first path that does not exist.
+    """
+    result = {}
+    for path in paths:
+        source, target = payload, result
+        keys = path.split(".")
+        for depth, key in enumerate(keys):
+            if not isinstance(source, dict) or key not in source:
+                raise KeyError(path)
+            source = source[key]
+            if depth == len(keys) - 1:
+                target[key] = source
+            else:
+                target = target.setdefault(key, {})
+    return result
+
+def risk_etag(lat: float, lon: float, risk_result: dict, representation: str) -> str:
+    """
+    Weak validator for /api/risk-data: cache cell, rounded inputs, the
+    environmental base assessment and the ML label. The social overlay
+    (sampled messages, random stress), stage timings and raw weather vary
+    on every request, so bodies sharing this ETag are equivalent, not
+    byte-identical.
+    """
+    metrics = risk_result["aggregated_metrics"]
+    base = risk_result["environmental_base"]
+    stable = (
+        weather_cache.key(lat, lon), representation,
+        base["score"], base["label"], risk_result["ml_prediction"]["label"],
+        *(round(metrics.get(k) or 0, 1) for k in ("temperature", "humidity", "rainfall", "pm25", "7_day_rain_total"))
+    )
+    return weak_etag(repr(stable).encode())
 
 @app.get("/api/risk-data")
 async def get_risk_data(
     lat: float = Query(..., description="Latitude"),
-    lon: float = Query(..., description="Longitude")
+    lon: float = Query(..., description="Longitude"),
+    view: str = Query("full", pattern="^(summary|full)$", description="summary: score, level and headline metrics"),
+    fields: Optional[str] = Query(None, description="Comma-separated dotted paths to keep, e.g. risk_assessment.score,weather.main")
 ):
     try:
         # 1. Pipeline Analysis
         risk_result = await environmental_risk_engine.analyze_risk(lat, lon)
         
-        # 2. Persistence (Async to DB)
+        # 2. Persistence (write-behind queue)
         try:
             loc_name = risk_result["raw_data"].get("location_name", f"{lat}, {lon}")
             save_prediction(
@@ -125,7 +292,7 @@ async def get_risk_data(
             logger.error(f"Persistence error: {db_err}")
 
         # 3. Response Construction
-        return {
+        payload = {
             "location": {"lat": lat, "lon": lon},
             "weather": risk_result["raw_data"]["raw_weather"],
             "air_quality": risk_result["raw_data"]["raw_aqi"],
@@ -142,7 +309,8 @@ async def get_risk_data(
             },
             "social_data": risk_result["social_overlay"],
             "environmental_data": risk_result["environmental_base"],
-            "aggregated_metrics": risk_result["aggregated_metrics"]
+            "aggregated_metrics": risk_result["aggregated_metrics"],
+            "stage_timings": risk_result["stage_timings"]
         }
     except Exception as e:
         logger.error(f"API Error in risk-data: {e}")
@@ -150,6 +318,46 @@ async def get_risk_data(
         if "No data" in str(e): status = 404
         raise HTTPException(status_code=status, detail=str(e))
 
+    # 4. Projection (fields= takes precedence over view=)
+    if fields:
+        try:
+            payload = project_fields(payload, [f.strip() for f in fields.split(",") if f.strip()])
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {e.args[0]}")
+    elif view == "summary":
+        payload = summarize_risk(payload)
+    return FastJSONResponse(payload, headers={"ETag": risk_etag(lat, lon, risk_result, fields or view)})
+
+MAX_BATCH_SIZE = int(os.getenv("RISK_BATCH_MAX_ITEMS", 1000))
+
+class RiskFeatures(BaseModel):
+    rain_1d: float = 0.0
+    rain_3d: float = 0.0
+    rain_7d: float = 0.0
+    temp: float = 0.0
+    humidity: float = 0.0
+
+class BatchRiskRequest(BaseModel):
+    items: list[RiskFeatures]
+
+@app.post("/api/risk/batch")
+async def get_batch_risk(request: BatchRiskRequest):
+    """
+    Scores many feature sets (districts, what-if scenarios) with a single
+    vectorized model call. Results are returned in request order.
+    """
+    if len(request.items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_SIZE} items).")
+    try:
+        rows = [item.model_dump() for item in request.items]
+        predictions = await asyncio.to_thread(flood_model.predict_flood_risk_batch, rows)
+        return {"count": len(predictions), "predictions": predictions}
+    except ModelUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch risk error: {e}")
+        raise HTTPException(status_code=500, detail="Batch prediction failed.")
+
 class EmergencyRequest(BaseModel):
     latitude: float
     longitude: float
@@ -229,7 +437,10 @@ async def send_emergency_sms(request: EmergencyRequest):
             logger.warning(f"{msg} Would have sent SMS to {to_phone} with location: {request.latitude}, {request.longitude}")
             return {"status": "warning", "message": "SMS alert processed (Twilio not configured)"}
 
-        if TwilioClient is None:
+        try:
+            # Imported on demand to keep it off the cold-start path
+            from twilio.rest import Client as TwilioClient
+        except ImportError:
             logger.error("Twilio package not installed.")
             return {"status": "error", "message": "SMS service unavailable (library missing)"}
 
@@ -255,34 +466,262 @@ async def send_emergency_sms(request: EmergencyRequest):
         logger.error(f"Failed to send emergency SMS: {e}")
         raise HTTPException(status_code=500, detail="Failed to send emergency SMS.")
 
-@app.get("/api/admin/history")
-async def get_admin_history():
+def fetch_page(table, district_column, before_id=None, limit=100, district=None, level=None,
+               include_archive=False):
+    """
+    Keyset pagination over an append-only table: newest first, resuming
+    strictly below `before_id`. Cost depends on the page size, not on the
+    table size. Returns (rows, next_before_id).
+    """
+    clauses, params = [], []
+    if before_id is not None:
+        clauses.append("id < ?")
+        params.append(before_id)
+    if district:
+        clauses.append(f"{district_column} = ?")
+        params.append(district)
+    if level:
+        clauses.append("risk_level = ?")
+        params.append(level)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM predictions ORDER BY timestamp DESC LIMIT 100")
-        rows = cursor.fetchall()
+        # id is the rowid, so ORDER BY id follows insertion (timestamp) order
+        rows = conn.execute(
+            f"SELECT * FROM {table} {where} ORDER BY id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    rows = [dict(row) for row in rows]
+    if include_archive and len(rows) < limit:
+        # Hot table exhausted: continue into the monthly archives (all older ids)
+        cursor = rows[-1]["id"] if rows else before_id
+        rows += read_archived_page(cursor, limit - len(rows), district, level)
+    next_before_id = rows[-1]["id"] if len(rows) == limit else None
+    return rows, next_before_id
+
+def fetch_changes(table, since_id=None, since_ts=None, limit=500):
+    """
+    Rows appended after a client's high-water mark, oldest first.
+    Returns (rows, has_more, high_water_mark).
+    """
+    clauses, params = [], []
+    if since_id is not None:
+        clauses.append("id > ?")
+        params.append(since_id)
+    if since_ts is not None:
+        clauses.append("timestamp > ?")
+        params.append(since_ts)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            f"SELECT * FROM {table} {where} ORDER BY id ASC LIMIT ?", (*params, limit + 1)
+        ).fetchall()
+    finally:
         conn.close()
-        return [dict(row) for row in rows]
+    rows = [dict(row) for row in rows]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    high_water_mark = {"id": rows[-1]["id"], "timestamp": rows[-1]["timestamp"]} if rows else None
+    return rows, has_more, high_water_mark
+
+async def _changes_response(table, since_id, since_ts, limit):
+    rows, has_more, high_water_mark = await asyncio.to_thread(fetch_changes, table, since_id, since_ts, limit)
+    if not rows:
+        # Nothing new: empty 304 so pollers pay no body or serialization cost
+        return Response(status_code=304)
+    return {"rows": rows, "count": len(rows), "has_more": has_more, "high_water_mark": high_water_mark}
+
+def _set_page_cursor(response: Response, next_before_id):
+    if next_before_id is not None:
+        response.headers["X-Next-Before-Id"] = str(next_before_id)
+
+@app.get("/api/admin/history")
+async def get_admin_history(
+    response: Response,
+    before_id: Optional[int] = Query(None, description="Return rows older than this id (cursor)"),
+    limit: int = Query(100, ge=1, le=500),
+    district: Optional[str] = Query(None, description="Filter by location name"),
+    level: Optional[str] = Query(None, description="Filter by risk level"),
+    include_archive: bool = Query(False, description="Also page into archived months once the live table is exhausted (slower; opt in)")
+):
+    """Newest predictions first. The next page cursor is sent in X-Next-Before-Id."""
+    try:
+        rows, next_before_id = await asyncio.to_thread(
+            fetch_page, "predictions", "location", before_id, limit, district, level, include_archive
+        )
+        _set_page_cursor(response, next_before_id)
+        return rows
     except Exception as e:
         logger.error(f"Admin history error: {e}")
         return []
 
 @app.get("/api/admin/emergencies")
-async def get_admin_emergencies():
+async def get_admin_emergencies(
+    response: Response,
+    before_id: Optional[int] = Query(None, description="Return rows older than this id (cursor)"),
+    limit: int = Query(200, ge=1, le=1000),
+    district: Optional[str] = Query(None),
+    level: Optional[str] = Query(None, description="Filter by risk level")
+):
+    """Newest emergencies first. The next page cursor is sent in X-Next-Before-Id."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM emergencies ORDER BY timestamp DESC")
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        rows, next_before_id = await asyncio.to_thread(
+            fetch_page, "emergencies", "district", before_id, limit, district, level
+        )
+        _set_page_cursor(response, next_before_id)
+        return rows
     except Exception as e:
         logger.error(f"Admin emergencies error: {e}")
         return []
 
+@app.get("/api/admin/history/changes")
+async def get_admin_history_changes(
+    since_id: Optional[int] = Query(None, description="Highest prediction id the client already has"),
+    since_ts: Optional[str] = Query(None, description="Only rows after this timestamp (YYYY-MM-DD HH:MM:SS)"),
+    limit: int = Query(500, ge=1, le=2000)
+):
+    """
+    Delta sync for predictions: rows newer than the client's high-water mark
+    (oldest first) plus the new mark, or 304 when nothing changed.
+    """
+    try:
+        return await _changes_response("predictions", since_id, since_ts, limit)
+    except Exception as e:
+        logger.error(f"Admin history changes error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch prediction changes.")
+
+@app.get("/api/admin/emergencies/changes")
+async def get_admin_emergencies_changes(
+    since_id: Optional[int] = Query(None, description="Highest emergency id the client already has"),
+    since_ts: Optional[str] = Query(None, description="Only rows after this timestamp (YYYY-MM-DD HH:MM:SS)"),
+    limit: int = Query(500, ge=1, le=2000)
+):
+    """
+    Delta sync for emergencies: rows newer than the client's high-water mark
+    (oldest first) plus the new mark, or 304 when nothing changed.
+    """
+    try:
+        return await _changes_response("emergencies", since_id, since_ts, limit)
+    except Exception as e:
+        logger.error(f"Admin emergencies changes error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch emergency changes.")
+
+@app.get("/api/admin/http-pool")
+async def get_http_pool_stats():
+    """Connection reuse stats for the shared upstream HTTP client."""
+    return http_pool.stats()
+
+@app.get("/api/admin/cache")
+async def get_cache_stats():
+    """Hit/miss stats for the upstream weather and AQI caches."""
+    return {"weather": weather_cache.stats(), "aqi": aqi_cache.stats()}
+
+@app.get("/api/admin/events")
+async def get_event_stats():
+    """Subscriber and fan-out stats for the /api/events push channel."""
+    return event_broadcaster.stats()
+
+def read_rollups(**filters):
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return rollups.query_rollups(conn, **filters)
+    finally:
+        conn.close()
+
+@app.get("/api/admin/stats")
+async def get_admin_stats(
+    start: Optional[str] = Query(None, description="Inclusive UTC start, e.g. 2026-02-01 or 2026-02-01 06:00:00"),
+    end: Optional[str] = Query(None, description="Exclusive UTC end"),
+    district: Optional[str] = Query(None, description="Kerala district, or \"Other\" for points outside them"),
+    bucket: str = Query("hour", pattern="^(hour|day|month)$"),
+    by_district: bool = Query(False, description="Return one series per district")
+):
+    """
+    Risk trends (count, min/max/mean score, level counts, mean temp/pm25)
+    computed from the hourly rollups only - never scans raw predictions.
+    """
+    try:
+        series = await asyncio.to_thread(
+            read_rollups, start=start, end=end, district=district, bucket=bucket, by_district=by_district
+        )
+        return {"bucket": bucket, "count": len(series), "series": series}
+    except Exception as e:
+        logger.error(f"Admin stats error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compute statistics.")
+
+@app.get("/api/admin/history-store")
+async def get_history_store_status():
+    """Rows, districts and source of the columnar history store behind /api/history."""
+    return history_store.status()
+
+@app.post("/api/admin/history-store/build")
+async def build_history(force: bool = Query(False, description="Rebuild even if the store is current")):
+    """Rebuilds the history store from the newest cleaned data and reseeds the rolling features."""
+    if history_build_lock.locked():
+        raise HTTPException(status_code=409, detail="A history store build is already in progress.")
+    try:
+        report = await refresh_history_store(force)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"History store build error: {e}")
+        raise HTTPException(status_code=500, detail="History store build failed.")
+    return {"built": report is not None, "report": report, "status": history_store.status()}
+
+@app.get("/api/admin/feature-store")
+async def get_feature_store_stats():
+    """Observation counts and latest day per district of the rolling feature store."""
+    return feature_store.stats()
+
+@app.get("/api/admin/retention")
+async def get_retention_status():
+    """Retention policy, archive files and the last archival/vacuum report."""
+    return retention_manager.status()
+
+@app.post("/api/admin/retention/run")
+async def run_retention():
+    """Archives expired predictions and vacuums now instead of waiting for the next cycle."""
+    try:
+        return await retention_manager.run()
+    except Exception as e:
+        logger.error(f"Retention run error: {e}")
+        raise HTTPException(status_code=500, detail="Retention run failed.")
+
+@app.get("/api/admin/db-writer")
+async def get_db_writer_stats():
+    """Queue depth and commit latency of the background prediction writer."""
+    return prediction_writer.stats()
+
+@app.get("/api/admin/model")
+async def get_model_status():
+    """Active model version, its training metrics and the versions on disk."""
+    return model_registry.status()
+
+@app.post("/api/admin/model/train")
+async def train_model(mode: Optional[str] = Query(None, pattern="^(fast|full)$")):
+    """Trains a new model version in the background and activates it when done."""
+    if not model_registry.start_training(mode):
+        raise HTTPException(status_code=409, detail="A training run is already in progress.")
+    return {"status": "started", "mode": mode or "default"}
+
+@app.post("/api/admin/model/activate")
+async def activate_model(version: str = Query(..., description="Registry version to serve")):
+    """Hot-swaps the served model (e.g. rollback) without a restart."""
+    try:
+        await asyncio.to_thread(model_registry.activate, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model activation failed: {e}")
+        raise HTTPException(status_code=500, detail="Failed to activate model version.")
+    return model_registry.status()
+
 # --- AI Endpoints ---
 
 class SocialRequest(BaseModel):
@@ -290,7 +729,7 @@ class SocialRequest(BaseModel):
 
 @app.post("/api/ai/social")
 async def ai_social_analysis(request: SocialRequest):
-    return analyze_social_signal(request.texts)
+    return await asyncio.to_thread(analyze_social_signal, request.texts)
 
 @app.get("/api/ai/satellite")
 async def ai_satellite_analysis(image_id: str = "demo_sat_1"):
@@ -305,7 +744,7 @@ async def ai_risk_fusion(
     # 1. Social
     s_score = 0
     if social_texts:
-        s_res = analyze_social_signal(social_texts.split(","))
+        s_res = await asyncio.to_thread(analyze_social_signal, social_texts.split(","))
         s_score = s_res["stress_score"]
     
     # 2. Satellite (Simulated random for now)
@@ -333,39 +772,78 @@ async def ai_chat(request: ChatRequest):
     response = get_safety_advice(request.message)
     return {"reply": response}
 
-KERALA_DISTRICTS = [
-    {"name": "Thiruvananthapuram", "lat": 8.5241, "lon": 76.9366},
-    {"name": "Kollam", "lat": 8.8932, "lon": 76.6141},
-    {"name": "Pathanamthitta", "lat": 9.2648, "lon": 76.7870},
-    {"name": "Alappuzha", "lat": 9.4981, "lon": 76.3388},
-    {"name": "Kottayam", "lat": 9.5916, "lon": 76.5222},
-    {"name": "Idukki", "lat": 9.8517, "lon": 76.9746},
-    {"name": "Ernakulam", "lat": 9.9816, "lon": 76.2999},
-    {"name": "Thrissur", "lat": 10.5276, "lon": 76.2144},
-    {"name": "Palakkad", "lat": 10.7867, "lon": 76.6547},
-    {"name": "Malappuram", "lat": 11.0735, "lon": 76.0740},
-    {"name": "Kozhikode", "lat": 11.2588, "lon": 75.7804},
-    {"name": "Wayanad", "lat": 11.6854, "lon": 76.1320},
-    {"name": "Kannur", "lat": 11.8745, "lon": 75.3704},
-    {"name": "Kasaragod", "lat": 12.5101, "lon": 74.9852}
-]
-
 @app.get("/api/kerala/districts-risk")
-async def get_kerala_districts_risk():
-    all_risks = []
-    for district in KERALA_DISTRICTS:
-        try:
-            risk = await environmental_risk_engine.analyze_risk(district["lat"], district["lon"])
-            all_risks.append({
-                "district": district["name"],
-                "score": risk["score"],
-                "level": risk["severity_label"],
-                "lat": district["lat"],
-                "lon": district["lon"]
-            })
-        except:
-            continue
-    return all_risks
+async def get_kerala_districts_risk(
+    response: Response,
+    deadline: Optional[float] = Query(None, gt=0, le=30, description="Overall time budget in seconds"),
+    live: bool = Query(False, description="Bypass the background snapshot and assess now")
+):
+    """
+    Serves the background district snapshot (each entry carries its
+    status and age_seconds). Without a snapshot, or with live=true, assesses
+    all districts concurrently and returns whatever finished within the
+    deadline; late districts fall back to their last known assessment.
+    """
+    if not live:
+        snapshot = district_risk_scheduler.snapshot()
+        if snapshot:
+            # Weak: follows the snapshot version, while age_seconds and status keep ticking
+            response.headers["ETag"] = f'W/"districts-v{district_risk_scheduler.version}"'
+            return snapshot
+    return await district_risk_fanout.collect(KERALA_DISTRICTS, deadline=deadline)
+
+@app.get("/api/history")
+async def get_history(
+    district: str = Query(..., description="Kerala district name"),
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="Inclusive start date (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="Inclusive end date (YYYY-MM-DD)"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. date,rainfall_mm,rain_7d_total"),
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    """
+    Cleaned daily history for one district, column-oriented
+    ({"data": {"date": [...], "rainfall_mm": [...]}}), read from the
+    memory-mapped history store. When more rows match than `limit`,
+    `next_start` is the start date of the next page.
+    """
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        result = history_store.query(district, start, end, columns, limit)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Historical data is not available.")
+    except LookupError:
+        raise HTTPException(status_code=404, detail=f"No history for district '{district}'.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Plain ISO dates rather than datetime64's midnight timestamps
+    result["data"] = {col: values.astype(str) if values.dtype.kind == "M" else values
+                      for col, values in result["data"].items()}
+    return FastJSONResponse(result)
+
+@app.get("/api/events")
+async def stream_events(
+    topics: Optional[str] = Query(None, description="Comma-separated subset of: districts, alerts, emergencies"),
+    last_event_id: Optional[int] = Query(None, description="Resume after this event id"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events push channel replacing client polling:
+    `districts` (changed district assessments; the first message is the full
+    snapshot), `alerts` (risk level transitions) and `emergencies` (new SOS
+    reports). Browsers reconnect automatically and resume via Last-Event-ID.
+    """
+    selected = [t.strip() for t in topics.split(",") if t.strip()] if topics else list(EVENT_TOPICS)
+    unknown = [t for t in selected if t not in EVENT_TOPICS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown topic(s): {', '.join(unknown)}")
+
+    resume_from = last_event_id_header if last_event_id_header is not None else last_event_id
+    initial = lambda: [("districts", district_risk_scheduler.snapshot_event())]
+    return StreamingResponse(
+        event_broadcaster.stream(selected, resume_from, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/risk", response_model=dict)
 async def get_district_risk(district: str = Query(..., description="Name of the Kerala district")):
@@ -378,18 +856,31 @@ async def get_district_risk(district: str = Query(..., description="Name of the
     if not district_data:
         raise HTTPException(status_code=404, detail=f"District '{district}' not found in Kerala. Please use one of the 14 districts.")
 
+    # 2. Serve from the background snapshot while it is current
+    cached = district_risk_scheduler.get(district_data["name"])
+    if cached and cached["status"] == "fresh":
+        return {
+            "rainfall": cached.get("rainfall", 0),
+            "temperature": cached.get("temp", 0),
+            "humidity": cached.get("humidity", 0),
+            "risk_score": cached["score"],
+            "severity_level": cached["level"],
+            "age_seconds": cached["age_seconds"]
+        }
+
     try:
-        # 2. Analyze Risk using Kerala-specific engine
+        # 3. Analyze Risk using Kerala-specific engine
         result = await environmental_risk_engine.analyze_risk(district_data["lat"], district_data["lon"])
         
-        # 3. Extract requested metrics
+        # 4. Extract requested metrics
         metrics = result.get("aggregated_metrics", {})
         return {
             "rainfall": metrics.get("rainfall", 0),
             "temperature": metrics.get("temperature", 0),
             "humidity": metrics.get("humidity", 0),
             "risk_score": result["score"],
-            "severity_level": result["severity_label"]
+            "severity_level": result["severity_label"],
+            "age_seconds": 0
         }
     except Exception as e:
         logger.error(f"District Risk API error for {district}: {e}")
@@ -423,6 +914,15 @@ async def log_emergency_status(request: EmergencySubmission):
         conn.close()
         
         logger.info(f"Emergency logged [ID:{item_id}] for {request.district}: {request.alert_status}")
+        event_broadcaster.publish("emergencies", {
+            "id": item_id,
+            "lat": request.latitude,
+            "lon": request.longitude,
+            "district": request.district,
+            "risk_level": request.risk_level,
+            "timestamp": timestamp,
+            "alert_status": request.alert_status
+        })
         return {
             "status": "success", 
             "message": "Emergency status logged successfully.",
@@ -447,17 +947,27 @@ frontend_paths = [
     "../frontend"
 ]
 
-mounted = False
+static_assets = None
 for path in frontend_paths:
     if os.path.exists(path):
-        app.mount("/", StaticFiles(directory=path, html=True), name="frontend")
+        # Fingerprinted, precompressed assets; see backend/services/static_assets.py
+        static_assets = StaticAssetServer(path)
+        app.mount("/", static_assets, name="frontend")
         logger.info(f"Frontend mounted from: {os.path.abspath(path)}")
-        mounted = True
         break
 
-if not mounted:
+if static_assets is None:
     logger.error("COULD NOT FIND FRONTEND DIRECTORY. System UI will be unavailable.")
 
+# --- Startup Report ---
+# Heavy libraries should only load behind the endpoints that need them
+# (see `python -m backend.utils.import_report` for a per-module breakdown).
+HEAVY_MODULES = ["sklearn", "pandas", "scipy", "joblib", "textblob", "nltk", "twilio"]
+_eager_heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+logger.info(f"Backend imported in {(time.perf_counter() - _import_started) * 1000:.0f} ms.")
+if _eager_heavy:
+    logger.warning(f"Heavy modules loaded at import time: {', '.join(_eager_heavy)}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
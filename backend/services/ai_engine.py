@@ -1,5 +1,4 @@
 import random
-from textblob import TextBlob
 from datetime import datetime
 
 # --- 1. Social Signal AI ---
@@ -11,6 +10,9 @@ def analyze_social_signal(text_data: list):
     if not text_data:
         return {"stress_score": 0, "sentiment": "Neutral", "panic_detected": False}
 
+    # Imported on first use: textblob pulls in nltk/scipy (~1.5s cold start)
+    from textblob import TextBlob
+
     total_polarity = 0
     panic_keywords = ["help", "trapped", "flood", "emergency", "urgent", "SOS", "landslide", "stuck", "water rising"]
     panic_count = 0
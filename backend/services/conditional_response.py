@@ -0,0 +1,160 @@
+import gzip
+import hashlib
+import os
+import logging
+from typing import Dict, List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent as-is; compression overhead outweighs the win.
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 5))
+
+# Cache-Control by path prefix (first match wins), applied when the endpoint
+# did not set its own. "no-cache" still allows storing, but revalidates via ETag.
+CACHE_RULES: List[Tuple[str, str]] = [
+    ("/api/risk-data", "public, max-age=30, stale-while-revalidate=60"),
+    ("/api/kerala/districts-risk", "public, max-age=15, stale-while-revalidate=60"),
+    ("/risk", "public, max-age=30, stale-while-revalidate=60"),
+    ("/api/history", "public, max-age=300"),
+    ("/api/admin/", "private, no-cache"),
+]
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def weak_etag(body: bytes) -> str:
+    """For representations that are equivalent but not byte-identical."""
+    return f"W/{strong_etag(body)}"
+
+def encoding_etag(etag: str, encoding: str) -> str:
+    # Each encoded representation needs its own strong validator; a weak one already spans encodings
+    if etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, any encoding variant of `etag`)."""
+    if not if_none_match:
+        return False
+    etag = etag[2:] if etag.startswith("W/") else etag
+    base = etag[:-1]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag or (candidate.startswith(base + "-") and candidate.endswith('"')):
+            return True
+    return False
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Prefers br (when the brotli package is installed), then gzip; honours q=0."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+def cache_control_for(path: str, rules: List[Tuple[str, str]] = CACHE_RULES) -> str:
+    return next((value for prefix, value in rules if path.startswith(prefix)), DEFAULT_CACHE_CONTROL)
+
+class ConditionalResponseMiddleware:
+    """
+    ASGI middleware for JSON responses:
+
+    - ETag (an endpoint-supplied one, e.g. a weak snapshot version, or a
+      strong hash of the body) and If-None-Match -> 304 for GET
+    - Cache-Control per path (CACHE_RULES) unless the endpoint set one
+    - br/gzip compression above COMPRESS_MIN_BYTES, with Vary: Accept-Encoding
+
+    Non-JSON responses (static files, the SSE stream) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        conditional = scope["method"] == "GET"
+        start_message: Optional[Dict] = None
+        passthrough = False
+        chunks: List[bytes] = []
+
+        async def buffered_send(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "application/json" not in headers.get("content-type", "") or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self._finish(scope, request_headers, conditional, start_message, b"".join(chunks), send)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _finish(self, scope, request_headers: Headers, conditional: bool,
+                      start_message: Dict, body: bytes, send):
+        status = start_message["status"]
+        headers = MutableHeaders(raw=list(start_message["headers"]))
+        encoding = None
+        if len(body) >= self.minimum_size:
+            headers.add_vary_header("Accept-Encoding")
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+
+        if conditional and status == 200:
+            etag = headers.get("etag") or strong_etag(body)
+            headers["ETag"] = encoding_etag(etag, encoding) if encoding else etag
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = cache_control_for(scope["path"])
+            if etag_matches(request_headers.get("if-none-match"), etag):
+                not_modified = MutableHeaders()
+                for name in ("etag", "cache-control", "vary"):
+                    if name in headers:
+                        not_modified[name] = headers[name]
+                await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if encoding:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        await send({**start_message, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
@@ -1,10 +1,13 @@
+import asyncio
 from datetime import datetime
 from backend.services.weather_api import fetch_weather_data
 from backend.services.aqi_api import fetch_aqi_data
+from backend.services.geo_cache import weather_cache, aqi_cache
 import logging
 import math
-import random
 from backend.utils.feature_engineering import feature_engineer
+from backend.services.districts import nearest_district
+from backend.services.feature_store import feature_store
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +18,24 @@ async def get_environmental_data(lat: float, lon: float):
               Air Quality (PM2.5, PM10, NO2, O3),
               Time-based (hour, day, averages).
     """
+    # Fetch data concurrently
+    weather_data, aqi_data = await asyncio.gather(get_weather(lat, lon), get_air_quality(lat, lon))
+    return build_environmental_data(weather_data, aqi_data)
+
+async def get_weather(lat: float, lon: float):
+    """Current weather, served from the geo cache when a nearby point is fresh."""
+    return await weather_cache.get_or_fetch(lat, lon, fetch_weather_data)
+
+async def get_air_quality(lat: float, lon: float):
+    """Current air quality, served from the geo cache when a nearby point is fresh."""
+    return await aqi_cache.get_or_fetch(lat, lon, fetch_aqi_data)
+
+def build_environmental_data(weather_data: dict, aqi_data: dict):
+    """
+    Derives the full environmental feature set from already-fetched
+    weather and AQI payloads.
+    """
     try:
-        # Fetch data
-        weather_data = await fetch_weather_data(lat, lon)
-        aqi_data = await fetch_aqi_data(lat, lon)
-        
         # 1. Weather Features
         main_weather = weather_data.get("main", {})
         temp = main_weather.get("temp", 0)
@@ -50,23 +66,31 @@ async def get_environmental_data(lat: float, lon: float):
             "o3": o3
         }
         
-        # 3. Advanced Predictive Features (Simulated for real-time dashboard)
-        # In a production app, these would be fetched from a historical weather API.
-        # Here we simulate trends based on current values and typical Kerala patterns.
-        
-        # Simulated historical data inputs
-        # rain_7d_total (usually higher in monsoons)
+        # 3. Rolling Predictive Features
+        # Kept per district in the in-memory feature store (seeded from the
+        # cleaned history); this observation updates today's values first.
         now = datetime.now()
-        curr_rain = weather_features["rainfall"]
-        rain_7d = curr_rain * 4.5 + round(random.uniform(10, 50), 1) if curr_rain > 0 else round(random.uniform(0, 5), 1)
-        rain_3d = curr_rain * 2.1 + round(random.uniform(5, 20), 1) if curr_rain > 0 else round(random.uniform(0, 2), 1)
-        rain_1d = curr_rain * 0.8 + round(random.uniform(0, 10), 1) if curr_rain > 0 else 0
-        
-        # Trends
-        temp_trend = round(random.uniform(-2, 2), 1)
-        humid_trend = round(random.uniform(-5, 5), 1)
-        
-        avg_3d_temp = temp + round(random.uniform(-1, 1), 1)
+        coord = weather_data.get("coord", {})
+        district = nearest_district(coord["lat"], coord["lon"]) if "lat" in coord and "lon" in coord else None
+        rolling = None
+        if district is not None:
+            # Only real readings (stamped with OpenWeather's `dt`) move the window;
+            # mock and fallback payloads would write fabricated rain into it
+            if "error" not in weather_data and not weather_data.get("mock") and weather_data.get("dt") is not None:
+                feature_store.observe(district["name"], temp, weather_features["humidity"],
+                                      weather_features["rainfall"], weather_data.get("dt"))
+            rolling = feature_store.features(district["name"])
+        if rolling is None:
+            # Outside Kerala's districts there is no history to roll over
+            rolling = {"rain_1d": 0.0, "rain_3d": 0.0, "rain_7d": 0.0,
+                       "temp_trend": 0.0, "humid_trend": 0.0, "temp_3d_avg": None}
+
+        rain_1d = round(rolling["rain_1d"], 1)
+        rain_3d = round(rolling["rain_3d"], 1)
+        rain_7d = round(rolling["rain_7d"], 1)
+        temp_trend = round(rolling["temp_trend"], 1)
+        humid_trend = round(rolling["humid_trend"], 1)
+        avg_3d_temp = round(rolling["temp_3d_avg"], 1) if rolling["temp_3d_avg"] is not None else temp
         heat_idx = feature_engineer.compute_heat_index(temp, weather_features["humidity"])
 
         time_features = {
@@ -78,7 +102,8 @@ async def get_environmental_data(lat: float, lon: float):
             "7_day_rain_total": rain_7d,
             "temp_trend": temp_trend,
             "humid_trend": humid_trend,
-            "heat_index": heat_idx
+            "heat_index": heat_idx,
+            "feature_district": district["name"] if district else None
         }
 
         # Aggregate Result
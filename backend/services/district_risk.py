@@ -0,0 +1,100 @@
+import asyncio
+import os
+import time
+import logging
+from typing import Dict, List, Optional
+from backend.services.risk_engine import environmental_risk_engine
+from backend.services.districts import KERALA_DISTRICTS
+
+logger = logging.getLogger(__name__)
+
+# Fan-out tuning: how many districts may hit the upstream APIs at once and the
+# overall wall-clock budget for a single districts-risk request (seconds).
+FANOUT_CONCURRENCY = int(os.getenv("DISTRICT_FANOUT_CONCURRENCY", 7))
+FANOUT_DEADLINE = float(os.getenv("DISTRICT_FANOUT_DEADLINE", 8.0))
+
+def unavailable_entry(district: Dict) -> Dict:
+    """Placeholder for a district with no assessment yet, so every district is listed."""
+    return {
+        "district": district["name"], "score": None, "level": None,
+        "lat": district["lat"], "lon": district["lon"],
+        "temp": None, "humidity": None, "rainfall": None,
+        "status": "unavailable", "age_seconds": None
+    }
+
+class DistrictRiskFanout:
+    """
+    Assesses many districts concurrently under a shared deadline.
+    Districts that miss the deadline (or fail) fall back to their last
+    successful assessment, flagged as stale with its age.
+    """
+
+    def __init__(self, engine=environmental_risk_engine,
+                 concurrency: int = FANOUT_CONCURRENCY,
+                 deadline: float = FANOUT_DEADLINE):
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.deadline = deadline
+        self._last_good: Dict[str, tuple] = {}
+
+    async def _assess(self, district: Dict, semaphore: asyncio.Semaphore) -> Dict:
+        async with semaphore:
+            risk = await self.engine.analyze_risk(district["lat"], district["lon"])
+        metrics = risk.get("aggregated_metrics", {})
+        return {
+            "district": district["name"],
+            "score": risk["score"],
+            "level": risk["severity_label"],
+            "lat": district["lat"],
+            "lon": district["lon"],
+            "temp": metrics.get("temperature"),
+            "humidity": metrics.get("humidity"),
+            "rainfall": metrics.get("rainfall")
+        }
+
+    async def collect(self, districts: List[Dict] = KERALA_DISTRICTS,
+                      deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Returns one entry per district, in input order. Each entry carries
+        `status` ("fresh", "stale", or "unavailable" with a null score and
+        level when there is nothing to fall back to) and `age_seconds`.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = {
+            asyncio.create_task(self._assess(d, semaphore)): d
+            for d in districts
+        }
+        done, pending = await asyncio.wait(tasks.keys(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+
+        now = time.time()
+        results = []
+        for task, district in tasks.items():
+            name = district["name"]
+            if task in done and not task.cancelled() and task.exception() is None:
+                entry = {**task.result(), "status": "fresh", "age_seconds": 0}
+                self._last_good[name] = (entry, now)
+                results.append(entry)
+                continue
+
+            reason = "timeout" if task in pending or task.cancelled() else str(task.exception())
+            logger.warning(f"District risk unavailable for {name}: {reason}")
+            cached = self._last_good.get(name)
+            if cached:
+                entry, fetched_at = cached
+                results.append({
+                    **entry,
+                    "status": "stale",
+                    "age_seconds": round(now - fetched_at, 1)
+                })
+            else:
+                results.append(unavailable_entry(district))
+
+        if pending:
+            logger.warning(f"District fan-out deadline ({deadline}s) hit; {len(pending)} district(s) pending.")
+        return results
+
+# Singleton
+district_risk_fanout = DistrictRiskFanout()
@@ -0,0 +1,32 @@
+import math
+import os
+from typing import Dict, Optional
+
+# Points farther than this (degrees) from every district centre belong to none
+MAX_DISTRICT_DISTANCE_DEG = float(os.getenv("MAX_DISTRICT_DISTANCE_DEG", 0.5))
+
+KERALA_DISTRICTS = [
+    {"name": "Thiruvananthapuram", "lat": 8.5241, "lon": 76.9366},
+    {"name": "Kollam", "lat": 8.8932, "lon": 76.6141},
+    {"name": "Pathanamthitta", "lat": 9.2648, "lon": 76.7870},
+    {"name": "Alappuzha", "lat": 9.4981, "lon": 76.3388},
+    {"name": "Kottayam", "lat": 9.5916, "lon": 76.5222},
+    {"name": "Idukki", "lat": 9.8517, "lon": 76.9746},
+    {"name": "Ernakulam", "lat": 9.9816, "lon": 76.2999},
+    {"name": "Thrissur", "lat": 10.5276, "lon": 76.2144},
+    {"name": "Palakkad", "lat": 10.7867, "lon": 76.6547},
+    {"name": "Malappuram", "lat": 11.0735, "lon": 76.0740},
+    {"name": "Kozhikode", "lat": 11.2588, "lon": 75.7804},
+    {"name": "Wayanad", "lat": 11.6854, "lon": 76.1320},
+    {"name": "Kannur", "lat": 11.8745, "lon": 75.3704},
+    {"name": "Kasaragod", "lat": 12.5101, "lon": 74.9852}
+]
+
+def nearest_district(lat: float, lon: float, max_distance: float = MAX_DISTRICT_DISTANCE_DEG) -> Optional[Dict]:
+    """District whose centre is closest to the point, or None outside Kerala."""
+    best, best_distance = None, max_distance
+    for district in KERALA_DISTRICTS:
+        distance = math.hypot(district["lat"] - lat, district["lon"] - lon)
+        if distance <= best_distance:
+            best, best_distance = district, distance
+    return best
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from backend.services.fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("districts", "alerts", "emergencies")
+QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", 256))
+REPLAY_SIZE = int(os.getenv("EVENT_REPLAY_SIZE", 1024))
+KEEPALIVE_SECONDS = float(os.getenv("EVENT_KEEPALIVE", 15))
+RETRY_MS = int(os.getenv("EVENT_RETRY_MS", 3000))
+
+def encode_event(event_id: int, topic: str, data: Any) -> bytes:
+    """One Server-Sent Events frame. Payloads are single-line JSON."""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, topic.encode(), dumps(data))
+
+class _Subscriber:
+    __slots__ = ("queue", "topics", "closed")
+
+    def __init__(self, topics: Set[str], queue_size: int):
+        self.queue: "asyncio.Queue[Tuple[int, bytes]]" = asyncio.Queue(maxsize=queue_size)
+        self.topics = topics
+        self.closed = False
+
+class EventBroadcaster:
+    """
+    In-process pub/sub behind the /api/events SSE stream. Each event is
+    serialized once and the same bytes are queued for every subscriber, so
+    publishing costs one encode plus a queue put per connection. Server work
+    follows the rate of change, not the number of open tabs.
+
+    Recent frames are kept for replay: a client reconnecting with
+    Last-Event-ID receives what it missed. A subscriber that falls
+    QUEUE_SIZE frames behind is disconnected and catches up the same way.
+    """
+
+    def __init__(self, queue_size: int = QUEUE_SIZE, replay_size: int = REPLAY_SIZE,
+                 keepalive: float = KEEPALIVE_SECONDS):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._subscribers: Set[_Subscriber] = set()
+        self._replay: "deque[Tuple[int, str, bytes]]" = deque(maxlen=replay_size)
+        self._last_id = 0
+        self._stats = {"published": 0, "delivered": 0, "lagging_disconnects": 0, "connections": 0}
+
+    @property
+    def last_event_id(self) -> int:
+        return self._last_id
+
+    def publish(self, topic: str, data: Any) -> int:
+        """Broadcasts one event (call from the event loop). Returns its id."""
+        self._last_id += 1
+        frame = encode_event(self._last_id, topic, data)
+        self._replay.append((self._last_id, topic, frame))
+        self._stats["published"] += 1
+        for sub in list(self._subscribers):
+            if topic not in sub.topics:
+                continue
+            try:
+                sub.queue.put_nowait((self._last_id, frame))
+                self._stats["delivered"] += 1
+            except asyncio.QueueFull:
+                sub.closed = True
+                self._subscribers.discard(sub)
+                self._stats["lagging_disconnects"] += 1
+        return self._last_id
+
+    def _replay_since(self, last_id: int, topics: Set[str]) -> Optional[List[Tuple[int, bytes]]]:
+        """Frames after `last_id`, or None if some of them already left the buffer."""
+        if last_id > self._last_id:
+            return None  # id from before a server restart
+        if last_id == self._last_id:
+            return []
+        if not self._replay or self._replay[0][0] > last_id + 1:
+            return None
+        return [(event_id, frame) for event_id, topic, frame in self._replay
+                if event_id > last_id and topic in topics]
+
+    async def stream(self, topics: Iterable[str] = TOPICS, last_event_id: Optional[int] = None,
+                     initial: Optional[Callable[[], List[Tuple[str, Any]]]] = None) -> AsyncIterator[bytes]:
+        """
+        SSE byte stream for one client. Resumes from `last_event_id` when the
+        replay buffer still covers it; otherwise starts with the `initial`
+        events (current state) before live updates.
+        """
+        sub = _Subscriber(set(topics), self.queue_size)
+        # Subscribe before reading the replay buffer so nothing falls in between
+        self._subscribers.add(sub)
+        self._stats["connections"] += 1
+        sent_id = 0
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            backlog = self._replay_since(last_event_id, sub.topics) if last_event_id is not None else None
+            if backlog is None:
+                sent_id = self._last_id
+                for topic, data in (initial() if initial else []):
+                    if topic in sub.topics:
+                        yield encode_event(sent_id, topic, data)
+            else:
+                for event_id, frame in backlog:
+                    yield frame
+                    sent_id = event_id
+
+            while not (sub.closed and sub.queue.empty()):
+                try:
+                    event_id, frame = await asyncio.wait_for(sub.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from timing out idle connections
+                    yield b": keepalive\n\n"
+                    continue
+                if event_id > sent_id:
+                    yield frame
+                    sent_id = event_id
+        finally:
+            self._subscribers.discard(sub)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "subscribers": len(self._subscribers),
+            "last_event_id": self._last_id,
+            "replay_buffered": len(self._replay)
+        }
+
+# Singleton
+event_broadcaster = EventBroadcaster()
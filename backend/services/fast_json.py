@@ -0,0 +1,53 @@
+import json
+import logging
+import math
+from typing import Any
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+def _default(value: Any):
+    # numpy scalars/arrays and anything else the encoders don't know natively
+    if hasattr(value, "tolist"):
+        return _finite(value.tolist())
+    return str(value)
+
+def _finite(value: Any):
+    """Non-finite floats become None (as orjson writes them), recursively."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+def stdlib_dumps(payload: Any) -> bytes:
+    """Compact UTF-8 JSON. NaN/inf become null, never the invalid NaN/Infinity literals."""
+    return json.dumps(_finite(payload), default=_default, separators=(",", ":"),
+                      ensure_ascii=False, allow_nan=False).encode()
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(payload: Any) -> bytes:
+        """Compact UTF-8 JSON. NaN/inf become null."""
+        return orjson.dumps(payload, default=_default, option=_ORJSON_OPTIONS)
+else:
+    dumps = stdlib_dumps
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered straight from plain dicts/lists with orjson when
+    installed. Returning it from an endpoint also skips FastAPI's
+    jsonable_encoder pass over the payload.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from backend.services.districts import KERALA_DISTRICTS
+
+logger = logging.getLogger(__name__)
+
+# Days of history kept per district (rain_7d_total needs 7)
+WINDOW_DAYS = 7
+# Kerala is UTC+5:30: daily buckets roll over at local midnight
+DAY_OFFSET_SECONDS = 19800
+# Longest stretch one observation's hourly rain rate is assumed to cover
+MAX_RATE_SECONDS = float(os.getenv("FEATURE_RATE_MAX_SECONDS", 3600))
+
+_EPOCH = date(1970, 1, 1)
+
+def day_number(timestamp: float) -> int:
+    """Local (IST) calendar day as days since the epoch."""
+    return int((timestamp + DAY_OFFSET_SECONDS) // 86400)
+
+class DistrictFeatureStore:
+    """
+    Rolling daily weather per district, kept in fixed-size ring buffers: one
+    float64 row of WINDOW_DAYS slots per district for rain, temperature and
+    humidity, with the current day at `head`. Serves the same features the
+    model is trained on (yesterday's rain, 3/7-day rain totals, day-over-day
+    temperature and humidity trends) without touching the history files.
+
+    Each observation updates the current day in O(1): rain accrues at the
+    observed hourly rate for the time since the previous observation, and
+    the day's temperature/humidity are running means. The 3/7-day rain sums
+    are maintained incrementally and recomputed exactly (WINDOW_DAYS slots)
+    only when a day rolls over. Days without observations count as no rain
+    and unknown temperature/humidity (trend 0).
+    """
+
+    def __init__(self, districts: List[Dict] = KERALA_DISTRICTS, window: int = WINDOW_DAYS):
+        self.names = [d["name"] for d in districts]
+        self.window = window
+        self._index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self._rain = np.zeros((n, window))
+        self._temp = np.full((n, window), np.nan)
+        self._humid = np.full((n, window), np.nan)
+        self._head = np.zeros(n, dtype=np.int64)
+        self._day = np.full(n, -1, dtype=np.int64)  # day number of the head slot; -1: empty
+        self._rain_3d = np.zeros(n)
+        self._rain_7d = np.zeros(n)
+        # Current day's readings
+        self._obs_count = np.zeros(n, dtype=np.int64)
+        self._temp_sum = np.zeros(n)
+        self._humid_sum = np.zeros(n)
+        self._last_obs = np.zeros(n)
+        # Last day filled from history: a complete daily value, not extended by observations
+        self._sealed_day = np.full(n, -1, dtype=np.int64)
+        self._lock = threading.Lock()
+        self._stats = {"observations": 0, "ignored": 0, "seeded_days": 0}
+
+    def _advance(self, i: int, day: int):
+        """Moves district i's head forward to `day`, clearing the slots it passes."""
+        steps = day - self._day[i]
+        if steps <= 0:
+            return
+        if self._day[i] < 0 or steps >= self.window:
+            self._rain[i] = 0.0
+            self._temp[i] = np.nan
+            self._humid[i] = np.nan
+            self._head[i] = 0
+        else:
+            for _ in range(steps):
+                head = self._head[i] = (self._head[i] + 1) % self.window
+                self._rain[i, head] = 0.0
+                self._temp[i, head] = np.nan
+                self._humid[i, head] = np.nan
+        self._day[i] = day
+        self._obs_count[i] = 0
+        self._temp_sum[i] = self._humid_sum[i] = 0.0
+        self._resum(i)
+
+    def _resum(self, i: int):
+        slots = (self._head[i] - np.arange(3)) % self.window
+        self._rain_3d[i] = self._rain[i, slots].sum()
+        self._rain_7d[i] = self._rain[i].sum()
+
+    def observe(self, district: str, temp: float, humidity: float, rain_1h: float,
+                timestamp: Optional[float] = None) -> bool:
+        """
+        Folds one current-weather observation into the district's day.
+        Returns False if it was ignored (unknown district, not newer than the
+        last observation, or a day already filled from history).
+        """
+        i = self._index.get(district)
+        now = time.time() if timestamp is None else float(timestamp)
+        day = day_number(now)
+        with self._lock:
+            if i is None or now <= self._last_obs[i] or day < self._day[i] or day <= self._sealed_day[i]:
+                self._stats["ignored"] += 1
+                return False
+            self._advance(i, day)
+            day_start = day * 86400 - DAY_OFFSET_SECONDS
+            elapsed = min(now - max(self._last_obs[i], day_start), MAX_RATE_SECONDS)
+            rain = max(float(rain_1h or 0), 0.0) * elapsed / 3600
+
+            head = self._head[i]
+            self._rain[i, head] += rain
+            self._rain_3d[i] += rain
+            self._rain_7d[i] += rain
+            self._obs_count[i] += 1
+            self._temp_sum[i] += temp
+            self._humid_sum[i] += humidity
+            self._temp[i, head] = self._temp_sum[i] / self._obs_count[i]
+            self._humid[i, head] = self._humid_sum[i] / self._obs_count[i]
+            self._last_obs[i] = now
+            self._stats["observations"] += 1
+        return True
+
+    def seed(self, district: str, dates, rain, temp, humidity) -> int:
+        """Loads complete daily values (oldest first, ISO dates or datetime64). Returns days loaded."""
+        i = self._index.get(district)
+        if i is None:
+            return 0
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        loaded = 0
+        with self._lock:
+            for day, r, t, h in zip(days.tolist(), rain, temp, humidity):
+                if day < self._day[i]:
+                    continue
+                self._advance(i, day)
+                head = self._head[i]
+                self._rain[i, head] = r
+                self._temp[i, head] = t
+                self._humid[i, head] = h
+                self._sealed_day[i] = day
+                loaded += 1
+            self._resum(i)
+            self._stats["seeded_days"] += loaded
+        return loaded
+
+    def seed_from_history(self, store=None) -> int:
+        """Fills each district's window from the last WINDOW_DAYS days of the history store."""
+        if store is None:
+            from backend.utils.history_store import history_store as store
+        if not store.available:
+            logger.warning("History store unavailable; rolling features start from live observations only.")
+            return 0
+        loaded = 0
+        for name, entry in store.districts().items():
+            if name not in self._index:
+                continue
+            start = date.fromisoformat(entry["last_date"]) - timedelta(days=self.window - 1)
+            rows = store.query(name, start=start.isoformat(),
+                               columns=["date", "rainfall_mm", "temperature_c", "humidity_p"])
+            data = rows["data"]
+            loaded += self.seed(name, data["date"], data["rainfall_mm"], data["temperature_c"], data["humidity_p"])
+        logger.info(f"Feature store seeded with {loaded} district-day(s) of history.")
+        return loaded
+
+    def features(self, district: str, now: Optional[float] = None) -> Optional[Dict]:
+        """Rolling features as of today (`now`), or None for an unknown district."""
+        i = self._index.get(district)
+        if i is None:
+            return None
+        with self._lock:
+            self._advance(i, day_number(time.time() if now is None else now))
+            head = self._head[i]
+            previous = (head - 1) % self.window
+            temps = self._temp[i, (head - np.arange(3)) % self.window]
+
+            def trend(values):
+                change = values[head] - values[previous]
+                return float(change) if np.isfinite(change) else 0.0
+
+            return {
+                "rain_today": float(self._rain[i, head]),
+                "rain_1d": float(self._rain[i, previous]),
+                "rain_3d": float(self._rain_3d[i]),
+                "rain_7d": float(self._rain_7d[i]),
+                "temp_trend": trend(self._temp[i]),
+                "humid_trend": trend(self._humid[i]),
+                "temp_3d_avg": float(np.nanmean(temps)) if np.isfinite(temps).any() else None,
+                "days_known": int(np.isfinite(self._temp[i]).sum())
+            }
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "districts": len(self.names),
+                "window_days": self.window,
+                "latest_day": {
+                    name: str(_EPOCH + timedelta(days=int(day))) if day >= 0 else None
+                    for name, day in zip(self.names, self._day.tolist())
+                }
+            }
+
+# Singleton
+feature_store = DistrictFeatureStore()
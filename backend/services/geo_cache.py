@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Coordinates are snapped to this grid (degrees) before lookup.
+# 0.05 deg is roughly 5.5 km at Kerala's latitude - well inside one OpenAQ station radius.
+GRID_DEGREES = float(os.getenv("GEO_CACHE_GRID_DEG", 0.05))
+MAX_ENTRIES = int(os.getenv("GEO_CACHE_MAX_ENTRIES", 1024))
+
+Fetcher = Callable[[float, float], Awaitable[Dict[str, Any]]]
+
+class GeoTTLCache:
+    """
+    LRU + TTL cache keyed on grid-snapped coordinates, with stale-while-revalidate.
+
+    - age < ttl: served from memory.
+    - ttl <= age < ttl + stale_ttl: served stale while one background refresh runs.
+    - older / missing: fetched inline; concurrent misses for a cell share one fetch.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float,
+                 max_entries: int = MAX_ENTRIES, grid: float = GRID_DEGREES,
+                 cacheable: Callable[[Dict[str, Any]], bool] = lambda data: True):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max(1, max_entries)
+        self.grid = grid
+        self.cacheable = cacheable
+        self._entries: "OrderedDict[Tuple[float, float], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[float, float], asyncio.Task] = {}
+        self._background = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    def key(self, lat: float, lon: float) -> Tuple[float, float]:
+        if self.grid <= 0:
+            return (lat, lon)
+        return (round(round(lat / self.grid) * self.grid, 6),
+                round(round(lon / self.grid) * self.grid, 6))
+
+    def _store(self, key, data: Dict[str, Any]):
+        if not self.cacheable(data):
+            return
+        self._entries[key] = (time.monotonic(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def _fetch(self, key, lat: float, lon: float, fetcher: Fetcher) -> Dict[str, Any]:
+        # Single-flight: every caller for this cell, the first one included,
+        # awaits the same detached fetch task through a shield. A cancelled
+        # caller (stage timeout, fan-out deadline) only stops waiting; the
+        # fetch and the other callers carry on.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_fetch(key, lat, lon, fetcher))
+            # Mark the outcome retrieved even if every caller gave up on it
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _run_fetch(self, key, lat: float, lon: float, fetcher: Fetcher) -> Dict[str, Any]:
+        try:
+            data = await fetcher(lat, lon)
+            self._store(key, data)
+            return data
+        finally:
+            self._inflight.pop(key, None)
+
+    def _refresh_in_background(self, key, lat: float, lon: float, fetcher: Fetcher):
+        if key in self._inflight:
+            return
+        self._stats["refreshes"] += 1
+
+        async def _run():
+            try:
+                await self._fetch(key, lat, lon, fetcher)
+            except Exception as e:
+                logger.warning(f"[{self.name}] background refresh failed for {key}: {e}")
+
+        task = asyncio.create_task(_run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_or_fetch(self, lat: float, lon: float, fetcher: Fetcher) -> Dict[str, Any]:
+        key = self.key(lat, lon)
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, data = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return data
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                self._refresh_in_background(key, lat, lon, fetcher)
+                return data
+
+        self._stats["misses"] += 1
+        return await self._fetch(key, lat, lon, fetcher)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "grid_degrees": self.grid,
+        }
+
+def _is_live_response(data: Optional[Dict[str, Any]]) -> bool:
+    """Only cache real upstream payloads, never error or mock fallbacks."""
+    return bool(data) and "error" not in data and not data.get("mock")
+
+weather_cache = GeoTTLCache(
+    "weather",
+    ttl=float(os.getenv("WEATHER_CACHE_TTL", 300)),
+    stale_ttl=float(os.getenv("WEATHER_CACHE_STALE_TTL", 600)),
+    cacheable=_is_live_response
+)
+
+aqi_cache = GeoTTLCache(
+    "aqi",
+    ttl=float(os.getenv("AQI_CACHE_TTL", 900)),
+    stale_ttl=float(os.getenv("AQI_CACHE_STALE_TTL", 1800)),
+    cacheable=_is_live_response
+)
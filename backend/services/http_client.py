@@ -0,0 +1,97 @@
+import httpx
+import os
+import logging
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing / keep-alive (override via env for larger deployments)
+MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", 20))
+MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", 10))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", 60.0))
+HTTP2_ENABLED = os.getenv("HTTP_POOL_HTTP2", "false").lower() in ("1", "true", "yes")
+
+DEFAULT_TIMEOUT = 10.0
+HOST_TIMEOUTS = {
+    "api.openweathermap.org": 5.0,
+    "api.openaq.org": 10.0,
+}
+
+class HttpClientPool:
+    """
+    One long-lived httpx.AsyncClient shared by all upstream fetchers, so
+    requests to OpenWeather/OpenAQ reuse keep-alive connections instead of
+    paying a TCP+TLS handshake per call. Started/closed by the app lifespan.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = False
+        self._stats = {"requests": 0, "connections_opened": 0, "tls_handshakes": 0, "errors": 0}
+
+    async def start(self):
+        if self._client is not None:
+            return
+        http2 = HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("HTTP/2 requested but 'h2' is not installed. Falling back to HTTP/1.1.")
+                http2 = False
+        self.http2 = http2
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            )
+        )
+        logger.info(f"HTTP client pool started (max={MAX_CONNECTIONS}, keepalive={MAX_KEEPALIVE}, http2={http2}).")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("HTTP client pool closed.")
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        # httpcore trace hook: only fires for new connections, never for reused ones
+        if event_name == "connection.connect_tcp.complete":
+            self._stats["connections_opened"] += 1
+        elif event_name == "connection.start_tls.complete":
+            self._stats["tls_handshakes"] += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared pool with the per-host timeout applied."""
+        if self._client is None:
+            await self.start()
+        host = urlsplit(url).hostname or ""
+        kwargs.setdefault("timeout", HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT))
+        extensions = {**kwargs.pop("extensions", {}), "trace": self._trace}
+        self._stats["requests"] += 1
+        try:
+            return await self._client.get(url, extensions=extensions, **kwargs)
+        except httpx.HTTPError:
+            self._stats["errors"] += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self._stats["requests"] - self._stats["errors"]
+        opened = self._stats["connections_opened"]
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", []) if pool is not None else []
+        return {
+            **self._stats,
+            "active": self._client is not None,
+            "http2": self.http2,
+            "pool_size": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "reuse_ratio": round(max(0.0, 1 - opened / completed), 3) if completed else 0.0,
+        }
+
+# Singleton
+http_pool = HttpClientPool()
@@ -0,0 +1,234 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from backend.services.rollups import apply_rollups
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", 200))
+FLUSH_INTERVAL = float(os.getenv("DB_WRITE_FLUSH_INTERVAL", 1.0))
+QUEUE_MAX = int(os.getenv("DB_WRITE_QUEUE_MAX", 10000))
+# Coalescing mode: one row per (grid cell, time bucket), upserted instead of appended
+COALESCE_ENABLED = os.getenv("PREDICTION_COALESCE", "false").lower() in ("1", "true", "yes")
+COALESCE_GRID_DEG = float(os.getenv("PREDICTION_COALESCE_GRID_DEG", 0.05))
+COALESCE_BUCKET_SECONDS = int(os.getenv("PREDICTION_COALESCE_BUCKET", 900))
+
+INSERT_PREDICTION = '''
+    INSERT INTO predictions (location, lat, lon, risk_score, risk_level, temp, pm25)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Schema migration: coalescing columns. Appended rows leave cell NULL and are
+# outside the partial unique index, so both modes share the predictions table.
+COALESCE_MIGRATION = [
+    "ALTER TABLE predictions ADD COLUMN cell TEXT",
+    "ALTER TABLE predictions ADD COLUMN bucket TEXT",
+    "ALTER TABLE predictions ADD COLUMN hit_count INTEGER NOT NULL DEFAULT 1",
+    "ALTER TABLE predictions ADD COLUMN min_score REAL",
+    "ALTER TABLE predictions ADD COLUMN max_score REAL",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_cell_bucket ON predictions(cell, bucket) WHERE cell IS NOT NULL",
+]
+
+# Re-coalescing a cell takes its row out and inserts the merged reading under a
+# new (AUTOINCREMENT) id, so id-ordered paging and since_id delta sync see every
+# update; the superseded id simply disappears. The row keeps the latest
+# reading; hit_count and min/max cover the whole bucket.
+TAKE_COALESCED = '''
+    DELETE FROM predictions WHERE cell = ? AND bucket = ?
+    RETURNING hit_count, min_score, max_score
+'''
+
+INSERT_COALESCED = '''
+    INSERT INTO predictions (
+        location, lat, lon, risk_score, risk_level, temp, pm25,
+        cell, bucket, hit_count, min_score, max_score
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_STOP = object()
+
+def open_connection(db_path: str) -> sqlite3.Connection:
+    """Long-lived connection tuned for an append-heavy table."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL: durable across app crashes, fsync only at checkpoints
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+def current_bucket(seconds: int = COALESCE_BUCKET_SECONDS) -> str:
+    """Start of the current UTC bucket, formatted like SQLite's CURRENT_TIMESTAMP."""
+    now = int(time.time())
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now - now % seconds))
+
+def grid_cell(lat, lon, grid: float = COALESCE_GRID_DEG) -> Optional[str]:
+    if lat is None or lon is None:
+        return None
+    return f"{round(lat / grid) * grid:.4f},{round(lon / grid) * grid:.4f}"
+
+def coalesce_rows(rows: Sequence[Tuple[Any, ...]], bucket: str,
+                  grid: float = COALESCE_GRID_DEG) -> List[Tuple[Any, ...]]:
+    """
+    Folds a batch of predictions rows into one INSERT_COALESCED tuple per grid
+    cell (last reading wins, hits and min/max accumulate). Rows without
+    coordinates get a NULL cell and are appended as-is.
+    """
+    cells: Dict[Any, list] = {}
+    for i, row in enumerate(rows):
+        score = row[3]
+        cell = grid_cell(row[1], row[2], grid)
+        key = cell if cell is not None else ("row", i)
+        entry = cells.get(key)
+        if entry is None:
+            cells[key] = [*row, cell, bucket if cell is not None else None, 1, score, score]
+            continue
+        hits, low, high = entry[9] + 1, entry[10], entry[11]
+        if score is not None:
+            low = score if low is None else min(low, score)
+            high = score if high is None else max(high, score)
+        entry[:] = [*row, cell, bucket, hits, low, high]
+    return [tuple(entry) for entry in cells.values()]
+
+def _combine(fn, a, b):
+    return b if a is None else a if b is None else fn(a, b)
+
+def write_coalesced(conn: sqlite3.Connection, rows: Sequence[Tuple[Any, ...]]):
+    """Merges coalesced rows (see coalesce_rows) with their cell's stored row, if any."""
+    for row in rows:
+        cell, bucket, hits, low, high = row[7:]
+        if cell is not None:
+            for previous_hits, previous_low, previous_high in conn.execute(TAKE_COALESCED, (cell, bucket)).fetchall():
+                hits += previous_hits
+                low = _combine(min, low, previous_low)
+                high = _combine(max, high, previous_high)
+        conn.execute(INSERT_COALESCED, (*row[:7], cell, bucket, hits, low, high))
+
+class PredictionWriter:
+    """
+    Write-behind queue for prediction rows. Request handlers only enqueue;
+    a dedicated thread owns one WAL-mode connection and commits in batches
+    of BATCH_SIZE rows or every FLUSH_INTERVAL seconds, whichever comes first.
+
+    With `coalesce` on, rows are merged into one row per grid cell and time
+    bucket instead of appended (each merge re-inserts it under a new id, so
+    delta sync sees it); hourly rollups still count every reading.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, max_queue: int = QUEUE_MAX,
+                 coalesce: bool = COALESCE_ENABLED):
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.coalesce = coalesce
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0, "written": 0, "dropped": 0, "failed": 0, "commits": 0, "row_writes": 0,
+            "last_commit_ms": 0.0, "max_commit_ms": 0.0, "total_commit_ms": 0.0
+        }
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="prediction-writer", daemon=True)
+                self._thread.start()
+                logger.info(f"Prediction writer started (batch={self.batch_size}, interval={self.flush_interval}s).")
+
+    def stop(self, timeout: float = 10.0):
+        """Flushes everything queued so far, then stops the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.error(f"Prediction writer did not stop in {timeout}s; {self._queue.qsize()} row(s) pending.")
+        else:
+            logger.info("Prediction writer flushed and stopped.")
+        self._thread = None
+
+    def submit(self, row: Tuple[Any, ...]) -> bool:
+        """Enqueue one predictions row. Never blocks; returns False if the queue is full."""
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(row)
+            self._stats["enqueued"] += 1
+            return True
+        except queue.Full:
+            self._stats["dropped"] += 1
+            logger.warning("Prediction write queue full; dropping row.")
+            return False
+
+    def _run(self):
+        conn = open_connection(self.db_path)
+        stopping = False
+        try:
+            while not stopping:
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                if batch:
+                    self._write(conn, batch)
+            # Drain anything that raced in behind the stop marker
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    leftover.append(item)
+            if leftover:
+                self._write(conn, leftover)
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch):
+        started = time.perf_counter()
+        try:
+            with conn:
+                if self.coalesce:
+                    rows = coalesce_rows(batch, current_bucket())
+                    write_coalesced(conn, rows)
+                else:
+                    rows = batch
+                    conn.executemany(INSERT_PREDICTION, rows)
+                # Hourly rollups are updated in the same transaction as the raw rows
+                apply_rollups(conn, batch)
+            self._stats["written"] += len(batch)
+            self._stats["row_writes"] += len(rows)
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            logger.error(f"Failed to write {len(batch)} prediction(s): {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._stats["commits"] += 1
+        self._stats["last_commit_ms"] = round(elapsed_ms, 3)
+        self._stats["max_commit_ms"] = round(max(self._stats["max_commit_ms"], elapsed_ms), 3)
+        self._stats["total_commit_ms"] += elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        commits = self._stats["commits"]
+        return {
+            **self._stats,
+            "total_commit_ms": round(self._stats["total_commit_ms"], 3),
+            "avg_commit_ms": round(self._stats["total_commit_ms"] / commits, 3) if commits else 0.0,
+            "avg_batch_rows": round(self._stats["written"] / commits, 1) if commits else 0.0,
+            "coalesce": self.coalesce,
+            "queue_depth": self._queue.qsize(),
+            "running": self._thread is not None and self._thread.is_alive()
+        }
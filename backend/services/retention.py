@@ -0,0 +1,218 @@
+import asyncio
+import glob
+import os
+import sqlite3
+import time
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import numpy as np
+from backend.services import rollups
+
+logger = logging.getLogger(__name__)
+
+RETENTION_ENABLED = os.getenv("RETENTION_ENABLED", "true").lower() in ("1", "true", "yes")
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", 90))
+RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", 6 * 3600))
+# Free-list pages returned to the OS per run (PRAGMA incremental_vacuum)
+VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", 2000))
+ARCHIVE_DIR = os.getenv("PREDICTION_ARCHIVE_DIR", "backend/data/archive")
+
+ARCHIVE_COLUMNS = ["id", "timestamp", "location", "lat", "lon", "risk_score", "risk_level", "temp", "pm25",
+                   "hit_count", "min_score", "max_score"]
+NUMERIC_COLUMNS = {"id": np.int64, "lat": np.float64, "lon": np.float64,
+                   "risk_score": np.float64, "temp": np.float64, "pm25": np.float64,
+                   "hit_count": np.int64, "min_score": np.float64, "max_score": np.float64}
+# Columns added after the first archives were written, with their fill values
+COLUMN_DEFAULTS = {"hit_count": 1, "min_score": np.nan, "max_score": np.nan}
+
+def archive_path(month: str, archive_dir: str = ARCHIVE_DIR) -> str:
+    return os.path.join(archive_dir, f"predictions-{month}.npz")
+
+def _to_columns(rows) -> Dict[str, np.ndarray]:
+    columns = {}
+    for i, name in enumerate(ARCHIVE_COLUMNS):
+        values = [row[i] for row in rows]
+        if name in NUMERIC_COLUMNS:
+            columns[name] = np.array([np.nan if v is None else v for v in values], dtype=NUMERIC_COLUMNS[name])
+        else:
+            columns[name] = np.array(["" if v is None else str(v) for v in values], dtype=str)
+    return columns
+
+@lru_cache(maxsize=8)
+def _load_archive(path: str, mtime: float) -> Dict[str, np.ndarray]:
+    with np.load(path, allow_pickle=False) as data:
+        size = len(data["id"])
+        return {
+            name: data[name] if name in data.files
+            else np.full(size, COLUMN_DEFAULTS[name], dtype=NUMERIC_COLUMNS[name])
+            for name in ARCHIVE_COLUMNS
+        }
+
+def load_archive(path: str) -> Dict[str, np.ndarray]:
+    """Columns of one monthly archive (cached until the file changes)."""
+    return _load_archive(path, os.path.getmtime(path))
+
+def write_archive(month: str, columns: Dict[str, np.ndarray], archive_dir: str = ARCHIVE_DIR) -> int:
+    """Merges rows into the month's archive (deduplicated by id, sorted). Returns the file's row count."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(month, archive_dir)
+    if os.path.exists(path):
+        existing = load_archive(path)
+        columns = {name: np.concatenate([existing[name], columns[name]]) for name in ARCHIVE_COLUMNS}
+    _, unique_idx = np.unique(columns["id"], return_index=True)
+    columns = {name: values[unique_idx] for name, values in columns.items()}
+
+    tmp_path = f"{path}.tmp.npz"
+    np.savez_compressed(tmp_path, **columns)
+    os.replace(tmp_path, path)
+    return len(columns["id"])
+
+def rebuild_archived_rollups(conn: sqlite3.Connection, archive_dir: str = ARCHIVE_DIR):
+    """Re-aggregates the rollups of archived rows (schema migration; live rows are done separately)."""
+    for path in sorted(glob.glob(os.path.join(archive_dir, "predictions-*.npz"))):
+        columns = load_archive(path)
+        optional = lambda value: None if np.isnan(value) else value
+        rollups.apply_stored_rows(conn, (
+            (timestamp, lat, lon, optional(score), level, optional(temp), optional(pm25),
+             hits, optional(low), optional(high))
+            for timestamp, lat, lon, score, level, temp, pm25, hits, low, high in zip(
+                columns["timestamp"].tolist(), columns["lat"].tolist(), columns["lon"].tolist(),
+                columns["risk_score"].tolist(), columns["risk_level"].tolist(), columns["temp"].tolist(),
+                columns["pm25"].tolist(), columns["hit_count"].tolist(), columns["min_score"].tolist(),
+                columns["max_score"].tolist())
+        ))
+
+def read_archived_page(before_id: Optional[int] = None, limit: int = 100,
+                       district: Optional[str] = None, level: Optional[str] = None,
+                       archive_dir: str = ARCHIVE_DIR) -> List[Dict[str, Any]]:
+    """Newest-first page over the archives, with the same filters as the hot history query."""
+    results: List[Dict[str, Any]] = []
+    for path in sorted(glob.glob(os.path.join(archive_dir, "predictions-*.npz")), reverse=True):
+        columns = load_archive(path)
+        mask = np.ones(len(columns["id"]), dtype=bool)
+        if before_id is not None:
+            mask &= columns["id"] < before_id
+        if district:
+            mask &= columns["location"] == district
+        if level:
+            mask &= columns["risk_level"] == level
+        idx = np.flatnonzero(mask)[::-1][:limit - len(results)]
+        for i in idx:
+            row = {}
+            for name in ARCHIVE_COLUMNS:
+                value = columns[name][i].item()
+                row[name] = None if isinstance(value, float) and np.isnan(value) else value
+            results.append(row)
+        if len(results) >= limit:
+            break
+    return results
+
+class RetentionManager:
+    """
+    Periodically moves predictions older than RETENTION_DAYS out of SQLite
+    into compressed, columnar monthly archives (one .npz per month, one array
+    per column), then returns freed pages with incremental vacuum.
+    Hourly rollups are kept, so trend stats still cover archived ranges.
+    """
+
+    def __init__(self, db_path: str, retention_days: int = RETENTION_DAYS,
+                 interval: float = RETENTION_INTERVAL, archive_dir: str = ARCHIVE_DIR):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.interval = interval
+        self.archive_dir = archive_dir
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Retention manager started (keep {self.retention_days} days).")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error(f"Retention run failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run(self) -> Dict[str, Any]:
+        async with self._lock:
+            self.last_report = await asyncio.to_thread(self.run_once)
+            return self.last_report
+
+    def run_once(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA busy_timeout=5000")
+        archived = 0
+        months = []
+        try:
+            cutoff = conn.execute(
+                "SELECT datetime('now', ?)", (f"-{self.retention_days} days",)
+            ).fetchone()[0]
+            # Month by month keeps memory bounded to one month of rows
+            months = [m for (m,) in conn.execute(
+                "SELECT DISTINCT substr(timestamp, 1, 7) FROM predictions WHERE timestamp < ?", (cutoff,)
+            )]
+            for month in months:
+                rows = conn.execute(f'''
+                    SELECT {", ".join(ARCHIVE_COLUMNS)} FROM predictions
+                    WHERE timestamp < ? AND substr(timestamp, 1, 7) = ?
+                    ORDER BY id
+                ''', (cutoff, month)).fetchall()
+                if not rows:
+                    continue
+                # Archive first, delete second: a crash in between only
+                # re-archives the same ids, which write_archive deduplicates.
+                write_archive(month, _to_columns(rows), self.archive_dir)
+                with conn:
+                    conn.executemany("DELETE FROM predictions WHERE id = ?", [(row[0],) for row in rows])
+                archived += len(rows)
+                logger.info(f"Archived {len(rows)} prediction(s) from {month}.")
+
+            freelist_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # The pragma frees one page per step and returns no rows, so
+            # cursor.execute() stops after the first; executescript() runs it to completion.
+            conn.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES});")
+            # Truncate the WAL so the shrunken main file is what's left on disk
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            freelist_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            conn.close()
+
+        return {
+            "ran_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cutoff": cutoff,
+            "archived_rows": archived,
+            "months": months,
+            "pages_vacuumed": freelist_before - freelist_after,
+            "db_size_bytes": page_count * page_size,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    def status(self) -> Dict[str, Any]:
+        files = sorted(glob.glob(os.path.join(self.archive_dir, "predictions-*.npz")))
+        return {
+            "enabled": self._task is not None,
+            "retention_days": self.retention_days,
+            "interval_seconds": self.interval,
+            "archives": [
+                {"file": os.path.basename(f), "bytes": os.path.getsize(f)} for f in files
+            ],
+            "last_run": self.last_report
+        }
@@ -1,33 +1,96 @@
-from backend.services.data_service import get_environmental_data
+import asyncio
+import os
+import time
+from typing import Dict
+from backend.services.data_service import get_weather, get_air_quality, build_environmental_data
+from backend.services.weather_api import get_unavailable_weather
+from backend.services.aqi_api import _get_mock_aqi
 from backend.utils.risk_ml import risk_engine
 from backend.services.risk_model import calculate_risk_score
 from backend.services.social_service import social_service
+from backend.services.stage_executor import Stage, StageExecutor
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-stage time budgets (seconds)
+STAGE_TIMEOUTS = {
+    "weather": float(os.getenv("STAGE_TIMEOUT_WEATHER", 6.0)),
+    "aqi": float(os.getenv("STAGE_TIMEOUT_AQI", 6.0)),
+    "ml": float(os.getenv("STAGE_TIMEOUT_ML", 2.0)),
+    "social": float(os.getenv("STAGE_TIMEOUT_SOCIAL", 2.0)),
+}
+
+# Longest a stage waits for its one-time warm-up before running anyway (seconds)
+WARM_UP_TIMEOUT = float(os.getenv("STAGE_WARM_UP_TIMEOUT", 30.0))
+
+ML_UNAVAILABLE = {"score": 0, "level": "Unavailable"}
+
 class RiskEngine:
     """
     Orchestrator service that combines Data Fetching, Rule-based Heuristics,
     Machine Learning, and Social Sentiment to produce a final Assessment.
     """
-    
-    async def analyze_risk(self, lat: float, lon: float):
+
+    def __init__(self):
+        self.executor = StageExecutor()
+        # First-use costs paid once, in a worker thread: the registry's model
+        # load and textblob's import. Stages wait for them outside their timeout.
+        self._loaders = {"ml": risk_engine.active_model, "social": social_service.warm_up}
+        self._warm_ups: Dict[str, asyncio.Task] = {}
+        self._warmed = set()
+
+    async def warm_up(self):
+        """Loads the model and the sentiment stack; call from the lifespan."""
+        await asyncio.gather(*(self._ready(name) for name in self._loaders))
+
+    async def _ready(self, name: str):
+        if name in self._warmed:
+            return
+        task = self._warm_ups.get(name)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._warm_ups[name] = asyncio.create_task(self._warm(name))
+        try:
+            await asyncio.wait_for(asyncio.shield(task), WARM_UP_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stage '{name}' still warming up after {WARM_UP_TIMEOUT}s; running it anyway.")
+
+    async def _warm(self, name: str):
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._loaders[name])
+            logger.info(f"Stage '{name}' warmed up in {time.perf_counter() - started:.2f}s.")
+        except Exception as e:
+            # The stage itself will fail and fall back; don't retry the load per request
+            logger.warning(f"Stage '{name}' warm-up failed: {e}")
+        self._warmed.add(name)
+
+    def _build_stages(self, lat: float, lon: float):
         """
-        Full pipeline: Data -> ML -> Social -> Risk Score -> Result
+        Stage graph:  weather --+--> features --> ml
+                      aqi ------+
+                      weather -----> social
+        Weather and AQI run concurrently; social only waits for the
+        location name from weather, ML only for the assembled features.
         """
-        # 1. Fetch Environmental Data
-        data = await get_environmental_data(lat, lon)
-        
-        if "error" in data:
-            logger.error(f"Risk Engine Data Error: {data['error']}")
-            raise Exception(data["error"])
+        async def weather(_):
+            return await get_weather(lat, lon)
 
-        # 2. ML Inference (Kerala Flood Focus)
-        try:
-            ml_res = risk_engine.predict_flood_risk(
+        async def aqi(_):
+            return await get_air_quality(lat, lon)
+
+        async def features(deps):
+            return build_environmental_data(deps["weather"], deps["aqi"])
+
+        async def ml(deps):
+            data = deps["features"]
+            if "error" in data:
+                return ML_UNAVAILABLE
+            # Model inference is CPU-bound; keep it off the event loop
+            return await asyncio.to_thread(
+                risk_engine.predict_flood_risk,
                 rainfall=data["rainfall"],
-                temp=data["temperature"], 
+                temp=data["temperature"],
                 humidity=data["humidity"],
                 rain_1d=data.get("rain_1d", 0),
                 rain_3d=data.get("rain_3d", 0),
@@ -35,25 +98,57 @@ class RiskEngine:
                 temp_trend=data.get("temp_trend", 0),
                 humid_trend=data.get("humid_trend", 0)
             )
-            ml_score = ml_res["score"]
-            ml_label = ml_res["level"]
-        except Exception as e:
-            logger.error(f"ML Engine Error: {e}")
-            ml_score = 0
-            ml_label = "Unavailable"
+
+        async def social(deps):
+            location_name = deps["weather"].get("name", "Local Area")
+            return await social_service.get_social_stress(location_name)
+
+        return [
+            Stage("weather", weather, timeout=STAGE_TIMEOUTS["weather"],
+                  fallback=lambda e: get_unavailable_weather(lat, lon, e)),
+            Stage("aqi", aqi, timeout=STAGE_TIMEOUTS["aqi"],
+                  fallback=lambda e: _get_mock_aqi(lat, lon)),
+            Stage("features", features, deps=("weather", "aqi")),
+            Stage("ml", ml, deps=("features",), timeout=STAGE_TIMEOUTS["ml"],
+                  fallback=ML_UNAVAILABLE, ready=lambda: self._ready("ml")),
+            Stage("social", social, deps=("weather",), timeout=STAGE_TIMEOUTS["social"],
+                  fallback=None, ready=lambda: self._ready("social")),
+        ]
+
+    async def analyze_risk(self, lat: float, lon: float):
+        """
+        Full pipeline: Data -> ML -> Social -> Risk Score -> Result
+        Independent stages run concurrently; see _build_stages.
+        """
+        results, timings = await self.executor.run(self._build_stages(lat, lon))
+
+        # 1. Environmental Data
+        data = results["features"]
+        if "error" in data:
+            logger.error(f"Risk Engine Data Error: {data['error']}")
+            raise Exception(data["error"])
+
+        # 2. ML Inference (Kerala Flood Focus)
+        ml_score = results["ml"]["score"]
+        ml_label = results["ml"]["level"]
 
         # 3. Social Stress Analysis
-        location_name = data.get("raw_weather", {}).get("name", "Local Area")
-        social_data = await social_service.get_social_stress(location_name)
+        social_data = results["social"]
 
         # 4. Heuristic / Hybrid Calculation
         base_assessment = calculate_risk_score(data["raw_weather"], data["raw_aqi"])
         
         # Combine Scores (70% Environmental, 30% Social)
         env_score = base_assessment["score"]
-        social_score = social_data["score"]
-        # Scale to 0-100 (Original scores were 1-10)
-        combined_score = round(((env_score * 0.7) + (social_score * 0.3)) * 10, 0)
+        if social_data is None:
+            # Social stage failed: score on the environment alone
+            social_data = {"score": None, "severity": "Unavailable", "sentiment_average": None,
+                           "recent_shouts": [], "stress_count": 0}
+            combined_score = round(env_score * 10, 0)
+        else:
+            social_score = social_data["score"]
+            # Scale to 0-100 (Original scores were 1-10)
+            combined_score = round(((env_score * 0.7) + (social_score * 0.3)) * 10, 0)
 
         # Determine Final Severity Label
         final_level = "Safe"
@@ -96,7 +191,8 @@ class RiskEngine:
                 "7_day_rain_total": data.get("7_day_rain_total"),
                 "heat_index": data.get("heat_index")
             },
-            "raw_data": data
+            "raw_data": data,
+            "stage_timings": timings
         }
 
 # Singleton
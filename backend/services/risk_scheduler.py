@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import time
+import logging
+from typing import Dict, List, Optional
+from backend.services.district_risk import KERALA_DISTRICTS, district_risk_fanout
+from backend.services.event_stream import event_broadcaster
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_ENABLED = os.getenv("RISK_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+TICK_SECONDS = float(os.getenv("RISK_SCHEDULER_TICK", 15))
+
+# How long a district's assessment stays current, by its last risk level (seconds).
+# Dangerous districts are re-assessed far more often than safe ones.
+REFRESH_INTERVALS = {
+    "Critical": float(os.getenv("RISK_REFRESH_CRITICAL", 60)),
+    "High": float(os.getenv("RISK_REFRESH_HIGH", 120)),
+    "Moderate": float(os.getenv("RISK_REFRESH_MODERATE", 300)),
+    "Safe": float(os.getenv("RISK_REFRESH_SAFE", 900)),
+}
+DEFAULT_REFRESH = REFRESH_INTERVALS["Moderate"]
+RETRY_SECONDS = 2 * TICK_SECONDS
+
+# Offline seed consumed by frontend/offline_manager.js
+SEED_PATH = os.getenv(
+    "OFFLINE_SEED_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 "frontend", "initial_districts_risk.json")
+)
+SEED_WRITE_INTERVAL = float(os.getenv("OFFLINE_SEED_WRITE_INTERVAL", 3600))
+SEED_FIELDS = ("district", "score", "level", "lat", "lon", "temp", "humidity")
+
+class DistrictRiskScheduler:
+    """
+    Keeps an in-memory snapshot of every district's assessment, refreshed in
+    the background on a risk-adaptive schedule. Endpoints read the snapshot
+    instead of re-running the pipeline per request. Changed districts and
+    risk level transitions are pushed to /api/events subscribers.
+    """
+
+    def __init__(self, fanout=district_risk_fanout, districts: List[Dict] = KERALA_DISTRICTS,
+                 broadcaster=event_broadcaster):
+        self.fanout = fanout
+        self.broadcaster = broadcaster
+        self.districts = districts
+        self.version = 0
+        self._snapshot: Dict[str, Dict] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._due_at: Dict[str, float] = {}
+        self._last_seed_write = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def refresh_interval(level: str) -> float:
+        return REFRESH_INTERVALS.get(level, DEFAULT_REFRESH)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("District risk scheduler started.")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("District risk scheduler stopped.")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh_due()
+            except Exception as e:
+                logger.error(f"District risk refresh failed: {e}")
+            await asyncio.sleep(TICK_SECONDS)
+
+    async def refresh_due(self, force: bool = False) -> int:
+        """Re-assesses the districts whose entry has expired. Returns how many were updated."""
+        now = time.time()
+        due = [d for d in self.districts if force or self._due_at.get(d["name"], 0) <= now]
+        if not due:
+            return 0
+
+        results = await self.fanout.collect(due)
+        fresh = {entry["district"]: entry for entry in results if entry["status"] == "fresh"}
+        now = time.time()
+        changed, transitions = [], []
+        for district in due:
+            name = district["name"]
+            entry = fresh.get(name)
+            if entry is None:
+                # Keep the previous entry, try again soon
+                self._due_at[name] = now + RETRY_SECONDS
+                continue
+            previous = self._snapshot.get(name)
+            if previous is None or (previous["score"], previous["level"]) != (entry["score"], entry["level"]):
+                changed.append(name)
+            if previous is not None and previous["level"] != entry["level"]:
+                transitions.append({
+                    "district": name, "from": previous["level"], "to": entry["level"],
+                    "score": entry["score"], "temp": entry.get("temp"), "rainfall": entry.get("rainfall")
+                })
+            self._snapshot[name] = entry
+            self._updated_at[name] = now
+            self._due_at[name] = now + self.refresh_interval(entry["level"])
+
+        if fresh:
+            self.version += 1
+            await self._maybe_write_seed(now)
+        if changed:
+            self.broadcaster.publish("districts", {
+                "version": self.version, "full": False,
+                "districts": [self._entry_with_age(name, now) for name in changed]
+            })
+        for transition in transitions:
+            self.broadcaster.publish("alerts", transition)
+        logger.info(f"District snapshot v{self.version}: refreshed {len(fresh)}/{len(due)} due district(s).")
+        return len(fresh)
+
+    def _entry_with_age(self, name: str, now: float) -> Dict:
+        entry = self._snapshot[name]
+        age = now - self._updated_at[name]
+        status = "fresh" if age <= self.refresh_interval(entry["level"]) else "stale"
+        return {**entry, "status": status, "age_seconds": round(age, 1)}
+
+    def snapshot(self) -> List[Dict]:
+        """All districts that have an assessment, in canonical order."""
+        now = time.time()
+        return [self._entry_with_age(d["name"], now) for d in self.districts if d["name"] in self._snapshot]
+
+    def snapshot_event(self) -> Dict:
+        """Full-state payload for a new /api/events subscriber."""
+        return {"version": self.version, "full": True, "districts": self.snapshot()}
+
+    def get(self, name: str) -> Optional[Dict]:
+        match = next((d["name"] for d in self.districts if d["name"].lower() == name.lower()), None)
+        if match is None or match not in self._snapshot:
+            return None
+        return self._entry_with_age(match, time.time())
+
+    async def _maybe_write_seed(self, now: float):
+        if now - self._last_seed_write < SEED_WRITE_INTERVAL:
+            return
+        if len(self._snapshot) < len(self.districts):
+            return  # never replace the seed with a partial map
+        seed = [{k: self._snapshot[d["name"]].get(k) for k in SEED_FIELDS} for d in self.districts]
+        try:
+            await asyncio.to_thread(_write_json_atomic, SEED_PATH, seed)
+            self._last_seed_write = now
+            logger.info(f"Offline district seed regenerated: {SEED_PATH}")
+        except Exception as e:
+            logger.error(f"Failed to write offline district seed: {e}")
+
+def _write_json_atomic(path: str, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=4)
+    os.replace(tmp_path, path)
+
+# Singleton
+district_risk_scheduler = DistrictRiskScheduler()
@@ -0,0 +1,188 @@
+import sqlite3
+import time
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from backend.services.districts import nearest_district
+
+logger = logging.getLogger(__name__)
+
+RISK_LEVELS = ["Safe", "Moderate", "High", "Critical"]
+# Rollup key for predictions that are not near any Kerala district
+OTHER_DISTRICT = "Other"
+
+# One row per (district, UTC hour). Sums and counts (not means) are stored so
+# batches merge with plain additions and any range can be re-aggregated exactly.
+CREATE_ROLLUP_TABLE = '''
+    CREATE TABLE IF NOT EXISTS prediction_rollups_hourly (
+        district TEXT NOT NULL,
+        hour TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        sum_score REAL NOT NULL,
+        min_score REAL,
+        max_score REAL,
+        safe_count INTEGER NOT NULL DEFAULT 0,
+        moderate_count INTEGER NOT NULL DEFAULT 0,
+        high_count INTEGER NOT NULL DEFAULT 0,
+        critical_count INTEGER NOT NULL DEFAULT 0,
+        sum_temp REAL NOT NULL DEFAULT 0,
+        temp_count INTEGER NOT NULL DEFAULT 0,
+        sum_pm25 REAL NOT NULL DEFAULT 0,
+        pm25_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (district, hour)
+    ) WITHOUT ROWID
+'''
+
+CREATE_ROLLUP_HOUR_INDEX = '''
+    CREATE INDEX IF NOT EXISTS idx_rollups_hour ON prediction_rollups_hourly(hour)
+'''
+
+UPSERT_ROLLUP = '''
+    INSERT INTO prediction_rollups_hourly (
+        district, hour, count, sum_score, min_score, max_score,
+        safe_count, moderate_count, high_count, critical_count,
+        sum_temp, temp_count, sum_pm25, pm25_count
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (district, hour) DO UPDATE SET
+        count = count + excluded.count,
+        sum_score = sum_score + excluded.sum_score,
+        min_score = MIN(min_score, excluded.min_score),
+        max_score = MAX(max_score, excluded.max_score),
+        safe_count = safe_count + excluded.safe_count,
+        moderate_count = moderate_count + excluded.moderate_count,
+        high_count = high_count + excluded.high_count,
+        critical_count = critical_count + excluded.critical_count,
+        sum_temp = sum_temp + excluded.sum_temp,
+        temp_count = temp_count + excluded.temp_count,
+        sum_pm25 = sum_pm25 + excluded.sum_pm25,
+        pm25_count = pm25_count + excluded.pm25_count
+'''
+
+def current_hour() -> str:
+    """UTC hour bucket, matching SQLite's CURRENT_TIMESTAMP used by the raw table."""
+    return time.strftime("%Y-%m-%d %H:00:00", time.gmtime())
+
+def district_for(lat, lon) -> str:
+    """Rollup key: the nearest Kerala district, or OTHER_DISTRICT."""
+    if lat is None or lon is None:
+        return OTHER_DISTRICT
+    district = nearest_district(lat, lon)
+    return district["name"] if district else OTHER_DISTRICT
+
+def _fold(buckets: Dict[tuple, list], key: tuple, score, level, temp, pm25,
+          hits: int = 1, min_score=None, max_score=None):
+    low = score if min_score is None else min_score
+    high = score if max_score is None else max_score
+    b = buckets.get(key)
+    if b is None:
+        b = buckets[key] = [0, 0.0, low, high, 0, 0, 0, 0, 0.0, 0, 0.0, 0]
+    b[0] += hits
+    b[1] += score * hits
+    b[2] = min(b[2], low)
+    b[3] = max(b[3], high)
+    if level in RISK_LEVELS:
+        b[4 + RISK_LEVELS.index(level)] += hits
+    if temp is not None:
+        b[8] += temp * hits
+        b[9] += hits
+    if pm25 is not None:
+        b[10] += pm25 * hits
+        b[11] += hits
+
+def aggregate_rows(rows: Iterable[Sequence[Any]], hour: str) -> List[tuple]:
+    """
+    Folds prediction rows (location, lat, lon, score, level, temp, pm25)
+    into one UPSERT_ROLLUP parameter tuple per district.
+    """
+    buckets: Dict[tuple, list] = {}
+    for _location, lat, lon, score, level, temp, pm25 in rows:
+        if score is None:
+            continue
+        _fold(buckets, (district_for(lat, lon), hour), score, level, temp, pm25)
+    return [(*key, *b) for key, b in buckets.items()]
+
+def apply_rollups(conn: sqlite3.Connection, rows: Sequence[Sequence[Any]], hour: Optional[str] = None):
+    """Merges a batch of new prediction rows into the hourly rollups (caller owns the transaction)."""
+    conn.executemany(UPSERT_ROLLUP, aggregate_rows(rows, hour or current_hour()))
+
+def apply_stored_rows(conn: sqlite3.Connection, rows: Iterable[Sequence[Any]]):
+    """
+    Merges already-stored rows (timestamp, lat, lon, score, level, temp, pm25,
+    hit_count, min_score, max_score) into the rollups, each in its own hour.
+    A coalesced row stands for hit_count readings. Only its last values
+    survive, so those readings are counted at that score, level, temp and
+    pm25 (min/max are exact).
+    """
+    buckets: Dict[tuple, list] = {}
+    for timestamp, lat, lon, score, level, temp, pm25, hits, min_score, max_score in rows:
+        if score is None or not timestamp:
+            continue
+        _fold(buckets, (district_for(lat, lon), f"{timestamp[:13]}:00:00"), score, level, temp, pm25,
+              int(hits or 1), min_score, max_score)
+    conn.executemany(UPSERT_ROLLUP, [(*key, *b) for key, b in buckets.items()])
+
+def rebuild_rollups(conn: sqlite3.Connection):
+    """Re-aggregates the rollups of every live prediction row (schema migration)."""
+    apply_stored_rows(conn, conn.execute(
+        "SELECT timestamp, lat, lon, risk_score, risk_level, temp, pm25, hit_count, min_score, max_score "
+        "FROM predictions"
+    ))
+
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+}
+
+def query_rollups(conn: sqlite3.Connection, start: Optional[str] = None, end: Optional[str] = None,
+                  district: Optional[str] = None, bucket: str = "hour",
+                  by_district: bool = False) -> List[Dict[str, Any]]:
+    """
+    Trend series over [start, end) read only from the rollup table.
+    Buckets are hour/day/month; series are split per district if requested.
+    """
+    clauses, params = [], []
+    if start:
+        clauses.append("hour >= ?")
+        params.append(start)
+    if end:
+        clauses.append("hour < ?")
+        params.append(end)
+    if district:
+        clauses.append("district = ?")
+        params.append(district)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    group = "district, bucket" if by_district else "bucket"
+    select_district = "district," if by_district else ""
+
+    cursor = conn.execute(f'''
+        SELECT {select_district}
+               strftime('{BUCKET_FORMATS[bucket]}', hour) AS bucket,
+               SUM(count), SUM(sum_score), MIN(min_score), MAX(max_score),
+               SUM(safe_count), SUM(moderate_count), SUM(high_count), SUM(critical_count),
+               SUM(sum_temp), SUM(temp_count), SUM(sum_pm25), SUM(pm25_count)
+        FROM prediction_rollups_hourly
+        {where}
+        GROUP BY {group}
+        ORDER BY {group}
+    ''', params)
+
+    series = []
+    for row in cursor:
+        if by_district:
+            district_name, row = row[0], row[1:]
+        bucket_key, count, sum_score, min_score, max_score, safe, moderate, high, critical, \
+            sum_temp, temp_count, sum_pm25, pm25_count = row
+        entry = {
+            "bucket": bucket_key,
+            "count": count,
+            "mean_score": round(sum_score / count, 2) if count else None,
+            "min_score": min_score,
+            "max_score": max_score,
+            "levels": {"Safe": safe, "Moderate": moderate, "High": high, "Critical": critical},
+            "mean_temp": round(sum_temp / temp_count, 2) if temp_count else None,
+            "mean_pm25": round(sum_pm25 / pm25_count, 2) if pm25_count else None
+        }
+        if by_district:
+            entry = {"district": district_name, **entry}
+        series.append(entry)
+    return series
@@ -1,4 +1,4 @@
-from textblob import TextBlob
+import asyncio
 import random
 from typing import List, Dict
 
@@ -29,24 +29,13 @@ class SocialAnalysisService:
         
         # Randomly select a few messages to simulate a real-time feed
         selected_messages = random.sample(mock_messages, k=5)
-        
-        total_sentiment = 0
-        stress_indicators = 0
-        
-        processed_data = []
-        for msg in selected_messages:
-            analysis = TextBlob(msg)
-            polarity = analysis.sentiment.polarity
-            processed_data.append({
-                "text": msg,
-                "sentiment": polarity
-            })
-            total_sentiment += polarity
-            
-            # Negative sentiment increases stress indicator
-            if polarity < 0:
-                stress_indicators += 1
-                
+
+        # Sentiment analysis (and textblob's ~1.5s first import) stays off the event loop
+        polarities = await asyncio.to_thread(self._polarities, selected_messages)
+        total_sentiment = sum(polarities)
+        # Negative sentiment increases stress indicator
+        stress_indicators = sum(1 for polarity in polarities if polarity < 0)
+
         # Calculate Stress Score (1-10)
         # Low polarity and high stress indicators lead to higher stress score
         avg_sentiment = total_sentiment / len(selected_messages)
@@ -68,4 +57,14 @@ class SocialAnalysisService:
             "stress_count": stress_indicators
         }
 
+    @staticmethod
+    def _polarities(messages: List[str]) -> List[float]:
+        # Imported on first use: textblob pulls in nltk/scipy (~1.5s cold start)
+        from textblob import TextBlob
+        return [TextBlob(msg).sentiment.polarity for msg in messages]
+
+    def warm_up(self):
+        """Imports textblob ahead of the first request (call from a worker thread)."""
+        self._polarities(["warm up"])
+
 social_service = SocialAnalysisService()
@@ -0,0 +1,83 @@
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marker for stages that must succeed (no fallback)
+REQUIRED = object()
+
+class Stage:
+    """
+    One node of the analysis graph.
+    `func` receives a dict of its dependencies' results and returns an awaitable.
+    `fallback` is a value (or a callable taking the exception) used when the
+    stage fails or exceeds `timeout`; REQUIRED stages re-raise instead.
+    `ready` (optional, must not raise) is awaited before the timeout starts,
+    so one-time warm-up costs are not charged to the stage's budget.
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Awaitable[Any]],
+                 deps: Iterable[str] = (), timeout: Optional[float] = None,
+                 fallback: Any = REQUIRED, ready: Optional[Callable[[], Awaitable[None]]] = None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.fallback = fallback
+        self.ready = ready
+
+class StageExecutor:
+    """
+    Runs a list of stages as a dependency graph: every stage starts as soon
+    as its own dependencies are done, so independent stages overlap.
+    Stages must be listed after the stages they depend on.
+    """
+
+    async def run(self, stages: List[Stage]):
+        """Returns (results, timings) keyed by stage name."""
+        origin = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+
+        async def _run_stage(stage: Stage):
+            dep_values = await asyncio.gather(*(tasks[d] for d in stage.deps))
+            inputs = dict(zip(stage.deps, dep_values))
+            if stage.ready is not None:
+                await stage.ready()
+
+            started = time.perf_counter()
+            status = "ok"
+            try:
+                result = await asyncio.wait_for(stage.func(inputs), timeout=stage.timeout)
+            except Exception as e:
+                status = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+                if stage.fallback is REQUIRED:
+                    raise
+                logger.warning(f"Stage '{stage.name}' {status}: {e!r}. Using fallback.")
+                result = stage.fallback(e) if callable(stage.fallback) else stage.fallback
+            finally:
+                finished = time.perf_counter()
+                timings[stage.name] = {
+                    "status": status,
+                    "start_ms": round((started - origin) * 1000, 2),
+                    "duration_ms": round((finished - started) * 1000, 2)
+                }
+            return result
+
+        for stage in stages:
+            missing = [d for d in stage.deps if d not in tasks]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown/later stages: {missing}")
+            tasks[stage.name] = asyncio.create_task(_run_stage(stage))
+
+        try:
+            values = await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        timings["total"] = {"duration_ms": round((time.perf_counter() - origin) * 1000, 2)}
+        return dict(zip(tasks.keys(), values)), timings
@@ -0,0 +1,195 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+import logging
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+from backend.services.conditional_response import brotli, choose_encoding, encoding_etag, etag_matches
+
+logger = logging.getLogger(__name__)
+
+# Referenced from index.html and served under content-hashed names
+FINGERPRINT_EXTENSIONS = (".js", ".css")
+COMPRESSIBLE_EXTENSIONS = (".js", ".css", ".html", ".json", ".jsx", ".svg", ".txt")
+# Larger or binary files are left to the plain StaticFiles fallback
+MAX_INLINE_BYTES = int(os.getenv("STATIC_MAX_INLINE_BYTES", 2 * 1024 * 1024))
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+_REFERENCE = re.compile(r'(\b(?:src|href)=")([^"/:?#]+)(")')
+
+class _Asset:
+    __slots__ = ("name", "mtime", "size", "digest", "content_type", "variants")
+
+    def __init__(self, name: str, mtime: float, body: bytes, content_type: str, compress: bool):
+        self.name = name
+        self.mtime = mtime
+        self.size = len(body)
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.content_type = content_type
+        self.variants: Dict[str, bytes] = {"identity": body}
+        if compress:
+            # Done once per file version, so use the strongest settings
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    @property
+    def hashed_name(self) -> str:
+        stem, ext = os.path.splitext(self.name)
+        return f"{stem}.{self.digest[:10]}{ext}"
+
+class StaticAssetServer:
+    """
+    Serves the frontend directory with:
+
+    - .js/.css under content-hashed names (app.3f9c2d1e0b.js) with immutable
+      year-long caching; index.html is rewritten to reference those names
+    - gzip (and br, when the brotli package is installed) variants
+      precompressed once per file version, chosen per Accept-Encoding
+    - ETag/304 revalidation for everything else (index.html, JSON seeds)
+
+    Files are re-read only when their mtime changes, so the offline seed the
+    scheduler rewrites is picked up without a restart. Anything not handled
+    here falls through to StaticFiles.
+    """
+
+    def __init__(self, directory: str, index: str = "index.html"):
+        self.directory = directory
+        self.index = index
+        self.fallback = StaticFiles(directory=directory, html=True)
+        self._assets: Dict[str, _Asset] = {}
+        self._hashed: Dict[str, str] = {}  # hashed name -> file name
+        self._index_source: Optional[Tuple[float, Tuple[str, ...]]] = None
+        self._index_asset: Optional[_Asset] = None
+
+    def build(self) -> Dict[str, str]:
+        """Loads and precompresses every servable file. Returns {name: hashed name}."""
+        started = time.perf_counter()
+        manifest = {}
+        for name in sorted(os.listdir(self.directory)):
+            asset = self._asset(name)
+            if asset is not None and name.endswith(FINGERPRINT_EXTENSIONS):
+                manifest[name] = asset.hashed_name
+        self._render_index()
+        logger.info(f"Static assets ready: {len(self._assets)} file(s) in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        return manifest
+
+    def _asset(self, name: str) -> Optional[_Asset]:
+        """Current version of a top-level file, or None if it is not served from memory."""
+        path = os.path.join(self.directory, name)
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        cached = self._assets.get(name)
+        if cached is not None and cached.mtime == stat.st_mtime and cached.size == stat.st_size:
+            return cached
+        if not os.path.isfile(path) or stat.st_size > MAX_INLINE_BYTES or name == self.index:
+            return None
+        with open(path, "rb") as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+        asset = _Asset(name, stat.st_mtime, body, content_type, name.endswith(COMPRESSIBLE_EXTENSIONS))
+        if cached is not None:
+            self._hashed.pop(cached.hashed_name, None)
+        self._assets[name] = asset
+        if name.endswith(FINGERPRINT_EXTENSIONS):
+            self._hashed[asset.hashed_name] = name
+        return asset
+
+    def _render_index(self) -> Optional[_Asset]:
+        """index.html with local .js/.css references pointed at their hashed names."""
+        path = os.path.join(self.directory, self.index)
+        try:
+            index_mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        referenced = [self._asset(name) for name in sorted(os.listdir(self.directory))
+                      if name.endswith(FINGERPRINT_EXTENSIONS)]
+        source = (index_mtime, tuple(a.digest for a in referenced if a is not None))
+        if self._index_asset is not None and self._index_source == source:
+            return self._index_asset
+
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+
+        def rewrite(match):
+            asset = self._assets.get(match.group(2))
+            if asset is None or not match.group(2).endswith(FINGERPRINT_EXTENSIONS):
+                return match.group(0)
+            return f"{match.group(1)}{asset.hashed_name}{match.group(3)}"
+
+        self._index_asset = _Asset(self.index, index_mtime, _REFERENCE.sub(rewrite, html).encode(),
+                                   "text/html; charset=utf-8", compress=True)
+        self._index_source = source
+        return self._index_asset
+
+    def _resolve(self, path: str) -> Tuple[Optional[_Asset], str]:
+        name = path.lstrip("/") or self.index
+        if "/" in name or name.startswith("."):
+            return None, ""
+        if name == self.index:
+            return self._render_index(), REVALIDATE_CACHE
+        original = self._hashed.get(name)
+        if original is not None:
+            asset = self._asset(original)
+            if asset is not None and asset.hashed_name == name:
+                return asset, IMMUTABLE_CACHE
+            # A hash from an older deploy: serve the current file, but don't pin it
+            return asset, REVALIDATE_CACHE
+        return self._asset(name), REVALIDATE_CACHE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.fallback(scope, receive, send)
+            return
+        asset, cache_control = self._resolve(scope["path"])
+        if asset is None:
+            await self.fallback(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        etag = f'"{asset.digest}"'
+        encoding = None
+        if len(asset.variants) > 1:
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+            if encoding not in asset.variants:
+                encoding = None
+        headers = [
+            (b"cache-control", cache_control.encode()),
+            (b"etag", (encoding_etag(etag, encoding) if encoding else etag).encode()),
+        ]
+        if len(asset.variants) > 1:
+            headers.append((b"vary", b"Accept-Encoding"))
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = asset.variants[encoding or "identity"]
+        headers += [
+            (b"content-type", asset.content_type.encode()),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body if scope["method"] == "GET" else b""})
+
+if __name__ == "__main__":
+    # python -m backend.services.static_assets [frontend_dir]
+    # Prints the fingerprint manifest and transfer sizes per encoding.
+    import sys
+    server = StaticAssetServer(sys.argv[1] if len(sys.argv) > 1 else "frontend")
+    manifest = server.build()
+    for name, asset in sorted(server._assets.items()):
+        sizes = ", ".join(f"{enc} {len(body)}" for enc, body in asset.variants.items())
+        print(f"{name:<32} -> {manifest.get(name, name):<40} {sizes}")
@@ -2,6 +2,7 @@ import httpx
 import os
 from typing import Dict, Any
 import logging
+from backend.services.http_client import http_pool
 
 logger = logging.getLogger(__name__)
 
@@ -23,27 +24,30 @@ async def fetch_weather_data(lat: float, lon: float) -> Dict[str, Any]:
         }
 
     url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={API_KEY}&units=metric"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            # In free tier, we might need separate call for UVI or use OneCall if available
-            # For now, we'll try to get what we can from current weather
-            response.raise_for_status()
-            data = response.json()
-            
-            # If UVI is missing (standard on free tier current weather), we add a mock/default
-            if "uvi" not in data:
-                data["uvi"] = 5.0 
-            
-            return data
-        except httpx.HTTPError as e:
-            logger.error(f"Error fetching weather data: {e}")
-            return {
-                "coord": {"lon": lon, "lat": lat},
-                "weather": [{"main": "Unknown", "description": "data unavailable"}],
-                "main": {"temp": 0, "feels_like": 0, "humidity": 0},
-                "wind": {"speed": 0},
-                "rain": {"1h": 0},
-                "uvi": 0,
-                "error": str(e)
-            }
+    try:
+        response = await http_pool.get(url)
+        # In free tier, we might need separate call for UVI or use OneCall if available
+        # For now, we'll try to get what we can from current weather
+        response.raise_for_status()
+        data = response.json()
+        
+        # If UVI is missing (standard on free tier current weather), we add a mock/default
+        if "uvi" not in data:
+            data["uvi"] = 5.0 
+        
+        return data
+    except httpx.HTTPError as e:
+        logger.error(f"Error fetching weather data: {e}")
+        return get_unavailable_weather(lat, lon, e)
+
+def get_unavailable_weather(lat: float, lon: float, error: Exception) -> Dict[str, Any]:
+    """Placeholder payload used when weather data could not be fetched."""
+    return {
+        "coord": {"lon": lon, "lat": lat},
+        "weather": [{"main": "Unknown", "description": "data unavailable"}],
+        "main": {"temp": 0, "feels_like": 0, "humidity": 0},
+        "wind": {"speed": 0},
+        "rain": {"1h": 0},
+        "uvi": 0,
+        "error": str(error)
+    }
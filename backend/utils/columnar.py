@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import logging
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FILE = "_schema.json"
+
+class ColumnarWriter:
+    """
+    Append-only columnar dataset: one raw little-endian array file per column
+    plus a JSON schema. String columns are dictionary-encoded (int32 codes +
+    categories in the schema). Every column file is a plain typed array, so
+    readers can np.memmap it without parsing.
+
+        <path>/_schema.json
+        <path>/<column>.bin
+
+    Appends open and close the column files, so any number of writers can be
+    alive at once without holding file descriptors.
+    """
+
+    def __init__(self, path: str, dtypes: Dict[str, str], overwrite: bool = True):
+        self.path = path
+        self.dtypes = dict(dtypes)
+        self.rows = 0
+        self.categories: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        if overwrite and os.path.isdir(path):
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+        for name, dtype in self.dtypes.items():
+            if dtype == "category":
+                self.categories[name] = []
+                self._codes[name] = {}
+            open(self._column_path(name), "wb").close()
+
+    @classmethod
+    def reopen(cls, path: str) -> "ColumnarWriter":
+        """Continues appending to an existing dataset."""
+        schema = read_schema(path)
+        writer = cls.__new__(cls)
+        writer.path = path
+        writer.dtypes = dict(schema["columns"])
+        writer.rows = schema["rows"]
+        writer.categories = {name: list(values) for name, values in schema.get("categories", {}).items()}
+        writer._codes = {name: {v: i for i, v in enumerate(values)} for name, values in writer.categories.items()}
+        # Drop bytes from an append that never reached close()
+        for name, dtype in writer.dtypes.items():
+            itemsize = 4 if dtype == "category" else np.dtype(dtype).itemsize
+            with open(writer._column_path(name), "r+b") as f:
+                f.truncate(writer.rows * itemsize)
+        return writer
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _encode(self, name: str, values) -> np.ndarray:
+        codes = self._codes[name]
+        uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, value in enumerate(uniques):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.categories[name])
+                self.categories[name].append(value)
+            mapping[i] = code
+        return mapping[inverse]
+
+    def append(self, columns: Dict[str, Iterable]):
+        """Appends equally long columns (every schema column must be present)."""
+        length = None
+        for name, dtype in self.dtypes.items():
+            values = columns[name]
+            if dtype == "category":
+                array = self._encode(name, values)
+            else:
+                array = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder("<"))
+            if length is None:
+                length = len(array)
+            elif len(array) != length:
+                raise ValueError(f"Column {name} has {len(array)} rows, expected {length}")
+            with open(self._column_path(name), "ab") as f:
+                f.write(array.tobytes())
+        self.rows += length or 0
+
+    def close(self, metadata: Optional[Dict] = None):
+        """Writes the schema (atomically); the dataset is readable from here on."""
+        schema = {
+            "rows": self.rows,
+            "columns": self.dtypes,
+            "categories": self.categories,
+            "metadata": metadata or {}
+        }
+        tmp_path = os.path.join(self.path, f"{SCHEMA_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(schema, f, indent=2, default=str)
+        os.replace(tmp_path, os.path.join(self.path, SCHEMA_FILE))
+
+def read_schema(path: str) -> Dict:
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        return json.load(f)
+
+def read_columns(path: str, columns: Optional[List[str]] = None, decode: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Memory-maps the requested columns (all by default). Category columns are
+    decoded to string arrays unless decode=False, which returns the int32 codes.
+    """
+    schema = read_schema(path)
+    result = {}
+    for name in columns or list(schema["columns"]):
+        dtype = schema["columns"][name]
+        storage = np.int32 if dtype == "category" else np.dtype(dtype).newbyteorder("<")
+        if schema["rows"] == 0:
+            array = np.empty(0, dtype=storage)
+        else:
+            array = np.memmap(os.path.join(path, f"{name}.bin"), dtype=storage, mode="r", shape=(schema["rows"],))
+        if dtype == "category" and decode:
+            array = np.asarray(schema["categories"][name], dtype=str)[array]
+        result[name] = array
+    return result
+
+def read_dataframe(path: str, columns: Optional[List[str]] = None):
+    """Columnar dataset as a pandas DataFrame (category columns stay categorical)."""
+    import pandas as pd
+    schema = read_schema(path)
+    data = {}
+    for name, array in read_columns(path, columns, decode=False).items():
+        if schema["columns"][name] == "category":
+            data[name] = pd.Categorical.from_codes(np.asarray(array), categories=schema["categories"][name])
+        else:
+            data[name] = np.asarray(array)
+    return pd.DataFrame(data)
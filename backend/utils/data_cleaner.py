@@ -1,22 +1,222 @@
 import pandas as pd
 import numpy as np
+import json
 import os
+import shutil
+import tempfile
+import time
 import logging
+from backend.utils.columnar import ColumnarWriter, read_columns, read_schema
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CLEANED_COLUMNAR = "backend/data/cleaned_kerala_data"
+# Carry-over for incremental runs: input offset, medians, norm bounds, per-district tails
+CLEANER_STATE = "backend/data/cleaner_state.json"
+# Rows kept per district for incremental runs: the 7-day window needs the previous 6
+TAIL_ROWS = 7
+# Rows per CSV chunk in streaming mode (bounds memory together with the largest district)
+STREAM_CHUNK_ROWS = int(os.getenv("CLEANER_CHUNK_ROWS", 100000))
+
+# Longest gap (days) that fill_gaps may synthesize rows for; longer gaps are only reported
+MAX_FILL_DAYS = int(os.getenv("CLEANER_MAX_FILL_DAYS", 3))
+# Filled days never inherit an event
+FILL_RESET = {'event_label': 'None'}
+
+# Valid ranges for Kerala's climate; values outside are replaced with the median
+OUTLIER_BOUNDS = {
+    'temperature_c': (10, 50),   # coldest hills to extreme heat
+    'humidity_p': (0, 100),
+    'rainfall_mm': (0, 1000),    # extreme but possible
+}
+NORM_COLUMNS = [
+    'rainfall_mm', 'temperature_c', 'humidity_p',
+    'rain_1d_lag', 'rain_3d_total', 'rain_7d_total',
+    'temp_trend', 'humid_trend'
+]
+RAW_DTYPES = {
+    'date': 'datetime64[D]', 'rainfall_mm': 'float64', 'temperature_c': 'float64',
+    'humidity_p': 'float64', 'event_label': 'category'
+}
+# Column order matches cleaned_kerala_data.csv
+OUTPUT_DTYPES = {
+    'date': 'datetime64[D]', 'district': 'category',
+    'rainfall_mm': 'float64', 'temperature_c': 'float64', 'humidity_p': 'float64',
+    'event_label': 'category',
+    'rain_1d_lag': 'float64', 'rain_3d_total': 'float64', 'rain_7d_total': 'float64',
+    'temp_trend': 'float64', 'humid_trend': 'float64',
+    **{f'{col}_norm': 'float64' for col in NORM_COLUMNS}
+}
+
+def group_positions(group_ids: np.ndarray) -> np.ndarray:
+    """Index of each row within its run of equal group ids (rows sorted by group)."""
+    n = len(group_ids)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = group_ids[1:] != group_ids[:-1]
+    index = np.arange(n)
+    return index - np.maximum.accumulate(np.where(starts, index, 0))
+
+def compute_features(group_ids: np.ndarray, rain: np.ndarray, temp: np.ndarray, humid: np.ndarray):
+    """
+    Lag, rolling-sum (min_periods=1) and trend features for rows sorted by
+    group then date, as whole-array operations: no per-group Python calls.
+    """
+    pos = group_positions(group_ids)
+
+    def lagged(values, k):
+        out = np.zeros_like(values)
+        out[k:] = values[:-k]
+        out[pos < k] = 0.0  # never reach into the previous group
+        return out
+
+    rain_3d = rain + lagged(rain, 1) + lagged(rain, 2)
+    rain_7d = rain_3d + lagged(rain, 3) + lagged(rain, 4) + lagged(rain, 5) + lagged(rain, 6)
+    temp_trend = temp - lagged(temp, 1)
+    humid_trend = humid - lagged(humid, 1)
+    temp_trend[pos < 1] = 0.0
+    humid_trend[pos < 1] = 0.0
+    return {
+        'rain_1d_lag': lagged(rain, 1),
+        'rain_3d_total': rain_3d,
+        'rain_7d_total': rain_7d,
+        'temp_trend': temp_trend,
+        'humid_trend': humid_trend,
+    }
+
+def find_gaps(group_ids: np.ndarray, days: np.ndarray):
+    """
+    One pass over rows sorted by group then day (days as integers). Returns
+    the index of every row that follows a gap and how many days are missing
+    before it. Duplicate days are not gaps.
+    """
+    same_group = group_ids[1:] == group_ids[:-1]
+    rows = np.flatnonzero(same_group & (np.diff(days) > 1)) + 1
+    return rows, days[rows] - days[rows - 1] - 1
+
+def continuity_report(districts: np.ndarray, dates: np.ndarray) -> dict:
+    """
+    Exact missing date ranges per district, for rows sorted by district then
+    date: {district: {first_date, last_date, missing_days, gaps: [{start, end, days}]}}.
+    """
+    days = dates.astype('datetime64[D]')
+    group_ids = pd.factorize(districts)[0]
+    gap_rows, missing = find_gaps(group_ids, days.astype(np.int64))
+    starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]])
+    ends = np.r_[starts[1:], len(days)] - 1
+
+    report = {
+        str(districts[start]): {
+            "first_date": str(days[start]), "last_date": str(days[end]),
+            "missing_days": 0, "gaps": []
+        }
+        for start, end in zip(starts, ends)
+    }
+    one_day = np.timedelta64(1, 'D')
+    for row, count in zip(gap_rows.tolist(), missing.tolist()):
+        entry = report[str(districts[row])]
+        entry["missing_days"] += count
+        entry["gaps"].append({
+            "start": str(days[row - 1] + one_day), "end": str(days[row] - one_day), "days": count
+        })
+    return report
+
+def fill_short_gaps(group_ids: np.ndarray, days: np.ndarray, columns: dict, max_days: int,
+                    method: str = "ffill", reset: dict = None):
+    """
+    Inserts a row for every missing day in gaps of at most `max_days` (rows
+    sorted by group then day, days as integers). Float columns are
+    forward-filled or linearly interpolated; other columns are carried
+    forward, except those in `reset`, which get a fixed value (e.g. no event).
+    Returns (group_ids, days, columns, rows_added).
+    """
+    if method not in ("ffill", "interpolate"):
+        raise ValueError(f"Unknown fill method: {method}")
+    gap_rows, missing = find_gaps(group_ids, days)
+    keep = missing <= max_days
+    gap_rows, missing = gap_rows[keep], missing[keep]
+    added = int(missing.sum())
+    if added == 0:
+        return group_ids, days, columns, 0
+
+    # Original rows shift down by the number of days inserted before them
+    inserted_before = np.zeros(len(days), dtype=np.int64)
+    inserted_before[gap_rows] = missing
+    new_positions = np.arange(len(days)) + np.cumsum(inserted_before)
+    # For each new row: the gap's closing row and the 1-based step into the gap
+    closing = np.repeat(gap_rows, missing)
+    step = group_positions(closing) + 1
+    fill_positions = new_positions[closing] - np.repeat(missing, missing) + step - 1
+    fraction = step / np.repeat(missing + 1, missing)
+
+    def expand(values, filled):
+        out = np.empty(len(values) + added, dtype=np.result_type(values, filled))
+        out[new_positions] = values
+        out[fill_positions] = filled
+        return out
+
+    reset = reset or {}
+    result = {}
+    for name, values in columns.items():
+        before = values[closing - 1]
+        if name in reset:
+            filled = np.full(added, reset[name], dtype=np.asarray([reset[name]]).dtype)
+        elif method == "interpolate" and np.issubdtype(values.dtype, np.floating):
+            filled = before + (values[closing] - before) * fraction
+        else:
+            filled = before
+        result[name] = expand(values, filled)
+    return expand(group_ids, group_ids[closing]), expand(days, days[closing - 1] + step), result, added
+
+class StreamingMedian:
+    """Exact median over chunks, keeping one count per distinct value (sensor readings repeat heavily)."""
+
+    def __init__(self, counts: dict = None):
+        self.counts = dict(counts or {})
+
+    def add(self, values: np.ndarray):
+        uniques, counts = np.unique(values, return_counts=True)
+        for value, count in zip(uniques.tolist(), counts.tolist()):
+            self.counts[value] = self.counts.get(value, 0) + count
+        return self
+
+    def to_json(self) -> list:
+        return [[value, count] for value, count in self.counts.items()]
+
+    @classmethod
+    def from_json(cls, pairs: list) -> "StreamingMedian":
+        return cls({float(value): int(count) for value, count in pairs})
+
+    def median(self) -> float:
+        values = np.array(sorted(self.counts))
+        cumulative = np.cumsum([self.counts[v] for v in values])
+        total = cumulative[-1]
+        # Same convention as pandas: mean of the two middle values for even counts
+        lower = values[np.searchsorted(cumulative, (total - 1) // 2 + 1)]
+        upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+        return float((lower + upper) / 2)
+
 class DataCleaner:
     def __init__(self, input_path="backend/data/kerala_weather_history.csv", 
-                 output_path="backend/data/cleaned_kerala_data.csv"):
+                 output_path="backend/data/cleaned_kerala_data.csv",
+                 fill_method=None, max_fill_days=MAX_FILL_DAYS, state_path=CLEANER_STATE):
+        """fill_method: None (report gaps only), "ffill" or "interpolate" for gaps up to max_fill_days."""
         self.input_path = input_path
         self.output_path = output_path
+        self.fill_method = fill_method
+        self.max_fill_days = max_fill_days
+        self.state_path = state_path
         self.df = None
+        self.continuity = None
+        self.median_trackers = None
+        self._input_size = 0
 
     def load_data(self):
         if not os.path.exists(self.input_path):
             logger.error(f"Input file {self.input_path} not found.")
             return False
+        # Incremental runs resume reading from here
+        self._input_size = os.path.getsize(self.input_path)
         # Prevent 'None' event labels from being treated as NaN
         self.df = pd.read_csv(self.input_path, na_values=['', 'NA', 'NAN'], keep_default_na=False)
         logger.info(f"Loaded {len(self.df)} records.")
@@ -34,19 +234,12 @@ class DataCleaner:
         """
         Replace extreme or invalid values based on Kerala's climate context.
         """
-        # Temperature: 10C (coldest hills) to 50C (extreme heat)
-        temp_mask = (self.df['temperature_c'] < 10) | (self.df['temperature_c'] > 50)
-        
-        # Humidity: 0% to 100%
-        humid_mask = (self.df['humidity_p'] < 0) | (self.df['humidity_p'] > 100)
-        
-        # Rainfall: 0 to 1000mm (Extreme but possible)
-        rain_mask = (self.df['rainfall_mm'] < 0) | (self.df['rainfall_mm'] > 1000)
-
         # Replacing outliers with median (more robust than mean)
-        self.df.loc[temp_mask, 'temperature_c'] = self.df['temperature_c'].median()
-        self.df.loc[humid_mask, 'humidity_p'] = self.df['humidity_p'].median()
-        self.df.loc[rain_mask, 'rainfall_mm'] = self.df['rainfall_mm'].median()
+        self.median_trackers = {}
+        for col, (low, high) in OUTLIER_BOUNDS.items():
+            tracker = self.median_trackers[col] = StreamingMedian().add(self.df[col].to_numpy(dtype=np.float64))
+            mask = (self.df[col] < low) | (self.df[col] > high)
+            self.df.loc[mask, col] = tracker.median()
         
         logger.info("Outliers handled and replaced with medians.")
 
@@ -60,14 +253,15 @@ class DataCleaner:
         self.df['date'] = pd.to_datetime(self.df['date'])
         self.df.sort_values(['district', 'date'], inplace=True)
         
-        # Rainfall Accumulation
-        self.df['rain_1d_lag'] = self.df.groupby('district')['rainfall_mm'].shift(1).fillna(0)
-        self.df['rain_3d_total'] = self.df.groupby('district')['rainfall_mm'].transform(lambda x: x.rolling(window=3, min_periods=1).sum())
-        self.df['rain_7d_total'] = self.df.groupby('district')['rainfall_mm'].transform(lambda x: x.rolling(window=7, min_periods=1).sum())
-        
-        # Trends (Current - Previous)
-        self.df['temp_trend'] = self.df.groupby('district')['temperature_c'].diff().fillna(0)
-        self.df['humid_trend'] = self.df.groupby('district')['humidity_p'].diff().fillna(0)
+        # Rainfall accumulation and trends (current - previous), vectorized across districts
+        features = compute_features(
+            pd.factorize(self.df['district'])[0],
+            self.df['rainfall_mm'].to_numpy(dtype=np.float64),
+            self.df['temperature_c'].to_numpy(dtype=np.float64),
+            self.df['humidity_p'].to_numpy(dtype=np.float64)
+        )
+        for col, values in features.items():
+            self.df[col] = values
         
         logger.info("Advanced predictive features engineered.")
 
@@ -75,12 +269,7 @@ class DataCleaner:
         """
         Normalize all numerical features to 0-1 range.
         """
-        cols_to_norm = [
-            'rainfall_mm', 'temperature_c', 'humidity_p',
-            'rain_1d_lag', 'rain_3d_total', 'rain_7d_total',
-            'temp_trend', 'humid_trend'
-        ]
-        for col in cols_to_norm:
+        for col in NORM_COLUMNS:
             if col in self.df.columns:
                 min_val = self.df[col].min()
                 max_val = self.df[col].max()
@@ -90,31 +279,42 @@ class DataCleaner:
                     self.df[f'{col}_norm'] = 0
         logger.info("Numerical features normalized (0-1 range).")
 
+    def fill_gaps(self):
+        """
+        Fills missing days in short gaps (<= max_fill_days) per district before
+        features are computed, so rolling windows span real calendar days.
+        """
+        self.df['date'] = pd.to_datetime(self.df['date'])
+        self.df.sort_values(['district', 'date'], inplace=True)
+        group_ids, days, columns, added = fill_short_gaps(
+            pd.factorize(self.df['district'])[0],
+            self.df['date'].to_numpy().astype('datetime64[D]').astype(np.int64),
+            {col: self.df[col].to_numpy() for col in self.df.columns if col != 'date'},
+            self.max_fill_days, self.fill_method, FILL_RESET
+        )
+        if added:
+            self.df = pd.DataFrame({'date': days.astype('datetime64[D]'), **columns})[list(self.df.columns)]
+            self.df['date'] = pd.to_datetime(self.df['date'])
+            logger.info(f"Filled {added} missing day(s) in gaps of up to {self.max_fill_days} day(s) ({self.fill_method}).")
+        return added
+
     def validate_continuity(self):
         """
-        Ensure each district has a continuous time-series (no missing dates).
+        Checks each district for missing dates in one vectorized pass.
+        Returns (and keeps in self.continuity) the exact missing ranges per district.
         """
         self.df['date'] = pd.to_datetime(self.df['date'])
-        districts = self.df['district'].unique()
-        issues = []
-
-        for district in districts:
-            district_data = self.df[self.df['district'] == district].sort_values('date')
-            min_date = district_data['date'].min()
-            max_date = district_data['date'].max()
-            
-            expected_range = pd.date_range(start=min_date, end=max_date)
-            actual_dates = district_data['date']
-            
-            missing_dates = expected_range.difference(actual_dates)
-            if not missing_dates.empty:
-                issues.append(f"{district}: {len(missing_dates)} missing dates.")
-        
+        self.df.sort_values(['district', 'date'], inplace=True)
+        self.continuity = continuity_report(
+            self.df['district'].to_numpy(), self.df['date'].to_numpy()
+        )
+        issues = {d: r for d, r in self.continuity.items() if r["missing_days"]}
         if issues:
-            for issue in issues:
-                logger.warning(issue)
+            for district, entry in issues.items():
+                logger.warning(f"{district}: {entry['missing_days']} missing dates in {len(entry['gaps'])} gap(s).")
         else:
             logger.info("Time-series continuity validated for all districts.")
+        return self.continuity
 
     def save_cleaned_data(self):
         self.df.to_csv(self.output_path, index=False)
@@ -124,13 +324,343 @@ class DataCleaner:
         if self.load_data():
             self.remove_missing()
             self.handle_outliers()
+            if self.fill_method:
+                self.fill_gaps()
             self.engineer_features()
             self.normalize_features()
             self.validate_continuity()
             self.save_cleaned_data()
+            tails = self.df.groupby('district', sort=True).tail(TAIL_ROWS)
+            self._save_state(
+                {"csv": self.output_path},
+                self.median_trackers,
+                {col: [float(self.df[col].min()), float(self.df[col].max())] for col in NORM_COLUMNS},
+                {district: {col: rows[col].to_numpy() for col in RAW_DTYPES}
+                 for district, rows in tails.groupby('district', sort=True)}
+            )
             return True
         return False
 
+    def run_streaming(self, output_path=CLEANED_COLUMNAR, chunk_rows=STREAM_CHUNK_ROWS):
+        """
+        Same cleaning as run_pipeline, with memory bounded by one CSV chunk or
+        one district's history (whichever is larger) instead of the whole file:
+
+        1. stream the CSV in chunks: drop incomplete rows, partition rows by
+           district into temporary columnar files, accumulate exact medians
+        2. per district: sort by date, replace outliers, compute features,
+           accumulate global min/max for normalization
+        3. per district: normalize and append to the columnar output
+
+        The output is a columnar dataset (backend/utils/columnar.py) with the
+        same columns and row order as cleaned_kerala_data.csv.
+        """
+        if not os.path.exists(self.input_path):
+            logger.error(f"Input file {self.input_path} not found.")
+            return None
+        started = time.perf_counter()
+        self._input_size = os.path.getsize(self.input_path)
+        workdir = tempfile.mkdtemp(prefix=".cleaner-", dir=os.path.dirname(os.path.abspath(output_path)))
+        try:
+            partitions, trackers, loaded, dropped = self._partition_by_district(workdir, chunk_rows)
+            medians = {col: tracker.median() for col, tracker in trackers.items() if tracker.counts}
+            staged, ranges, bounds, tails = self._stage_features(workdir, partitions, medians)
+            self._write_normalized(staged, ranges, bounds, output_path, metadata={
+                "source": self.input_path,
+                "medians": medians,
+                "norm_bounds": bounds,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+            })
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        self._save_state({"columnar": output_path}, trackers, bounds, tails)
+
+        report = {
+            "rows_loaded": loaded,
+            "rows_dropped": dropped,
+            "rows_written": sum(end - start for start, end in ranges.values()),
+            "districts": len(ranges),
+            "missing_days": sum(entry["missing_days"] for entry in self.continuity.values()),
+            "output": output_path,
+            "seconds": round(time.perf_counter() - started, 2)
+        }
+        logger.info(f"Streaming clean finished: {report}")
+        return report
+
+    def _partition_by_district(self, workdir, chunk_rows):
+        partitions = {}
+        median_trackers = {col: StreamingMedian() for col in OUTLIER_BOUNDS}
+        loaded = dropped = 0
+        chunks = pd.read_csv(self.input_path, na_values=['', 'NA', 'NAN'], keep_default_na=False,
+                             chunksize=chunk_rows)
+        for chunk in chunks:
+            loaded += len(chunk)
+            complete = chunk.dropna()
+            dropped += len(chunk) - len(complete)
+            for col, tracker in median_trackers.items():
+                tracker.add(complete[col].to_numpy(dtype=np.float64))
+            dates = pd.to_datetime(complete['date']).to_numpy().astype('datetime64[D]')
+            for district, rows in complete.groupby('district', sort=False).indices.items():
+                writer = partitions.get(district)
+                if writer is None:
+                    writer = partitions[district] = ColumnarWriter(
+                        os.path.join(workdir, f"raw-{len(partitions)}"), RAW_DTYPES)
+                part = complete.iloc[rows]
+                writer.append({
+                    'date': dates[rows],
+                    'rainfall_mm': part['rainfall_mm'],
+                    'temperature_c': part['temperature_c'],
+                    'humidity_p': part['humidity_p'],
+                    'event_label': part['event_label'],
+                })
+        for writer in partitions.values():
+            writer.close()
+        if dropped > 0:
+            logger.info(f"Removed {dropped} rows with missing values.")
+        return partitions, median_trackers, loaded, dropped
+
+    def _stage_features(self, workdir, partitions, medians):
+        staged = ColumnarWriter(os.path.join(workdir, "features"), {
+            name: dtype for name, dtype in OUTPUT_DTYPES.items() if not name.endswith('_norm')
+        })
+        ranges, bounds = {}, {col: [np.inf, -np.inf] for col in NORM_COLUMNS}
+        continuity, tails, filled = {}, {}, 0
+        for district in sorted(partitions):
+            columns = read_columns(partitions[district].path)
+            order = np.argsort(columns['date'], kind='stable')
+            data = {name: np.asarray(values)[order] for name, values in columns.items()}
+            for col, (low, high) in OUTLIER_BOUNDS.items():
+                values = data[col]
+                values[(values < low) | (values > high)] = medians[col]
+            data, added = self._district_features(data)
+            filled += added
+            rows = len(data['date'])
+            tails[district] = {name: values[-TAIL_ROWS:] for name, values in data.items()}
+            for col in NORM_COLUMNS:
+                bounds[col][0] = min(bounds[col][0], float(data[col].min()))
+                bounds[col][1] = max(bounds[col][1], float(data[col].max()))
+            data['district'] = np.full(rows, district)
+            ranges[district] = (staged.rows, staged.rows + rows)
+            staged.append(data)
+
+            entry = continuity_report(data['district'], data['date'])[district]
+            continuity[district] = entry
+            if entry["missing_days"]:
+                logger.warning(f"{district}: {entry['missing_days']} missing dates in {len(entry['gaps'])} gap(s).")
+        staged.close()
+        if filled:
+            logger.info(f"Filled {filled} missing day(s) in gaps of up to {self.max_fill_days} day(s) ({self.fill_method}).")
+        self.continuity = continuity
+        return staged, ranges, bounds, tails
+
+    def _district_features(self, data):
+        """
+        One district's date-sorted raw columns -> optional gap filling plus
+        lag/rolling/trend features. Returns (columns, days_filled).
+        """
+        added = 0
+        if self.fill_method:
+            days = data.pop('date').astype('datetime64[D]').astype(np.int64)
+            _, days, data, added = fill_short_gaps(
+                np.zeros(len(days), dtype=np.int8), days, data,
+                self.max_fill_days, self.fill_method, FILL_RESET
+            )
+            data['date'] = days.astype('datetime64[D]')
+        data.update(compute_features(np.zeros(len(data['date']), dtype=np.int8),
+                                     data['rainfall_mm'], data['temperature_c'], data['humidity_p']))
+        return data, added
+
+    def _write_normalized(self, staged, ranges, bounds, output_path, metadata):
+        output = ColumnarWriter(output_path, OUTPUT_DTYPES)
+        columns = read_columns(staged.path)
+        for district, (start, end) in ranges.items():
+            data = {name: values[start:end] for name, values in columns.items()}
+            for col in NORM_COLUMNS:
+                low, high = bounds[col]
+                data[f'{col}_norm'] = (data[col] - low) / (high - low) if high - low != 0 else np.zeros(end - start)
+            output.append(data)
+        output.close(metadata)
+        logger.info(f"Cleaned data saved to {output_path} ({output.rows} rows, columnar)")
+
+    def _save_state(self, outputs, trackers, bounds, tails):
+        """Everything run_incremental needs to continue from the end of this run's input."""
+        with open(self.input_path, 'rb') as f:
+            columns = f.readline().decode().strip().split(',')
+        state = {
+            "input_path": self.input_path,
+            "input_offset": self._input_size,
+            "columns": columns,
+            "outputs": outputs,
+            "medians": {col: tracker.to_json() for col, tracker in trackers.items()},
+            "norm_bounds": {col: [float(low), float(high)] for col, (low, high) in bounds.items()},
+            "tails": {
+                district: {
+                    col: [str(v) for v in np.asarray(values).astype('datetime64[D]')] if col == 'date'
+                    else np.asarray(values).tolist()
+                    for col, values in tail.items() if col in RAW_DTYPES
+                }
+                for district, tail in tails.items()
+            },
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as f:
+            state = json.load(f)
+        state["medians"] = {col: StreamingMedian.from_json(pairs) for col, pairs in state["medians"].items()}
+        state["tails"] = {
+            district: {
+                col: np.asarray(values, dtype='datetime64[D]' if col == 'date'
+                                else object if RAW_DTYPES[col] == 'category' else RAW_DTYPES[col])
+                for col, values in tail.items()
+            }
+            for district, tail in state["tails"].items()
+        }
+        return state
+
+    def run_incremental(self):
+        """
+        Cleans only the rows appended to the input since the last run (full or
+        incremental) and appends them to that run's output. Each district's
+        features continue from its last TAIL_ROWS cleaned rows, so lags, rolling
+        totals and trends match a full rerun exactly.
+
+        Two things are carried forward rather than recomputed: outliers in new
+        rows are replaced with the median over all rows seen so far, and
+        earlier *_norm values keep the bounds they were written with (a warning
+        is logged when new rows widen them; run a full clean to renormalize).
+        Appended rows are ordered by district, then date, after the existing ones.
+        """
+        state = self._load_state()
+        if state is None:
+            logger.error(f"No cleaner state at {self.state_path}; run a full clean first.")
+            return None
+        if not os.path.exists(self.input_path):
+            logger.error(f"Input file {self.input_path} not found.")
+            return None
+        size = os.path.getsize(self.input_path)
+        if state["input_path"] != self.input_path or size < state["input_offset"]:
+            logger.error(f"{self.input_path} is not an extension of the last cleaned input; run a full clean first.")
+            return None
+        started = time.perf_counter()
+        report = {"rows_loaded": 0, "rows_dropped": 0, "rows_skipped": 0, "rows_written": 0,
+                  "missing_days": 0, "outputs": state["outputs"]}
+        if size == state["input_offset"]:
+            logger.info("No new rows since the last clean.")
+            return report
+
+        with open(self.input_path, 'rb') as f:
+            f.seek(state["input_offset"])
+            new = pd.read_csv(f, names=state["columns"], header=None,
+                              na_values=['', 'NA', 'NAN'], keep_default_na=False)
+        report["rows_loaded"] = len(new)
+        complete = new.dropna()
+        report["rows_dropped"] = len(new) - len(complete)
+        trackers = state["medians"]
+        for col, (low, high) in OUTLIER_BOUNDS.items():
+            values = complete[col].to_numpy(dtype=np.float64)
+            trackers[col].add(values)
+            complete = complete.assign(**{col: np.where((values < low) | (values > high), trackers[col].median(), values)})
+        dates = pd.to_datetime(complete['date']).to_numpy().astype('datetime64[D]')
+
+        tails, cleaned, filled = state["tails"], [], 0
+        for district, rows in sorted(complete.groupby('district', sort=False).indices.items()):
+            order = rows[np.argsort(dates[rows], kind='stable')]
+            part = complete.iloc[order]
+            data = {
+                'date': dates[order],
+                'rainfall_mm': part['rainfall_mm'].to_numpy(dtype=np.float64),
+                'temperature_c': part['temperature_c'].to_numpy(dtype=np.float64),
+                'humidity_p': part['humidity_p'].to_numpy(dtype=np.float64),
+                'event_label': part['event_label'].to_numpy(dtype=object),
+            }
+            tail = tails.get(district)
+            carried = 0
+            if tail is not None and len(tail['date']):
+                fresh = data['date'] > tail['date'][-1]
+                if not fresh.all():
+                    skipped = int((~fresh).sum())
+                    report["rows_skipped"] += skipped
+                    logger.warning(f"{district}: skipped {skipped} row(s) dated on or before {tail['date'][-1]}.")
+                    data = {col: values[fresh] for col, values in data.items()}
+                carried = len(tail['date'])
+                data = {col: np.concatenate([tail[col], data[col]]) for col in RAW_DTYPES}
+            if len(data['date']) == carried:
+                continue
+            data, added = self._district_features(data)
+            filled += added
+            entry = continuity_report(np.full(len(data['date']), district), data['date'])[district]
+            if entry["missing_days"]:
+                report["missing_days"] += entry["missing_days"]
+                logger.warning(f"{district}: {entry['missing_days']} missing dates in {len(entry['gaps'])} gap(s) since the last clean.")
+            tails[district] = {col: data[col][-TAIL_ROWS:] for col in RAW_DTYPES}
+            data = {col: values[carried:] for col, values in data.items()}
+            data['district'] = np.full(len(data['date']), district)
+            cleaned.append(data)
+        if filled:
+            logger.info(f"Filled {filled} missing day(s) in gaps of up to {self.max_fill_days} day(s) ({self.fill_method}).")
+
+        bounds = state["norm_bounds"]
+        if cleaned:
+            widened = []
+            for col in NORM_COLUMNS:
+                low = min(bounds[col][0], min(float(d[col].min()) for d in cleaned))
+                high = max(bounds[col][1], max(float(d[col].max()) for d in cleaned))
+                if [low, high] != bounds[col]:
+                    widened.append(col)
+                    bounds[col] = [low, high]
+            if widened:
+                logger.warning(f"New rows widen the normalization range of {', '.join(widened)}; "
+                               f"earlier *_norm values keep the old range until the next full clean.")
+            data = {col: np.concatenate([d[col] for d in cleaned]) for col in cleaned[0]}
+            for col in NORM_COLUMNS:
+                low, high = bounds[col]
+                data[f'{col}_norm'] = (data[col] - low) / (high - low) if high - low != 0 else np.zeros(len(data[col]))
+            report["rows_written"] = len(data['date'])
+            self._append_outputs(state["outputs"], data)
+
+        self._input_size = size
+        self._save_state(state["outputs"], trackers, bounds, tails)
+        report["seconds"] = round(time.perf_counter() - started, 2)
+        logger.info(f"Incremental clean finished: {report}")
+        return report
+
+    def _append_outputs(self, outputs, data):
+        if "csv" in outputs:
+            frame = pd.DataFrame({col: data[col] for col in OUTPUT_DTYPES})
+            frame['date'] = pd.to_datetime(frame['date'])
+            frame.to_csv(outputs["csv"], mode='a', header=False, index=False)
+            logger.info(f"Appended {len(frame)} rows to {outputs['csv']}")
+        if "columnar" in outputs:
+            writer = ColumnarWriter.reopen(outputs["columnar"])
+            writer.append(data)
+            writer.close({**read_schema(outputs["columnar"])["metadata"],
+                          "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+            logger.info(f"Appended {len(data['date'])} rows to {outputs['columnar']} ({writer.rows} rows, columnar)")
+
 if __name__ == "__main__":
-    cleaner = DataCleaner()
-    cleaner.run_pipeline()
+    # python -m backend.utils.data_cleaner [--streaming | --incremental] [--chunk-rows N]
+    import argparse
+    parser = argparse.ArgumentParser(description="Clean the Kerala weather history.")
+    parser.add_argument("--streaming", action="store_true",
+                        help=f"Chunked, district-by-district mode writing the columnar dataset ({CLEANED_COLUMNAR})")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Clean only rows appended since the last run (state in {CLEANER_STATE})")
+    parser.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS)
+    parser.add_argument("--fill", choices=["ffill", "interpolate"], help="Fill short date gaps before feature engineering")
+    parser.add_argument("--max-fill-days", type=int, default=MAX_FILL_DAYS)
+    args = parser.parse_args()
+
+    cleaner = DataCleaner(fill_method=args.fill, max_fill_days=args.max_fill_days)
+    if args.incremental:
+        cleaner.run_incremental()
+    elif args.streaming:
+        cleaner.run_streaming(chunk_rows=args.chunk_rows)
+    else:
+        cleaner.run_pipeline()
@@ -0,0 +1,235 @@
+import os
+import shutil
+import threading
+import time
+import logging
+from typing import Dict, List, Optional
+import numpy as np
+from backend.utils.columnar import ColumnarWriter, SCHEMA_FILE, read_columns, read_schema
+
+logger = logging.getLogger(__name__)
+
+HISTORY_STORE = os.getenv("HISTORY_STORE_PATH", "backend/data/history_store")
+# Cleaner outputs (streaming columnar dataset, CSV); the newest one present is the source
+HISTORY_SOURCES = ("backend/data/cleaned_kerala_data", "backend/data/cleaned_kerala_data.csv")
+# Rebuild in the background after startup when the cleaned data changed (opt-in; otherwise
+# build with `python -m backend.utils.history_store` or POST /api/admin/history-store/build)
+AUTO_BUILD = os.getenv("HISTORY_AUTO_BUILD", "false").lower() == "true"
+
+def _source_stamp(path: str) -> Optional[Dict]:
+    """Identity of a cleaner output (its schema file for columnar datasets), or None if absent."""
+    target = os.path.join(path, SCHEMA_FILE) if os.path.isdir(path) else path
+    try:
+        stat = os.stat(target)
+    except FileNotFoundError:
+        return None
+    return {"path": path, "size": stat.st_size, "mtime": stat.st_mtime}
+
+def latest_source(sources=HISTORY_SOURCES) -> Optional[Dict]:
+    stamps = [stamp for stamp in map(_source_stamp, sources) if stamp is not None]
+    return max(stamps, key=lambda stamp: stamp["mtime"]) if stamps else None
+
+def _load_source(path: str):
+    """Cleaned columns as arrays plus their columnar dtypes."""
+    if os.path.isdir(path):
+        schema = read_schema(path)
+        return read_columns(path), dict(schema["columns"])
+    import pandas as pd
+    from backend.utils.data_cleaner import OUTPUT_DTYPES
+    df = pd.read_csv(path, keep_default_na=False)
+    dtypes = {col: OUTPUT_DTYPES.get(col, "float64" if df[col].dtype.kind in "fi" else "category")
+              for col in df.columns}
+    columns = {col: df[col].to_numpy() for col in df.columns}
+    columns["date"] = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")
+    return columns, dtypes
+
+def build_history_store(source: Optional[str] = None, path: str = HISTORY_STORE) -> Dict:
+    """
+    Rewrites the store from the cleaned data, sorted by district then date,
+    with each district's [start, end) row range in the schema metadata.
+    The new store is written next to the old one and swapped in at the end.
+    """
+    started = time.perf_counter()
+    stamp = _source_stamp(source) if source else latest_source()
+    if stamp is None:
+        raise FileNotFoundError(f"No cleaned data found at {source or ', '.join(HISTORY_SOURCES)}")
+    columns, dtypes = _load_source(stamp["path"])
+
+    districts = np.asarray(columns["district"]).astype(str)
+    names, codes = np.unique(districts, return_inverse=True)
+    dates = np.asarray(columns["date"]).astype("datetime64[D]")
+    order = np.lexsort((dates, codes))
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+
+    building = f"{path}.building"
+    writer = ColumnarWriter(building, dtypes)
+    index = {}
+    for i, name in enumerate(names.tolist()):
+        rows = order[bounds[i]:bounds[i + 1]]
+        writer.append({col: dates[rows] if col == "date" else np.asarray(values)[rows]
+                       for col, values in columns.items()})
+        index[name] = {
+            "start": int(bounds[i]), "end": int(bounds[i + 1]),
+            "first_date": str(dates[rows[0]]), "last_date": str(dates[rows[-1]])
+        }
+    writer.close({"source": stamp, "index": index, "built_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+    # Readers holding memmaps of the old files keep them until they reopen
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(building, path)
+    report = {
+        "rows": writer.rows, "districts": len(index), "columns": len(dtypes),
+        "source": stamp["path"], "seconds": round(time.perf_counter() - started, 3)
+    }
+    logger.info(f"History store built: {report}")
+    return report
+
+class HistoryStore:
+    """
+    Read side of the columnar history: every column is memory-mapped, and
+    the per-district row ranges come from the schema. A query binary-searches
+    the district's (sorted) dates and copies only the requested rows of the
+    requested columns; nothing is parsed and the rest of the file is never
+    paged in. Reopens itself when a rebuild swaps the store.
+    """
+
+    def __init__(self, path: str = HISTORY_STORE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._schema = None
+        self._columns = None
+        self._names = {}
+
+    def _open(self) -> Optional[Dict]:
+        try:
+            mtime = os.stat(os.path.join(self.path, SCHEMA_FILE)).st_mtime
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if mtime != self._mtime:
+                schema = read_schema(self.path)
+                self._columns = read_columns(self.path, decode=False)
+                self._names = {name.lower(): name for name in schema["metadata"]["index"]}
+                self._schema, self._mtime = schema, mtime
+            return self._schema
+
+    @property
+    def available(self) -> bool:
+        return self._open() is not None
+
+    def is_current(self) -> bool:
+        """True when the store exists and was built from the newest cleaned data."""
+        schema = self._open()
+        return schema is not None and schema["metadata"].get("source") == latest_source()
+
+    def ensure_current(self) -> Optional[Dict]:
+        """Rebuilds if the cleaned data changed (or the store is missing). Returns the build report, if any."""
+        if self.is_current() or latest_source() is None:
+            return None
+        return build_history_store(path=self.path)
+
+    @property
+    def columns(self) -> List[str]:
+        schema = self._open()
+        return list(schema["columns"]) if schema else []
+
+    def districts(self) -> Dict[str, Dict]:
+        schema = self._open()
+        if schema is None:
+            return {}
+        return {name: {"rows": entry["end"] - entry["start"], "first_date": entry["first_date"],
+                       "last_date": entry["last_date"]}
+                for name, entry in schema["metadata"]["index"].items()}
+
+    def _decode(self, name: str, values: np.ndarray) -> np.ndarray:
+        if self._schema["columns"][name] == "category":
+            return np.asarray(self._schema["categories"][name], dtype=object)[values]
+        return np.array(values)
+
+    def query(self, district: str, start: Optional[str] = None, end: Optional[str] = None,
+              columns: Optional[List[str]] = None, limit: Optional[int] = None) -> Dict:
+        """
+        Rows of one district with start <= date <= end (ISO dates, both
+        optional), oldest first, as {column: array}. `limit` caps the rows;
+        `next_start` is then the date to continue from.
+        Raises LookupError for an unknown district, ValueError for unknown columns.
+        """
+        schema = self._open()
+        if schema is None:
+            raise FileNotFoundError(f"History store not built at {self.path}")
+        name = self._names.get(district.lower())
+        if name is None:
+            raise LookupError(district)
+        selected = columns or [col for col in schema["columns"] if col != "district"]
+        unknown = [col for col in selected if col not in schema["columns"]]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+
+        entry = schema["metadata"]["index"][name]
+        first, last = entry["start"], entry["end"]
+        dates = self._columns["date"][first:last]
+        if start:
+            first += int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        if end:
+            last = entry["start"] + int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        last = max(first, last)
+        next_start = None
+        if limit is not None and last - first > limit:
+            next_start = str(self._columns["date"][first + limit])
+            last = first + limit
+        return {
+            "district": name,
+            "rows": last - first,
+            "next_start": next_start,
+            "data": {col: self._decode(col, self._columns[col][first:last]) for col in selected}
+        }
+
+    def frame(self, columns: Optional[List[str]] = None):
+        """Whole store (or some columns) as a pandas DataFrame, sorted by district and date."""
+        schema = self._open()
+        if schema is None:
+            raise FileNotFoundError(f"History store not built at {self.path}")
+        import pandas as pd
+        data = {}
+        for col in columns or list(schema["columns"]):
+            values = self._columns[col]
+            if schema["columns"][col] == "category":
+                data[col] = pd.Categorical.from_codes(np.asarray(values), categories=schema["categories"][col])
+            else:
+                data[col] = np.asarray(values)
+        return pd.DataFrame(data)
+
+    def status(self) -> Dict:
+        schema = self._open()
+        if schema is None:
+            return {"available": False, "path": self.path}
+        return {
+            "available": True,
+            "path": self.path,
+            "rows": schema["rows"],
+            "districts": len(schema["metadata"]["index"]),
+            "source": schema["metadata"].get("source"),
+            "built_at": schema["metadata"].get("built_at"),
+            "current": self.is_current()
+        }
+
+# Singleton
+history_store = HistoryStore()
+
+if __name__ == "__main__":
+    # python -m backend.utils.history_store [--source PATH] [district start end]
+    # Rebuilds the store, then times a cold open and one query.
+    import argparse
+    parser = argparse.ArgumentParser(description="Build and query the columnar history store.")
+    parser.add_argument("--source", help=f"Cleaned data to build from (default: newest of {', '.join(HISTORY_SOURCES)})")
+    parser.add_argument("query", nargs="*", help="district [start] [end]")
+    args = parser.parse_args()
+
+    print(build_history_store(args.source))
+    district, start, end = (args.query + [None, None, None])[:3]
+    store = HistoryStore()
+    started = time.perf_counter()
+    result = store.query(district or next(iter(store.districts())), start, end)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{result['district']}: {result['rows']} rows x {len(result['data'])} columns in {elapsed:.2f} ms (cold open)")
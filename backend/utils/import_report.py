@@ -0,0 +1,74 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+# Cold-start budget for `import backend.main` (milliseconds, cumulative -X importtime)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", 1500))
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure_imports(module: str = "backend.main"):
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+    Returns [(name, self_us, cumulative_us, depth)] in import order.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.getenv("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+def summarize(rows, top: int = 15):
+    """Total import time, per-top-level-package self time, and the slowest first-party modules."""
+    total_us = next((cum for name, _, cum, depth in reversed(rows) if depth == 0 and name.startswith("backend")), 0)
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    first_party = sorted(
+        ((name, cum) for name, _, cum, _ in rows if name.startswith("backend")),
+        key=lambda item: item[1], reverse=True
+    )
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return total_us / 1000, packages, first_party[:top]
+
+def print_report(module: str, total_ms: float, packages, first_party):
+    print(f"Import cost of {module}: {total_ms:.1f} ms")
+    print("\nBy package (self time):")
+    for name, us in packages:
+        print(f"  {name:<30} {us / 1000:8.1f} ms")
+    print("\nFirst-party modules (cumulative):")
+    for name, us in first_party:
+        print(f"  {name:<45} {us / 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    # python -m backend.utils.import_report [--budget-ms 1500]
+    # Exits 1 when the import of backend.main exceeds the budget (for CI).
+    parser = argparse.ArgumentParser(description="Cold-start import report for the backend.")
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="Best-of-N to reduce noise")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        result = summarize(measure_imports(args.module))
+        if best is None or result[0] < best[0]:
+            best = result
+    print_report(args.module, *best)
+
+    if best[0] > args.budget_ms:
+        print(f"\nFAIL: {best[0]:.1f} ms exceeds import budget of {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"\nOK: within import budget of {args.budget_ms:.0f} ms")
@@ -0,0 +1,219 @@
+import json
+import os
+import shutil
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from backend.utils.tree_engine import CompiledTreeEnsemble, export_compiled_model
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = "backend/models/registry"
+ACTIVE_POINTER = "ACTIVE"
+COMPILED_FILE = "model.npz"
+SKLEARN_FILE = "model.joblib"
+METADATA_FILE = "metadata.json"
+
+class ModelRegistry:
+    """
+    Versioned model artifacts on disk, one directory per version:
+
+        registry/<version>/model.npz, model.joblib, metadata.json
+        registry/ACTIVE   -> name of the version being served
+
+    The active model is loaded lazily on first use. Training runs in a
+    background thread and never blocks startup or requests. Activation
+    swaps a single reference, so in-flight predictions finish on the model
+    they started with.
+    """
+
+    def __init__(self, trainer: Callable[[str, str, Optional[str]], Optional[Dict]],
+                 feature_order: Sequence[str], root: str = REGISTRY_DIR,
+                 legacy_artifacts: Sequence[str] = ()):
+        self.trainer = trainer
+        self.feature_order = list(feature_order)
+        self.root = root
+        self.legacy_artifacts = list(legacy_artifacts)
+        self._active = None  # (version, model, metadata)
+        self._lock = threading.Lock()
+        self._training: Optional[threading.Thread] = None
+        self._last_error: Optional[str] = None
+
+    # --- Serving ---
+
+    def get_model(self):
+        """Returns the active model, or None while the first version is being trained."""
+        active = self._active
+        if active is not None:
+            return active[1]
+        with self._lock:
+            if self._active is None:
+                self._load_initial()
+        return self._active[1] if self._active is not None else None
+
+    def _load_initial(self):
+        version = self._read_pointer()
+        if version:
+            try:
+                self._activate(version)
+                return
+            except Exception as e:
+                logger.error(f"Could not load active model {version}: {e}")
+
+        # Fall back to the newest loadable version, then legacy artifacts
+        for version in reversed(self.versions()):
+            try:
+                self._activate(version)
+                return
+            except Exception as e:
+                logger.error(f"Could not load model {version}: {e}")
+
+        # Already registered legacy artifacts were tried above; don't re-copy them
+        version = self._import_legacy() if "legacy" not in self.versions() else None
+        if version:
+            try:
+                self._activate(version)
+                return
+            except Exception as e:
+                logger.error(f"Could not load legacy model artifacts: {e}")
+
+        logger.warning("No usable model artifact. Training one in the background.")
+        self.start_training()
+
+    def _load_version(self, version: str):
+        path = self._path(version)
+        compiled_path = os.path.join(path, COMPILED_FILE)
+        if os.path.exists(compiled_path):
+            model = CompiledTreeEnsemble.load(compiled_path)
+        else:
+            import joblib
+            model = export_compiled_model(
+                joblib.load(os.path.join(path, SKLEARN_FILE)), compiled_path,
+                feature_names=self.feature_order
+            )
+        if model.feature_names != self.feature_order:
+            raise ValueError(f"Feature order mismatch: {model.feature_names} != {self.feature_order}")
+        return model, self._read_metadata(version)
+
+    def _activate(self, version: str):
+        model, metadata = self._load_version(version)
+        self._active = (version, model, metadata)
+        self._write_pointer(version)
+        logger.info(f"Model version {version} is now active.")
+
+    def activate(self, version: str):
+        """Loads `version` fully, then atomically makes it the served model."""
+        if version not in self.versions():
+            raise KeyError(f"Unknown model version: {version}")
+        with self._lock:
+            self._activate(version)
+
+    # --- Training ---
+
+    @property
+    def is_training(self) -> bool:
+        return self._training is not None and self._training.is_alive()
+
+    def start_training(self, mode: Optional[str] = None) -> bool:
+        """Starts background training of a new version. Returns False if one is already running."""
+        if self.is_training:
+            return False
+        self._training = threading.Thread(target=self._train, args=(mode,), name="model-training", daemon=True)
+        self._training.start()
+        return True
+
+    def _train(self, mode: Optional[str]):
+        version = time.strftime("%Y%m%d-%H%M%S")
+        path = self._path(version)
+        try:
+            os.makedirs(path, exist_ok=True)
+            started = time.time()
+            report = self.trainer(os.path.join(path, SKLEARN_FILE), os.path.join(path, COMPILED_FILE), mode)
+            if report is None:
+                raise RuntimeError("Trainer produced no model (missing training data?)")
+            self._write_metadata(version, {
+                "version": version,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "training_seconds": round(time.time() - started, 1),
+                "feature_order": self.feature_order,
+                "metrics": report
+            })
+            self.activate(version)
+            self._last_error = None
+        except Exception as e:
+            self._last_error = str(e)
+            logger.error(f"Background training of {version} failed: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _import_legacy(self) -> Optional[str]:
+        """Registers pre-registry artifacts (backend/models/*.npz|joblib) as a version."""
+        existing = [p for p in self.legacy_artifacts if os.path.exists(p)]
+        if not existing:
+            return None
+        version = "legacy"
+        path = self._path(version)
+        os.makedirs(path, exist_ok=True)
+        for src in existing:
+            name = COMPILED_FILE if src.endswith(".npz") else SKLEARN_FILE
+            shutil.copy2(src, os.path.join(path, name))
+        self._write_metadata(version, {
+            "version": version,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(os.path.getmtime(existing[0]))),
+            "feature_order": self.feature_order,
+            "metrics": None,
+            "imported_from": existing
+        })
+        logger.info(f"Imported legacy model artifacts as version '{version}'.")
+        return version
+
+    # --- Storage helpers ---
+
+    def _path(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def versions(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        # Timestamped versions sort chronologically; the imported legacy one is oldest
+        return sorted(
+            (v for v in os.listdir(self.root)
+             if os.path.isdir(self._path(v)) and os.path.exists(os.path.join(self._path(v), METADATA_FILE))),
+            key=lambda v: (v != "legacy", v)
+        )
+
+    def _read_pointer(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, ACTIVE_POINTER)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, version: str):
+        os.makedirs(self.root, exist_ok=True)
+        pointer = os.path.join(self.root, ACTIVE_POINTER)
+        with open(f"{pointer}.tmp", "w") as f:
+            f.write(version)
+        os.replace(f"{pointer}.tmp", pointer)
+
+    def _read_metadata(self, version: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self._path(version), METADATA_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": version}
+
+    def _write_metadata(self, version: str, metadata: Dict[str, Any]):
+        with open(os.path.join(self._path(version), METADATA_FILE), "w") as f:
+            json.dump(metadata, f, indent=2, default=str)
+
+    def status(self) -> Dict[str, Any]:
+        active = self._active
+        return {
+            "active_version": active[0] if active else None,
+            "loaded": active is not None,
+            "metadata": active[2] if active else None,
+            "versions": self.versions(),
+            "training": self.is_training,
+            "last_error": self._last_error
+        }
@@ -1,18 +1,72 @@
-from sklearn.metrics import accuracy_score, precision_score, recall_score, mean_absolute_error, make_scorer
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
-import joblib
-import pandas as pd
 import numpy as np
 import os
 import logging
-import random
+from backend.utils.tree_engine import CompiledTreeEnsemble, export_compiled_model, COMPILED_MODEL_PATH
+from backend.utils.model_registry import ModelRegistry
 
 # Configure logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 MODEL_PATH = "backend/models/kerala_safe_ai_boost.joblib"
+FEATURE_ORDER = ['rain_1d', 'rain_3d', 'rain_7d', 'temp', 'humidity']
+CLEANED_CSV = "backend/data/cleaned_kerala_data.csv"
+TRAINING_MODE = os.getenv("RISK_TRAINING_MODE", "fast")
+
+# cleaned_kerala_data.csv column -> model feature name
+TRAINING_COLUMNS = {
+    'rain_1d_lag': 'rain_1d',
+    'rain_3d_total': 'rain_3d',
+    'rain_7d_total': 'rain_7d',
+    'temperature_c': 'temp',
+    'humidity_p': 'humidity'
+}
+
+def build_training_targets(df, seed=42):
+    """
+    Vectorized risk score labels (0-100) from event labels and rainfall.
+    Floods/landslides score 90-95, heatwaves scale with temperature,
+    everything else with accumulated rain.
+    """
+    rng = np.random.default_rng(seed)
+    label = df['event_label'].to_numpy()
+    temp = df['temperature_c'].to_numpy(dtype=np.float64)
+    rain_based = (
+        (df['rain_3d_total'].to_numpy(dtype=np.float64) / 250) * 35
+        + (df['rain_7d_total'].to_numpy(dtype=np.float64) / 500) * 35
+        + (df['rainfall_mm'].to_numpy(dtype=np.float64) / 100) * 20
+    )
+    base = np.select(
+        [np.isin(label, ['Flood', 'Landslide']), label == 'Heatwave'],
+        [85 + rng.uniform(5, 10, size=len(df)), 70 + (temp - 38) * 5],
+        default=rain_based
+    )
+    return np.clip(base, 0, 100)
+
+def load_training_data(path=CLEANED_CSV):
+    """
+    Returns (X, y) with float32 features, or None if the dataset is missing.
+    Reads the memory-mapped history store when it is current with the cleaned
+    data (only the needed columns, no CSV parsing).
+    """
+    columns = [*TRAINING_COLUMNS, 'rainfall_mm', 'event_label']
+    dtypes = {col: np.float32 for col in TRAINING_COLUMNS}
+    dtypes['rainfall_mm'] = np.float32
+    from backend.utils.history_store import history_store
+    if path == CLEANED_CSV and history_store.is_current():
+        logger.info(f"Training on historical data: {history_store.path}")
+        df = history_store.frame(columns).astype(dtypes)
+    elif os.path.exists(path):
+        import pandas as pd
+        logger.info(f"Training on historical data: {path}")
+        df = pd.read_csv(path, usecols=columns, dtype=dtypes, keep_default_na=False)
+    else:
+        return None
+    X = df[list(TRAINING_COLUMNS)].rename(columns=TRAINING_COLUMNS)
+    return X, build_training_targets(df)
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when no trained model is available to serve predictions."""
 
 class KeralaRiskModel:
     """
@@ -20,56 +74,67 @@ class KeralaRiskModel:
     Inputs: Rain_1d, Rain_3d, Rain_7d, Temperature, Humidity
     Outputs: Score (0-100), Severity Level
     """
-    def __init__(self, model_path=MODEL_PATH):
+    def __init__(self, model_path=MODEL_PATH, compiled_path=COMPILED_MODEL_PATH, registry=None):
         self.model_path = model_path
+        self.compiled_path = compiled_path
+        self.registry = registry
         self.model = None
-        self.load_model()
+
+    def active_model(self):
+        """Registry-backed instances serve the registry's active version; others load lazily from disk."""
+        if self.registry is not None:
+            return self.registry.get_model()
+        if not self.model: self.load_model()
+        return self.model
 
     def load_model(self):
+        # Serving path: the compiled NumPy engine needs no sklearn/pandas import
+        if os.path.exists(self.compiled_path):
+            try:
+                self.model = CompiledTreeEnsemble.load(self.compiled_path)
+                logger.info("Compiled Gradient Boosting Model loaded successfully.")
+                return
+            except Exception as e:
+                logger.error(f"Error loading compiled model: {e}")
+
         if os.path.exists(self.model_path):
             try:
+                import joblib
                 self.model = joblib.load(self.model_path)
                 logger.info("Gradient Boosting Model loaded successfully.")
+                self._export_compiled(self.model)
             except Exception as e:
                 logger.error(f"Error loading model: {e}")
                 self.train_and_save_model()
         else:
             self.train_and_save_model()
 
-    def train_and_save_model(self):
-        """Train model with 80/20 split and validation metrics."""
+    def _export_compiled(self, model):
+        try:
+            self.model = export_compiled_model(model, self.compiled_path, feature_names=FEATURE_ORDER)
+        except Exception as e:
+            logger.error(f"Compiled model export failed, serving sklearn model: {e}")
+
+    def train_and_save_model(self, mode=TRAINING_MODE):
+        """
+        Train model with 80/20 split and validation metrics.
+        mode="fast": successive-halving search, CV score reused from the search.
+        mode="full": exhaustive GridSearchCV + separate 5-fold CV (original pipeline).
+        Returns the validation report (or None if no data).
+        """
+        from sklearn.metrics import accuracy_score, precision_score, recall_score, mean_absolute_error, make_scorer
+        from sklearn.ensemble import GradientBoostingRegressor
+        from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+        import joblib
+
         np.random.seed(42)
-        CLEANED_CSV = "backend/data/cleaned_kerala_data.csv"
-        
-        if os.path.exists(CLEANED_CSV):
-            logger.info(f"Training on historical data: {CLEANED_CSV}")
-            df = pd.read_csv(CLEANED_CSV)
-            feature_cols = ['rain_1d_lag', 'rain_3d_total', 'rain_7d_total', 'temperature_c', 'humidity_p']
-            X = df[feature_cols].rename(columns={
-                'rain_1d_lag': 'rain_1d',
-                'rain_3d_total': 'rain_3d',
-                'rain_7d_total': 'rain_7d',
-                'temperature_c': 'temp',
-                'humidity_p': 'humidity'
-            })
-            
-            scores = []
-            for _, row in df.iterrows():
-                if row['event_label'] in ['Flood', 'Landslide']:
-                    base = 85 + random.uniform(5, 10)
-                elif row['event_label'] == 'Heatwave':
-                    base = 70 + (row['temperature_c'] - 38) * 5
-                else:
-                    r3 = row['rain_3d_total']
-                    r7 = row['rain_7d_total']
-                    base = (r3 / 250) * 35 + (r7 / 500) * 35 + (row['rainfall_mm'] / 100) * 20
-                scores.append(min(100, max(0, float(base))))
-            y = np.array(scores)
-        else:
+        data = load_training_data()
+        if data is None:
             logger.warning("No historical data found. Training aborted.")
-            return
+            return None
+        X, y = data
 
-        # 1. Hyperparameter Tuning with GridSearchCV
+        # 1. Hyperparameter Tuning
         param_grid = {
             'n_estimators': [100, 150, 200],
             'max_depth': [3, 4, 5],
@@ -84,23 +149,47 @@ class KeralaRiskModel:
             return accuracy_score((y_true >= 60).astype(int), (y_pred >= 60).astype(int))
         acc_scorer = make_scorer(threshold_accuracy)
 
-        logger.info("Starting Automatic Hyperparameter Tuning (GridSearchCV)...")
-        grid_search = GridSearchCV(
-            estimator=base_gb,
-            param_grid=param_grid,
-            cv=3, # Reduced to 3-fold for faster tuning
-            scoring=acc_scorer,
-            n_jobs=-1
-        )
-        grid_search.fit(X, y)
-        
-        best_gb = grid_search.best_estimator_
-        logger.info(f"Best Parameters Found: {grid_search.best_params_}")
+        if mode == "fast":
+            from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+            from sklearn.model_selection import HalvingGridSearchCV
+
+            # Candidates are raced on growing subsamples; only the best few
+            # ever see the full dataset. No refit - the final fit happens below.
+            logger.info("Starting Successive-Halving Hyperparameter Search...")
+            search = HalvingGridSearchCV(
+                estimator=base_gb,
+                param_grid=param_grid,
+                cv=3,
+                factor=3,
+                resource='n_samples',
+                scoring=acc_scorer,
+                refit=False,
+                random_state=42,
+                n_jobs=-1
+            )
+            search.fit(X, y)
+            best_gb = base_gb.set_params(**search.best_params_)
+            # The last halving round already cross-validated the winner on all rows
+            avg_cv_acc = float(search.cv_results_['mean_test_score'][search.best_index_])
+            cv_label = "3-Fold CV (final halving round)"
+        else:
+            logger.info("Starting Automatic Hyperparameter Tuning (GridSearchCV)...")
+            search = GridSearchCV(
+                estimator=base_gb,
+                param_grid=param_grid,
+                cv=3, # Reduced to 3-fold for faster tuning
+                scoring=acc_scorer,
+                n_jobs=-1
+            )
+            search.fit(X, y)
+            best_gb = search.best_estimator_
 
-        # 2. Perform 5-Fold Cross-Validation on Best Model
-        logger.info("Performing Cross-Validation on tuned model...")
-        cv_scores = cross_val_score(best_gb, X, y, cv=5, scoring=acc_scorer)
-        avg_cv_acc = cv_scores.mean()
+            # 2. Perform 5-Fold Cross-Validation on Best Model
+            logger.info("Performing Cross-Validation on tuned model...")
+            cv_scores = cross_val_score(best_gb, X, y, cv=5, scoring=acc_scorer)
+            avg_cv_acc = float(cv_scores.mean())
+            cv_label = "5-Fold CV"
+        logger.info(f"Best Parameters Found: {search.best_params_}")
 
         # 3. Final Evaluation
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.20, random_state=42)
@@ -110,19 +199,25 @@ class KeralaRiskModel:
         y_test_class = (y_test >= 60).astype(int)
         y_pred_class = (y_pred >= 60).astype(int)
         
-        acc = accuracy_score(y_test_class, y_pred_class)
-        prec = precision_score(y_test_class, y_pred_class)
-        rec = recall_score(y_test_class, y_pred_class)
-        mae = mean_absolute_error(y_test, y_pred)
+        report = {
+            "mode": mode,
+            "dataset_size": len(X),
+            "best_params": search.best_params_,
+            "cv_accuracy": avg_cv_acc,
+            "test_accuracy": float(accuracy_score(y_test_class, y_pred_class)),
+            "precision": float(precision_score(y_test_class, y_pred_class)),
+            "recall": float(recall_score(y_test_class, y_pred_class)),
+            "mae": float(mean_absolute_error(y_test, y_pred))
+        }
         
         logger.info("--- TUNED MODEL VALIDATION REPORT ---")
-        logger.info(f"Dataset Size: {len(X)}")
-        logger.info(f"Best Hyperparameters: {grid_search.best_params_}")
-        logger.info(f"5-Fold CV Average Accuracy: {avg_cv_acc:.4f}")
-        logger.info(f"Final Test Accuracy: {acc:.4f}")
-        logger.info(f"Precision: {prec:.4f}")
-        logger.info(f"Recall: {rec:.4f}")
-        logger.info(f"Mean Absolute Error: {mae:.2f}")
+        logger.info(f"Dataset Size: {report['dataset_size']}")
+        logger.info(f"Best Hyperparameters: {report['best_params']}")
+        logger.info(f"{cv_label} Average Accuracy: {report['cv_accuracy']:.4f}")
+        logger.info(f"Final Test Accuracy: {report['test_accuracy']:.4f}")
+        logger.info(f"Precision: {report['precision']:.4f}")
+        logger.info(f"Recall: {report['recall']:.4f}")
+        logger.info(f"Mean Absolute Error: {report['mae']:.2f}")
         logger.info("-------------------------------------")
         
         # Ensure best_gb is saved
@@ -134,29 +229,64 @@ class KeralaRiskModel:
             joblib.dump(gb_model, self.model_path)
             self.model = gb_model
             logger.info(f"Reliable Model saved: {self.model_path}")
+            self._export_compiled(gb_model)
         except Exception as e:
             logger.error(f"Save Failed: {e}")
+        return report
+
+    @staticmethod
+    def score_to_level(score: float) -> str:
+        if score >= 80: return "Critical"
+        if score >= 60: return "High"
+        if score >= 40: return "Moderate"
+        return "Safe"
 
     def predict_flood_risk(self, **features):
         """
         Predict usage Gradient Boosting model.
         Args: rain_1d, rain_3d, rain_7d, temp, humidity
         """
-        if not self.model: self.load_model()
-        
-        feature_order = ['rain_1d', 'rain_3d', 'rain_7d', 'temp', 'humidity']
-        input_values = [features.get(f, 0.0) for f in feature_order]
-        
-        input_df = pd.DataFrame([input_values], columns=feature_order)
-        score = float(self.model.predict(input_df)[0])
-        score = round(max(0, min(100, score)), 1)
-        
-        level = "Safe"
-        if score >= 80: level = "Critical"
-        elif score >= 60: level = "High"
-        elif score >= 40: level = "Moderate"
-        
-        return {"score": score, "level": level}
+        return self.predict_flood_risk_batch([features])[0]
+
+    def predict_flood_risk_batch(self, rows):
+        """
+        Vectorized prediction for many locations/scenarios in one model call.
+        Args: rows - a NumPy matrix with columns in FEATURE_ORDER, or a list
+              of feature dicts (missing features default to 0.0).
+        Returns: list of {"score", "level"} in input order.
+        """
+        model = self.active_model()
+        if model is None:
+            raise ModelUnavailableError("Risk model is not available yet (training in progress).")
+
+        if isinstance(rows, np.ndarray):
+            matrix = np.asarray(rows, dtype=float).reshape(-1, len(FEATURE_ORDER))
+        else:
+            matrix = np.array(
+                [[row.get(f, 0.0) for f in FEATURE_ORDER] for row in rows],
+                dtype=float
+            ).reshape(-1, len(FEATURE_ORDER))
+        if len(matrix) == 0:
+            return []
+
+        if isinstance(model, CompiledTreeEnsemble):
+            raw = model.predict(matrix)
+        else:
+            import pandas as pd
+            raw = model.predict(pd.DataFrame(matrix, columns=FEATURE_ORDER))
+        scores = np.clip(raw, 0, 100).round(1)
+
+        return [{"score": float(score), "level": self.score_to_level(score)} for score in scores]
+
+def train_model_artifacts(model_path, compiled_path, mode=None):
+    """Registry trainer: trains into the given artifact paths and returns the validation report."""
+    return KeralaRiskModel(model_path, compiled_path).train_and_save_model(mode or TRAINING_MODE)
+
+model_registry = ModelRegistry(
+    trainer=train_model_artifacts,
+    feature_order=FEATURE_ORDER,
+    legacy_artifacts=[COMPILED_MODEL_PATH, MODEL_PATH]
+)
 
-# Singleton instance
-risk_engine = KeralaRiskModel()
+# Singleton instance (loads lazily from the registry on first prediction)
+risk_engine = KeralaRiskModel(registry=model_registry)
@@ -0,0 +1,50 @@
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+import logging
+from backend.utils.risk_ml import KeralaRiskModel
+
+logger = logging.getLogger(__name__)
+
+def benchmark_training(mode: str, trace_memory: bool = False) -> dict:
+    """
+    Trains one model in `mode` into a scratch directory (the served model is
+    never touched) and reports wall time, peak memory and metrics.
+    Seeds are fixed, so repeated runs on the same data are comparable.
+    tracemalloc gives exact Python/NumPy peaks but roughly doubles wall time,
+    so it is opt-in; max RSS is always reported.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        model = KeralaRiskModel(os.path.join(tmp, "model.joblib"), os.path.join(tmp, "model.npz"))
+
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        report = model.train_and_save_model(mode=mode)
+        wall = time.perf_counter() - started
+        peak = None
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "wall_seconds": round(wall, 2),
+        "peak_traced_mb": round(peak / 2**20, 1) if peak is not None else None,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "report": report
+    }
+
+if __name__ == "__main__":
+    # python -m backend.utils.train_benchmark --modes fast full [--trace-memory]
+    parser = argparse.ArgumentParser(description="Benchmark Kerala risk model training.")
+    parser.add_argument("--modes", nargs="+", default=["fast"], choices=["fast", "full"])
+    parser.add_argument("--trace-memory", action="store_true", help="Track peak allocations with tracemalloc (slower)")
+    args = parser.parse_args()
+
+    results = [benchmark_training(mode, args.trace_memory) for mode in args.modes]
+    print(json.dumps(results, indent=2, default=str))
@@ -0,0 +1,148 @@
+import numpy as np
+import os
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMPILED_MODEL_PATH = "backend/models/kerala_safe_ai_boost.npz"
+TREE_LEAF = -1
+TREE_UNDEFINED = -2
+# Largest sklearn vs. compiled prediction difference accepted by parity checks
+PARITY_TOLERANCE = 1e-9
+
+class CompiledTreeEnsemble:
+    """
+    Pure-NumPy inference for a fitted GradientBoostingRegressor.
+    All trees are flattened into one set of node arrays; prediction walks
+    every (row, tree) pair in lockstep, one tree level per iteration.
+    Needs neither scikit-learn nor pandas at serving time.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots,
+                 baseline, learning_rate, max_depth, feature_names):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.baseline = float(baseline)
+        self.learning_rate = float(learning_rate)
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names)
+
+    @classmethod
+    def from_sklearn(cls, model, feature_names=None):
+        """Flattens a fitted single-output GradientBoostingRegressor."""
+        if getattr(model, "init_", None) is None or model.init_ == "zero":
+            baseline = 0.0
+        else:
+            baseline = float(np.ravel(model.init_.constant_)[0])
+
+        trees = [est.tree_ for est in model.estimators_[:, 0]]
+        offsets = np.cumsum([0] + [t.node_count for t in trees])
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets[:-1]):
+            is_leaf = tree.children_left == TREE_LEAF
+            feature.append(np.where(is_leaf, TREE_UNDEFINED, tree.feature))
+            threshold.append(tree.threshold)
+            # Re-base child pointers into the flattened array; leaves keep -1
+            left.append(np.where(is_leaf, TREE_LEAF, tree.children_left + offset))
+            right.append(np.where(is_leaf, TREE_LEAF, tree.children_right + offset))
+            value.append(tree.value[:, 0, 0])
+
+        if feature_names is None:
+            feature_names = getattr(model, "feature_names_in_", range(model.n_features_in_))
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            value=np.concatenate(value).astype(np.float64),
+            roots=offsets[:-1].astype(np.int32),
+            baseline=baseline,
+            learning_rate=model.learning_rate,
+            max_depth=max(t.max_depth for t in trees),
+            feature_names=[str(f) for f in feature_names]
+        )
+
+    def predict(self, X):
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows = X.shape[0]
+
+        rows = np.arange(n_rows)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            feat = self.feature[node]
+            is_leaf = feat == TREE_UNDEFINED
+            if is_leaf.all():
+                break
+            go_left = X[rows, np.where(is_leaf, 0, feat)] <= self.threshold[node]
+            step = np.where(go_left, self.left[node], self.right[node])
+            node = np.where(is_leaf, node, step)
+
+        # Accumulate stage by stage (cumsum is sequential) to match sklearn bit-for-bit
+        contributions = np.empty((n_rows, len(self.roots) + 1), dtype=np.float64)
+        contributions[:, 0] = self.baseline
+        contributions[:, 1:] = self.learning_rate * self.value[node]
+        return np.cumsum(contributions, axis=1)[:, -1]
+
+    def save(self, path=COMPILED_MODEL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            feature=self.feature, threshold=self.threshold,
+            left=self.left, right=self.right, value=self.value, roots=self.roots,
+            baseline=self.baseline, learning_rate=self.learning_rate,
+            max_depth=self.max_depth, feature_names=np.array(self.feature_names)
+        )
+        os.replace(tmp_path, path)
+        logger.info(f"Compiled model saved: {path} ({len(self.roots)} trees, {len(self.feature)} nodes)")
+
+    @classmethod
+    def load(cls, path=COMPILED_MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature=data["feature"], threshold=data["threshold"],
+                left=data["left"], right=data["right"], value=data["value"],
+                roots=data["roots"], baseline=data["baseline"],
+                learning_rate=data["learning_rate"], max_depth=data["max_depth"],
+                feature_names=[str(f) for f in data["feature_names"]]
+            )
+
+def verify_parity(model, compiled, X) -> float:
+    """Returns the max absolute difference between sklearn and compiled predictions."""
+    import pandas as pd
+    frame = pd.DataFrame(np.asarray(X, dtype=float), columns=compiled.feature_names)
+    expected = model.predict(frame)
+    actual = compiled.predict(frame.to_numpy())
+    return float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+
+def export_compiled_model(model, path=COMPILED_MODEL_PATH, feature_names=None):
+    compiled = CompiledTreeEnsemble.from_sklearn(model, feature_names)
+    compiled.save(path)
+    return compiled
+
+if __name__ == "__main__":
+    # Check parity of the saved joblib model against its compiled form on the
+    # historical dataset (read-only; the served artifact is not rewritten):
+    #   python -m backend.utils.tree_engine
+    import joblib
+    import pandas as pd
+    from backend.utils.risk_ml import MODEL_PATH, FEATURE_ORDER
+
+    model = joblib.load(MODEL_PATH)
+    compiled = CompiledTreeEnsemble.from_sklearn(model, FEATURE_ORDER)
+
+    df = pd.read_csv("backend/data/cleaned_kerala_data.csv")
+    X = df[['rain_1d_lag', 'rain_3d_total', 'rain_7d_total', 'temperature_c', 'humidity_p']].to_numpy()
+    X = np.vstack([X, np.random.default_rng(42).uniform(-10, 600, size=(5000, len(FEATURE_ORDER)))])
+    diff = verify_parity(model, compiled, X)
+    logger.info(f"Parity check on {len(X)} rows: max abs diff = {diff:.3e}")
+    sys.exit(0 if diff <= PARITY_TOLERANCE else 1)
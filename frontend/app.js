@@ -6,9 +6,37 @@ let riskChart;
 let trendChart;
 let adminMap;
 let adminMarkers = [];
+let adminEmergencySinceId = null; // High-water mark for emergency delta sync
 // Default location (Thiruvananthapuram, Kerala)
 let currentLocation = { lat: 8.5241, lon: 76.9366, name: "Thiruvananthapuram" };
 
+// --- Push Channel (Server-Sent Events) ---
+// One shared /api/events connection per tab; the server pushes district
+// changes, risk level transitions and new emergencies as they happen.
+let riskEventSource = null;
+
+function openRiskEvents() {
+    if (!window.EventSource) return null;
+    if (!riskEventSource) riskEventSource = new EventSource(`${API_URL}/events`);
+    return riskEventSource;
+}
+
+function onRiskEvent(topic, handler) {
+    const source = openRiskEvents();
+    if (!source) return false;
+    source.addEventListener(topic, e => handler(JSON.parse(e.data)));
+    return true;
+}
+
+function onRiskEventsOpen(handler) {
+    const source = openRiskEvents();
+    if (source) source.addEventListener('open', handler);
+}
+
+function riskEventsConnected() {
+    return riskEventSource !== null && riskEventSource.readyState === EventSource.OPEN;
+}
+
 // DOM Elements
 const views = document.querySelectorAll('.view');
 const navLinks = document.querySelectorAll('.nav-links li');
@@ -370,7 +398,9 @@ async function loadKeralaDistricts() {
 
     // Clear existing district layers if re-rendering based on clean map
     districts.forEach(d => {
-        const color = getRiskColor(d.level);
+        // Districts the server could not assess yet come back with status "unavailable"
+        const unavailable = d.status === 'unavailable';
+        const color = unavailable ? '#6b7280' : getRiskColor(d.level);
 
         L.circle([d.lat, d.lon], {
             color: color,
@@ -383,8 +413,8 @@ async function loadKeralaDistricts() {
             .bindPopup(`
             <div style="text-align: center; font-family: 'Inter', sans-serif;">
                 <h3 style="margin: 0 0 5px; color: ${color}; text-transform: uppercase; letter-spacing: 1px;">${d.district}</h3>
-                <div style="font-size: 1.2rem; font-weight: 800; margin-bottom: 5px; color: #fff;">${d.level} COMPLIANCE</div>
-                <div style="font-size: 0.9rem; color: #a0aec0;">Risk Score: <span style="color: ${color}; font-weight: bold;">${d.score}</span></div>
+                <div style="font-size: 1.2rem; font-weight: 800; margin-bottom: 5px; color: #fff;">${unavailable ? 'NO DATA' : `${d.level} COMPLIANCE`}</div>
+                <div style="font-size: 0.9rem; color: #a0aec0;">Risk Score: <span style="color: ${color}; font-weight: bold;">${unavailable ? '--' : d.score}</span></div>
                 <p style="margin: 5px 0 0; font-size: 0.75rem; color: #718096;">Click to analyze details</p>
                 ${!navigator.onLine ? '<div style="font-size:0.7rem; color:#eab308; margin-top:2px;">(Offline Data)</div>' : ''}
             </div>
@@ -754,59 +784,107 @@ function initAdminMap() {
     }).addTo(adminMap);
 
     fetchAdminEmergencies();
-    // Refresh every 20 seconds
-    setInterval(fetchAdminEmergencies, 20000);
+    // New emergencies are pushed; a delta fetch on (re)connect covers any gap
+    onRiskEvent('emergencies', emit => {
+        if (adminEmergencySinceId === null || emit.id <= adminEmergencySinceId) return;
+        adminEmergencySinceId = emit.id;
+        addAdminEmergencyMarker(emit);
+    });
+    onRiskEventsOpen(fetchAdminEmergencies);
+    // Fallback: poll every 20 seconds only while the push channel is down
+    setInterval(() => {
+        if (!riskEventsConnected()) fetchAdminEmergencies();
+    }, 20000);
 }
 
-async function fetchAdminEmergencies() {
-    if (!adminMap) return;
+// One emergencies fetch at a time: a call made while one is running is
+// folded into a single follow-up fetch once it finishes.
+let adminEmergencyFetch = null;
+let adminEmergencyRefetch = false;
 
+function fetchAdminEmergencies() {
+    if (!adminMap) return Promise.resolve();
+    if (adminEmergencyFetch) {
+        adminEmergencyRefetch = true;
+        return adminEmergencyFetch;
+    }
+    adminEmergencyFetch = (async () => {
+        do {
+            adminEmergencyRefetch = false;
+            await syncAdminEmergencies();
+        } while (adminEmergencyRefetch);
+        adminEmergencyFetch = null;
+    })();
+    return adminEmergencyFetch;
+}
+
+async function syncAdminEmergencies() {
     try {
-        const res = await fetch(`${API_URL}/admin/emergencies`);
-        const emergencies = await res.json();
-
-        // Clear existing markers
-        adminMarkers.forEach(m => adminMap.removeLayer(m));
-        adminMarkers = [];
-
-        emergencies.forEach(emit => {
-            // Determine marker color based on status or district risk
-            let color = '#f85149'; // Default Red
-            if (emit.risk_level === 'High') color = '#fa9035'; // Orange
-            if (emit.risk_level === 'Moderate') color = '#eab308'; // Yellow
-            if (emit.risk_level === 'Safe') color = '#3fb950'; // Green
-
-            const marker = L.circleMarker([emit.lat, emit.lon], {
-                radius: 10,
-                fillColor: color,
-                color: '#fff',
-                weight: 2,
-                fillOpacity: 0.9,
-                className: emit.risk_level === 'Critical' ? 'emergency-pulse-marker' : ''
-            }).addTo(adminMap);
-
-            const timestamp = new Date(emit.timestamp).toLocaleString();
-            marker.bindPopup(`
-                <div style="color: white; background: #161b22; padding: 10px; border-radius: 8px;">
-                    <h3 style="color: ${color}; margin-top: 0;">EMERGENCY ALERT</h3>
-                    <p><b>District:</b> ${emit.district}</p>
-                    <p><b>Location:</b> ${emit.lat.toFixed(5)}, ${emit.lon.toFixed(5)}</p>
-                    <p><b>Time:</b> ${timestamp}</p>
-                    <p><b>Status:</b> ${emit.alert_status}</p>
-                    <a href="https://www.google.com/maps?q=${emit.lat},${emit.lon}" target="_blank" 
-                       style="display: block; margin-top: 10px; padding: 8px; background: #58a6ff; color: white; text-align: center; border-radius: 5px; text-decoration: none; font-weight: bold;">
-                       <i class="fa-solid fa-location-arrow"></i> Open in Google Maps
-                    </a>
-                </div>
-            `);
-
-            adminMarkers.push(marker);
-        });
+        // First load fetches the latest page; later polls only ask for rows
+        // newer than the high-water mark (304 when nothing changed).
+        // The response is read by the kind of request made, not by shared state.
+        const fullLoad = adminEmergencySinceId === null;
+        const url = fullLoad
+            ? `${API_URL}/admin/emergencies`
+            : `${API_URL}/admin/emergencies/changes?since_id=${adminEmergencySinceId}`;
+        const res = await fetch(url);
+        if (res.status === 304) return;
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        const payload = await res.json();
+
+        let emergencies;
+        if (fullLoad) {
+            emergencies = payload;
+            // Clear existing markers
+            adminMarkers.forEach(m => adminMap.removeLayer(m));
+            adminMarkers = [];
+            adminEmergencySinceId = emergencies.reduce((max, e) => Math.max(max, e.id), 0);
+        } else {
+            emergencies = payload.rows;
+            // A pushed emergency may have moved the mark meanwhile; never move it back
+            adminEmergencySinceId = Math.max(adminEmergencySinceId, payload.high_water_mark.id);
+        }
+
+        emergencies.forEach(addAdminEmergencyMarker);
     } catch (e) {
         console.error("Error fetching admin emergencies:", e);
     }
 }
 
+function addAdminEmergencyMarker(emit) {
+    // Determine marker color based on status or district risk
+    let color = '#f85149'; // Default Red
+    if (emit.risk_level === 'High') color = '#fa9035'; // Orange
+    if (emit.risk_level === 'Moderate') color = '#eab308'; // Yellow
+    if (emit.risk_level === 'Safe') color = '#3fb950'; // Green
+
+    const marker = L.circleMarker([emit.lat, emit.lon], {
+        radius: 10,
+        fillColor: color,
+        color: '#fff',
+        weight: 2,
+        fillOpacity: 0.9,
+        className: emit.risk_level === 'Critical' ? 'emergency-pulse-marker' : ''
+    }).addTo(adminMap);
+
+    const timestamp = new Date(emit.timestamp).toLocaleString();
+    marker.bindPopup(`
+        <div style="color: white; background: #161b22; padding: 10px; border-radius: 8px;">
+            <h3 style="color: ${color}; margin-top: 0;">EMERGENCY ALERT</h3>
+            <p><b>District:</b> ${emit.district}</p>
+            <p><b>Location:</b> ${emit.lat.toFixed(5)}, ${emit.lon.toFixed(5)}</p>
+            <p><b>Time:</b> ${timestamp}</p>
+            <p><b>Status:</b> ${emit.alert_status}</p>
+            <a href="https://www.google.com/maps?q=${emit.lat},${emit.lon}" target="_blank" 
+               style="display: block; margin-top: 10px; padding: 8px; background: #58a6ff; color: white; text-align: center; border-radius: 5px; text-decoration: none; font-weight: bold;">
+               <i class="fa-solid fa-location-arrow"></i> Open in Google Maps
+            </a>
+        </div>
+    `);
+
+    adminMarkers.push(marker);
+}
+
 /**
  * Real-time Weather Integration (Open-Meteo)
  * Fetches current temperature for coordinates (10.8505, 76.2711)
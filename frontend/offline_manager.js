@@ -122,7 +122,7 @@ const OfflineManager = {
         const cached = localStorage.getItem('offline_districts_risk');
         if (!cached) return null;
         const districts = JSON.parse(cached).data;
-        return districts.find(d => d.district === districtName || d.name === districtName);
+        return districts.find(d => (d.district === districtName || d.name === districtName) && d.status !== 'unavailable');
     },
 
     getSafetyInstructions(severity, type = null) {
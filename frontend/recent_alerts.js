@@ -21,11 +21,83 @@ const KERALA_DISTRICTS = [
     { name: "Kasaragod", lat: 12.5101, lon: 74.9852, hilly: false }
 ];
 
+// Mandatory Demo Alerts (as requested)
+const DEMO_ALERTS = [
+    {
+        type_key: "Flood Warning",
+        level: "Critical",
+        location: "Idukki",
+        desc_key: "idukki_flood_desc",
+        icon: "fa-house-flood-water",
+        time: "10 mins ago"
+    },
+    {
+        type_key: "Landslide Risk",
+        level: "High",
+        location: "Wayanad",
+        desc_key: "wayanad_landslide_desc",
+        icon: "fa-mountain",
+        time: "25 mins ago"
+    },
+    {
+        type_key: "Heatwave Alert",
+        level: "Moderate",
+        location: "Palakkad",
+        desc_key: "palakkad_heat_desc",
+        icon: "fa-temperature-high",
+        time: "1 hour ago"
+    }
+];
+
+// Latest pushed district assessments and recent level transitions
+const pushedDistricts = {};
+let transitionAlerts = [];
+
 document.addEventListener('DOMContentLoaded', () => {
     fetchKeralaAlerts();
-    setInterval(fetchKeralaAlerts, 5 * 60 * 1000);
+
+    // District updates are pushed by the server (see /api/events)
+    if (typeof onRiskEvent === 'function') {
+        onRiskEvent('districts', payload => {
+            if (payload.full) Object.keys(pushedDistricts).forEach(k => delete pushedDistricts[k]);
+            payload.districts.forEach(d => { pushedDistricts[d.district] = d; });
+            // An empty snapshot (server still warming up) keeps the fetched alerts
+            if (Object.keys(pushedDistricts).length) renderPushedAlerts();
+        });
+        onRiskEvent('alerts', change => {
+            transitionAlerts = [transitionToAlert(change), ...transitionAlerts].slice(0, 5);
+            renderPushedAlerts();
+        });
+    }
+
+    // Fallback: poll Open-Meteo every 5 minutes only while the push channel is down
+    setInterval(() => {
+        if (typeof riskEventsConnected !== 'function' || !riskEventsConnected()) fetchKeralaAlerts();
+    }, 5 * 60 * 1000);
 });
 
+function transitionToAlert(change) {
+    return {
+        type: "Risk Level Change",
+        level: change.to,
+        location: change.district,
+        desc: `Risk moved from ${change.from} to ${change.to} (score ${change.score}).`,
+        icon: "fa-triangle-exclamation",
+        time: "Just now"
+    };
+}
+
+function renderPushedAlerts() {
+    let liveAlerts = [];
+    Object.values(pushedDistricts).forEach(entry => {
+        const district = KERALA_DISTRICTS.find(d => d.name === entry.district) || { name: entry.district };
+        liveAlerts = liveAlerts.concat(processDistrictData(district, {
+            current: { temperature_2m: entry.temp, precipitation: entry.rainfall || 0 }
+        }));
+    });
+    renderAlerts([...DEMO_ALERTS, ...transitionAlerts, ...liveAlerts]);
+}
+
 async function fetchKeralaAlerts() {
     const list = document.getElementById('alert-list');
     if (!list) return;
@@ -34,34 +106,6 @@ async function fetchKeralaAlerts() {
         list.innerHTML = `<div class="loading-alerts"><i class="fa-solid fa-circle-notch fa-spin"></i> ${t('monitoring')}</div>`;
     }
 
-    // 1. Define Mandatory Demo Alerts (as requested)
-    const demoAlerts = [
-        {
-            type_key: "Flood Warning",
-            level: "Critical",
-            location: "Idukki",
-            desc_key: "idukki_flood_desc",
-            icon: "fa-house-flood-water",
-            time: "10 mins ago"
-        },
-        {
-            type_key: "Landslide Risk",
-            level: "High",
-            location: "Wayanad",
-            desc_key: "wayanad_landslide_desc",
-            icon: "fa-mountain",
-            time: "25 mins ago"
-        },
-        {
-            type_key: "Heatwave Alert",
-            level: "Moderate",
-            location: "Palakkad",
-            desc_key: "palakkad_heat_desc",
-            icon: "fa-temperature-high",
-            time: "1 hour ago"
-        }
-    ];
-
     try {
         let liveAlerts = [];
         // Fetch real data for other districts to keep it dynamic
@@ -83,12 +127,12 @@ async function fetchKeralaAlerts() {
         results.forEach(res => liveAlerts = liveAlerts.concat(res));
 
         // Combine Demo + Real
-        const allAlerts = [...demoAlerts, ...liveAlerts];
+        const allAlerts = [...DEMO_ALERTS, ...liveAlerts];
         renderAlerts(allAlerts);
 
     } catch (e) {
         console.error("Alerts Process Error:", e);
-        renderAlerts(demoAlerts); // Fallback to demo alerts
+        renderAlerts(DEMO_ALERTS); // Fallback to demo alerts
     }
 }
 
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Keep the app off the checked-in database and background jobs during tests
+_TMP = tempfile.mkdtemp(prefix="ecoguard-tests-")
+os.environ.setdefault("PREDICTIONS_DB_PATH", os.path.join(_TMP, "predictions.db"))
+os.environ.setdefault("RISK_SCHEDULER_ENABLED", "false")
+os.environ.setdefault("RETENTION_ENABLED", "false")
+os.environ.setdefault("HISTORY_AUTO_BUILD", "false")
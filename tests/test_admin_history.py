@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+import backend.main as main
+
+def test_history_reads_archives_only_when_asked(monkeypatch):
+    calls = []
+
+    def fake_archived_page(cursor, limit, district, level):
+        calls.append((cursor, limit))
+        return []
+
+    monkeypatch.setattr(main, "read_archived_page", fake_archived_page)
+    with TestClient(main.app) as client:
+        assert client.get("/api/admin/history").status_code == 200
+        assert calls == []
+        assert client.get("/api/admin/history", params={"include_archive": True}).status_code == 200
+        assert len(calls) == 1
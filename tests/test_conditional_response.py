@@ -0,0 +1,63 @@
+import itertools
+import pytest
+from fastapi.testclient import TestClient
+import backend.main as main
+
+_calls = itertools.count()
+
+async def _fake_analyze_risk(lat, lon):
+    call = next(_calls)
+    return {
+        # The social overlay adds a random stress component to the score
+        "score": 42.0 + call,
+        "severity_label": "Moderate",
+        "environmental_base": {"score": 40, "label": "Moderate"},
+        # Sampled messages and timings differ on every request
+        "social_overlay": {"score": 3 + call, "severity": "Low", "sentiment_average": 0.1 * call,
+                           "recent_shouts": [f"message {call}"], "stress_count": call},
+        "ml_prediction": {"label": "Moderate", "raw_value": 41.5},
+        "contributing_factors": ["rain"],
+        "aggregated_metrics": {"temperature": 29.04, "humidity": 81, "rainfall": 1.2, "pm25": 12,
+                               "7_day_rain_total": 30.0},
+        "raw_data": {"location_name": "Kochi", "raw_weather": {"main": {"temp": 29.04}}, "raw_aqi": {}},
+        "stage_timings": {"weather": 0.01 * (call + 1), "ml": 0.002 * (call + 1)}
+    }
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.environmental_risk_engine, "analyze_risk", _fake_analyze_risk)
+    with TestClient(main.app) as client:
+        yield client
+
+def test_repeated_risk_request_revalidates(client):
+    params = {"lat": 9.98, "lon": 76.30}
+    first = client.get("/api/risk-data", params=params)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get("/api/risk-data", params=params)
+    assert second.headers["etag"] == etag
+    # Equivalent, not byte-identical: the validator must be weak
+    assert etag.startswith("W/")
+    assert second.json()["stage_timings"] != first.json()["stage_timings"]
+    assert second.json()["risk_assessment"]["score"] != first.json()["risk_assessment"]["score"]
+
+    revalidated = client.get("/api/risk-data", params=params, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+def test_risk_etag_follows_representation(client):
+    params = {"lat": 9.98, "lon": 76.30}
+    full = client.get("/api/risk-data", params=params).headers["etag"]
+    summary = client.get("/api/risk-data", params={**params, "view": "summary"}).headers["etag"]
+    assert full != summary
+
+def test_district_snapshot_etag_is_weak(client, monkeypatch):
+    snapshot = [{"district": "Ernakulam", "status": "fresh", "age_seconds": 3}]
+    monkeypatch.setattr(main.district_risk_scheduler, "snapshot", lambda: snapshot)
+    etag = client.get("/api/kerala/districts-risk").headers["etag"]
+    assert etag.startswith('W/"districts-v')
+
+    snapshot[0].update(status="stale", age_seconds=950)
+    revalidated = client.get("/api/kerala/districts-risk", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
@@ -0,0 +1,22 @@
+import time
+from backend.services import data_service
+from backend.services.feature_store import DistrictFeatureStore
+from backend.services.weather_api import get_unavailable_weather
+
+KOCHI = {"lat": 9.98, "lon": 76.30}
+AQI = {"components": {"pm2_5": 12}}
+
+def _weather(**extra):
+    return {"coord": KOCHI, "main": {"temp": 29.0, "humidity": 80}, "rain": {"1h": 4.0}, **extra}
+
+def test_only_real_weather_readings_reach_the_feature_store(monkeypatch):
+    store = DistrictFeatureStore()
+    monkeypatch.setattr(data_service, "feature_store", store)
+
+    data_service.build_environmental_data(_weather(mock=True), AQI)
+    data_service.build_environmental_data(_weather(), AQI)  # no dt: not an observation
+    data_service.build_environmental_data(get_unavailable_weather(KOCHI["lat"], KOCHI["lon"], RuntimeError("down")), AQI)
+    assert store.stats()["observations"] == 0
+
+    data_service.build_environmental_data(_weather(dt=time.time()), AQI)
+    assert store.stats()["observations"] == 1
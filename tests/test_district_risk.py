@@ -0,0 +1,34 @@
+import asyncio
+from backend.services.district_risk import DistrictRiskFanout
+
+DISTRICTS = [
+    {"name": "Ernakulam", "lat": 9.98, "lon": 76.30},
+    {"name": "Idukki", "lat": 9.85, "lon": 76.97},
+    {"name": "Wayanad", "lat": 11.68, "lon": 76.13},
+]
+
+class SlowFor:
+    """Engine stub that never answers for the given latitudes."""
+
+    def __init__(self, *slow_lats):
+        self.slow_lats = set(slow_lats)
+
+    async def analyze_risk(self, lat, lon):
+        if lat in self.slow_lats:
+            await asyncio.sleep(10)
+        return {"score": 40.0, "severity_label": "Moderate", "aggregated_metrics": {"temperature": 28}}
+
+def test_every_district_is_listed_even_without_data():
+    fanout = DistrictRiskFanout(engine=SlowFor(), deadline=1)
+    asyncio.run(fanout.collect(DISTRICTS))  # Ernakulam, Idukki and Wayanad now have a last good entry
+
+    fanout._last_good.pop("Idukki")
+    fanout.engine = SlowFor(9.98, 9.85)
+    results = asyncio.run(fanout.collect(DISTRICTS, deadline=0.2))
+
+    assert [r["district"] for r in results] == ["Ernakulam", "Idukki", "Wayanad"]
+    statuses = {r["district"]: r["status"] for r in results}
+    assert statuses == {"Ernakulam": "stale", "Idukki": "unavailable", "Wayanad": "fresh"}
+    idukki = results[1]
+    assert idukki["score"] is None and idukki["level"] is None
+    assert (idukki["lat"], idukki["lon"]) == (9.85, 76.97)
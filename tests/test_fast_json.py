@@ -0,0 +1,23 @@
+import json
+import numpy as np
+import pytest
+from backend.services import fast_json
+
+PAYLOAD = {
+    "score": float("nan"),
+    "bounds": [float("inf"), -float("inf"), 1.5],
+    "nested": {"pm25": np.float64("nan"), "rain": np.float32("inf"), "values": np.array([1.0, np.nan])},
+    "count": np.int64(3),
+    "label": "Moderate",
+}
+EXPECTED = {"score": None, "bounds": [None, None, 1.5],
+            "nested": {"pm25": None, "rain": None, "values": [1.0, None]}, "count": 3, "label": "Moderate"}
+
+def test_stdlib_fallback_writes_valid_json():
+    body = fast_json.stdlib_dumps(PAYLOAD)
+    assert b"NaN" not in body and b"Infinity" not in body
+    assert json.loads(body) == EXPECTED
+
+def test_both_encoders_agree():
+    orjson = pytest.importorskip("orjson")
+    assert orjson.loads(fast_json.dumps(PAYLOAD)) == json.loads(fast_json.stdlib_dumps(PAYLOAD))
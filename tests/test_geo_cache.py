@@ -0,0 +1,45 @@
+import asyncio
+from backend.services.geo_cache import GeoTTLCache
+
+def test_cancelled_leader_does_not_cancel_followers():
+    calls = []
+
+    async def slow_fetch(lat, lon):
+        calls.append((lat, lon))
+        await asyncio.sleep(0.05)
+        return {"name": "Kochi"}
+
+    async def scenario():
+        cache = GeoTTLCache("test", ttl=60, stale_ttl=60)
+        leader = asyncio.create_task(cache.get_or_fetch(9.98, 76.30, slow_fetch))
+        await asyncio.sleep(0)  # leader starts the fetch
+        follower = asyncio.create_task(cache.get_or_fetch(9.98, 76.30, slow_fetch))
+        await asyncio.sleep(0)  # follower joins it
+        leader.cancel()
+        data = await follower
+        assert leader.cancelled()
+        return cache, data
+
+    cache, data = asyncio.run(scenario())
+    assert data == {"name": "Kochi"}
+    assert len(calls) == 1
+    # The fetch completed despite the leader leaving, so the result was cached
+    assert cache.stats()["size"] == 1
+
+def test_fetch_errors_reach_every_caller():
+    async def failing_fetch(lat, lon):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        cache = GeoTTLCache("test", ttl=60, stale_ttl=60)
+        results = await asyncio.gather(
+            cache.get_or_fetch(9.98, 76.30, failing_fetch),
+            cache.get_or_fetch(9.98, 76.30, failing_fetch),
+            return_exceptions=True
+        )
+        return cache, results
+
+    cache, results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+from backend.utils.import_report import IMPORT_BUDGET_MS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Must stay lazy: each one alone costs a large share of the budget
+DEFERRED = ["sklearn", "pandas", "textblob", "twilio"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"ms": elapsed_ms, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED,)
+
+def _import_main():
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.getenv("PYTHONPATH")]))}
+    proc = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, env=env, cwd=ROOT)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def test_backend_main_import_is_lazy_and_within_budget():
+    # Best of three fresh interpreters, like `python -m backend.utils.import_report`
+    runs = [_import_main() for _ in range(3)]
+    assert all(run["loaded"] == [] for run in runs), runs
+    best = min(run["ms"] for run in runs)
+    assert best <= IMPORT_BUDGET_MS, f"import backend.main took {best:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
@@ -0,0 +1,27 @@
+import os
+import threading
+from backend.utils.model_registry import ModelRegistry
+
+FEATURES = ["rain_1d", "rain_3d", "rain_7d", "temp", "humidity"]
+
+def test_corrupt_legacy_artifact_falls_back_to_training(tmp_path):
+    legacy = tmp_path / "kerala_safe_ai_boost.npz"
+    legacy.write_bytes(b"not a model")
+    trained = threading.Event()
+
+    def trainer(model_path, compiled_path, mode):
+        trained.set()
+        return None  # no data: the registry records the error and serves nothing
+
+    registry = ModelRegistry(trainer, FEATURES, root=str(tmp_path / "registry"),
+                             legacy_artifacts=[str(legacy)])
+    assert registry.get_model() is None
+    assert trained.wait(5)
+    registry._training.join(5)
+
+    copied = tmp_path / "registry" / "legacy" / "model.npz"
+    copied_at = os.stat(copied).st_mtime_ns
+    legacy.write_bytes(b"still not a model")
+    # Later calls retry the registered copy instead of importing again
+    assert registry.get_model() is None
+    assert os.stat(copied).st_mtime_ns == copied_at
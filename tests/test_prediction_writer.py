@@ -0,0 +1,30 @@
+import sqlite3
+from backend.services.prediction_writer import COALESCE_MIGRATION, coalesce_rows, write_coalesced
+
+def _connection():
+    conn = sqlite3.connect(":memory:")
+    conn.execute('''
+        CREATE TABLE predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            location TEXT, lat REAL, lon REAL, risk_score REAL, risk_level TEXT, temp REAL, pm25 REAL
+        )
+    ''')
+    for statement in COALESCE_MIGRATION:
+        conn.execute(statement)
+    return conn
+
+def test_coalesced_update_gets_a_new_id_for_delta_sync():
+    conn = _connection()
+    bucket = "2026-10-17 06:00:00"
+    write_coalesced(conn, coalesce_rows([("Kochi", 9.98, 76.30, 40.0, "Moderate", 29.0, 12.0)], bucket))
+    first_id, = conn.execute("SELECT id FROM predictions").fetchone()
+
+    # Client synced up to first_id; the same cell is then updated
+    write_coalesced(conn, coalesce_rows([("Kochi", 9.98, 76.30, 70.0, "High", 30.0, 15.0),
+                                         ("Kochi", 9.98, 76.31, 20.0, "Safe", 28.0, 10.0)], bucket))
+    changes = conn.execute(
+        "SELECT risk_score, hit_count, min_score, max_score FROM predictions WHERE id > ?", (first_id,)
+    ).fetchall()
+    assert changes == [(20.0, 3, 20.0, 70.0)]
+    assert conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == 1
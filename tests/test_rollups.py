@@ -0,0 +1,37 @@
+import sqlite3
+from backend.services import rollups
+
+def _connection():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(rollups.CREATE_ROLLUP_TABLE)
+    return conn
+
+def test_rollups_are_keyed_by_nearest_district():
+    conn = _connection()
+    rows = [
+        ("Local Area", 9.85, 76.97, 40.0, "Moderate", 24.0, 10.0),   # Idukki
+        ("Local Area", 9.86, 76.95, 80.0, "Critical", 26.0, None),   # Idukki
+        ("Local Area", 9.98, 76.30, 20.0, "Safe", 30.0, 20.0),       # Ernakulam
+        ("Somewhere", 28.6, 77.2, 10.0, "Safe", 35.0, 90.0),         # outside Kerala
+    ]
+    rollups.apply_rollups(conn, rows, hour="2026-10-17 06:00:00")
+
+    idukki = rollups.query_rollups(conn, district="Idukki")
+    assert len(idukki) == 1
+    assert idukki[0]["count"] == 2
+    assert idukki[0]["mean_score"] == 60.0
+    assert idukki[0]["levels"]["Critical"] == 1
+
+    by_district = {s["district"]: s["count"] for s in rollups.query_rollups(conn, by_district=True)}
+    assert by_district == {"Idukki": 2, "Ernakulam": 1, rollups.OTHER_DISTRICT: 1}
+
+def test_stored_rows_weight_coalesced_readings():
+    conn = _connection()
+    rollups.apply_stored_rows(conn, [
+        ("2026-10-17 06:15:00", 9.85, 76.97, 50.0, "Moderate", 25.0, None, 3, 30.0, 55.0),
+        ("2026-10-17 07:01:00", 9.85, 76.97, 70.0, "High", 25.0, None, None, None, None),
+    ])
+    series = rollups.query_rollups(conn, district="Idukki", bucket="day")
+    assert series[0]["count"] == 4
+    assert series[0]["min_score"] == 30.0 and series[0]["max_score"] == 70.0
+    assert series[0]["levels"]["Moderate"] == 3
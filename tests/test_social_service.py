@@ -0,0 +1,29 @@
+import asyncio
+import time
+from backend.services.social_service import SocialAnalysisService
+
+def test_sentiment_analysis_does_not_block_the_event_loop(monkeypatch):
+    def slow_polarities(messages):
+        time.sleep(0.3)  # stands in for textblob's cold import
+        return [0.0] * len(messages)
+
+    service = SocialAnalysisService()
+    monkeypatch.setattr(service, "_polarities", slow_polarities)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await service.get_social_stress("Kochi")
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert result["score"] == 5.0
+    assert ticks >= 10
@@ -0,0 +1,34 @@
+import asyncio
+import time
+from backend.services.risk_engine import RiskEngine
+from backend.services.stage_executor import Stage, StageExecutor
+
+def test_ready_wait_is_not_charged_to_the_stage_timeout():
+    async def ready():
+        await asyncio.sleep(0.2)
+
+    async def quick(_):
+        return "model output"
+
+    stages = [Stage("ml", quick, timeout=0.1, fallback="fallback", ready=ready)]
+    results, timings = asyncio.run(StageExecutor().run(stages))
+    assert results["ml"] == "model output"
+    assert timings["ml"]["status"] == "ok"
+
+def test_engine_warm_up_runs_each_loader_once():
+    loads = []
+
+    def slow_load():
+        time.sleep(0.2)  # stands in for the registry load / textblob import
+        loads.append(1)
+
+    engine = RiskEngine()
+    engine._loaders = {"ml": slow_load}
+
+    async def scenario():
+        # Lifespan warm-up and an early request overlap; both wait on one load
+        await asyncio.gather(engine.warm_up(), engine._ready("ml"))
+        await engine._ready("ml")
+
+    asyncio.run(scenario())
+    assert loads == [1]
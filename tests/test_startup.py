@@ -0,0 +1,48 @@
+import asyncio
+import time
+from fastapi.testclient import TestClient
+import backend.main as main
+
+def test_scheduler_starts_after_warm_up(monkeypatch):
+    events = []
+
+    async def slow_warm_up():
+        await asyncio.sleep(0.2)
+        events.append("warmed")
+
+    async def start():
+        events.append("scheduler started")
+
+    async def stop():
+        events.append("scheduler stopped")
+
+    monkeypatch.setattr(main, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(main.environmental_risk_engine, "warm_up", slow_warm_up)
+    monkeypatch.setattr(main.district_risk_scheduler, "start", start)
+    monkeypatch.setattr(main.district_risk_scheduler, "stop", stop)
+    with TestClient(main.app) as client:
+        # The app serves while warming up; the scheduler waits for it
+        assert client.get("/api/admin/history").status_code == 200
+        assert "scheduler started" not in events
+        deadline = time.time() + 5
+        while "scheduler started" not in events and time.time() < deadline:
+            time.sleep(0.05)
+    assert events == ["warmed", "scheduler started", "scheduler stopped"]
+
+def test_history_auto_build_runs_after_startup(monkeypatch):
+    events = []
+
+    async def slow_refresh(force=False):
+        await asyncio.sleep(0.2)
+        events.append("history built")
+
+    monkeypatch.setattr(main, "HISTORY_AUTO_BUILD", True)
+    monkeypatch.setattr(main, "refresh_history_store", slow_refresh)
+    with TestClient(main.app) as client:
+        # Serving does not wait for the build
+        assert client.get("/api/admin/history").status_code == 200
+        assert events == []
+        deadline = time.time() + 5
+        while not events and time.time() < deadline:
+            time.sleep(0.05)
+    assert events == ["history built"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from sklearn.ensemble import GradientBoostingRegressor
+from backend.utils.tree_engine import CompiledTreeEnsemble, PARITY_TOLERANCE, export_compiled_model, verify_parity
+
+FEATURES = ["rain_1d", "rain_3d", "rain_7d", "temp", "humidity"]
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(7)
+    X = rng.uniform([0, 0, 0, 15, 30], [150, 300, 600, 45, 100], size=(400, len(FEATURES)))
+    y = 0.1 * X[:, 1] + 0.05 * X[:, 2] + (X[:, 3] > 35) * 20 + rng.normal(0, 2, len(X))
+    import pandas as pd
+    model = GradientBoostingRegressor(n_estimators=30, max_depth=3, random_state=0)
+    model.fit(pd.DataFrame(X, columns=FEATURES), y)
+    return model, X
+
+def test_compiled_export_matches_sklearn(fitted, tmp_path):
+    model, X = fitted
+    path = str(tmp_path / "model.npz")
+    export_compiled_model(model, path, feature_names=FEATURES)
+    compiled = CompiledTreeEnsemble.load(path)
+    assert compiled.feature_names == FEATURES
+    assert verify_parity(model, compiled, X) <= PARITY_TOLERANCE
+
+# sklearn's finiteness check sums the whole input; +max and -max rows make that sum NaN
+@pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")
+def test_parity_on_float32_edge_values(fitted):
+    model, X = fitted
+    compiled = CompiledTreeEnsemble.from_sklearn(model, FEATURES)
+    # Inputs at, just below and just above every split threshold (in float32)
+    rows = []
+    for estimator in model.estimators_.ravel():
+        tree = estimator.tree_
+        for feature, threshold in zip(tree.feature, tree.threshold):
+            if feature < 0:
+                continue
+            t = np.float32(threshold)
+            for value in (t, np.nextafter(t, np.float32(-np.inf)), np.nextafter(t, np.float32(np.inf))):
+                row = X[0].copy()
+                row[feature] = value
+                rows.append(row)
+    extremes = np.array([
+        [0.0] * 5, [-0.0] * 5,
+        [np.finfo(np.float32).max] * 5, [-np.finfo(np.float32).max] * 5,
+        [np.finfo(np.float32).tiny] * 5, [1e-45] * 5,
+    ])
+    edge = np.vstack([np.array(rows), extremes])
+    assert verify_parity(model, compiled, edge) <= PARITY_TOLERANCE